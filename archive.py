@@ -0,0 +1,249 @@
+import json
+import os
+import time
+
+from locking import FileLock
+from stats import TaskStats
+from task import Task, current_time
+
+# Arşiv klasörü görev dosyasının yanında bu sonekle oluşturulur
+ARCHIVE_SUFFIX = ".archive"
+
+SEGMENT_EXTENSION = ".jsonl"
+
+# Otomatik arşivleme en fazla bu aralıkla (saniye) çalışır
+AUTO_INTERVAL = 24 * 60 * 60
+
+DAY = 24 * 60 * 60
+
+
+class TaskArchive:
+    """Tamamlanmış eski görevlerin aylık dilimlere ayrılmış, yalnızca eklemeli arşivi.
+
+    Görevler tamamlandıkları aya göre `<dosya>.archive/YYYY-MM.jsonl`
+    dilimlerine satır satır eklenir; dilimler hiç yeniden yazılmaz. Her
+    dilimin boyutu ve istatistikleri `manifest.json`'da tutulur, böylece tüm
+    zamanların istatistikleri dilimler okunmadan hesaplanır. Dilimler yalnızca
+    arşivlenmiş görevler istendiğinde okunur ve bellekte saklanır; boyutu
+    manifestteki kayıtla uyuşmayan dilimin (ör. yazım sırasında çökme)
+    istatistikleri dilim okunarak yeniden hesaplanır.
+
+    Ayarlar (otomatik arşivleme yaşı, son çalışma zamanı) da manifestte
+    saklanır. Yazımlar `archive.lock` ile süreçler arasında sıralanır.
+    """
+
+    def __init__(self, path):
+        self.dir = path + ARCHIVE_SUFFIX
+        self.manifest_path = os.path.join(self.dir, "manifest.json")
+        self.file_lock = None
+        # Okunmuş dilimler: ad -> (dosya boyutu, son tam satırın sonu, {id: görev})
+        self.segments = {}
+
+    def exists(self):
+        return os.path.isdir(self.dir)
+
+    def close(self):
+        if self.file_lock is not None:
+            self.file_lock.close()
+
+    # --- Ayarlar ---
+
+    @property
+    def after_days(self):
+        """Otomatik arşivleme yaşı (gün); kapalıysa None"""
+        return self._read_manifest().get("after_days")
+
+    def configure(self, after_days):
+        """Otomatik arşivlemeyi aç (gün) ya da kapat (None)"""
+        with self._lock():
+            manifest = self._read_manifest()
+            manifest["after_days"] = after_days
+            self._write_manifest(manifest)
+
+    def due(self, now=None):
+        """Otomatik arşivleme açık ve zamanı gelmiş mi"""
+        if not self.exists():
+            return False
+        manifest = self._read_manifest()
+        if manifest.get("after_days") is None:
+            return False
+        now = current_time() if now is None else now
+        return now - (manifest.get("last_run") or 0) >= AUTO_INTERVAL
+
+    # --- Okuma ---
+
+    def segment_names(self):
+        """Dilim adları, eskiden yeniye"""
+        try:
+            names = os.listdir(self.dir)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-len(SEGMENT_EXTENSION)] for name in names
+                      if name.endswith(SEGMENT_EXTENSION))
+
+    def load_segment(self, name):
+        """Dilimdeki görevler ({id: görev}); dosya değişmediyse bellekten"""
+        path = self._segment_path(name)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return {}
+        cached = self.segments.get(name)
+        if cached is not None and cached[0] == size:
+            return cached[2]
+
+        tasks = {}
+        end = 0
+        with open(path, 'rb') as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # Yarım kalmış son satır
+                    break
+                end += len(line)
+                try:
+                    task = Task.from_dict(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+                tasks[task.id] = task
+        self.segments[name] = (size, end, tasks)
+        return tasks
+
+    def iter_tasks(self, limit=None):
+        """Arşivlenmiş görevler, en son tamamlanandan geriye doğru.
+
+        Dilimler sırayla ve yalnızca gerektiği kadar okunur.
+        """
+        count = 0
+        for name in reversed(self.segment_names()):
+            tasks = sorted(self.load_segment(name).values(),
+                           key=lambda task: task.completed_at or 0, reverse=True)
+            for task in tasks:
+                if limit is not None and count >= limit:
+                    return
+                yield task
+                count += 1
+
+    def stats(self):
+        """Arşivdeki görevlerin istatistikleri (manifestten, gerekirse dilimlerden)"""
+        manifest = self._read_manifest()
+        entries = manifest.get("segments", {})
+        total = TaskStats()
+        stale = {}
+        for name in self.segment_names():
+            entry = entries.get(name)
+            size = os.path.getsize(self._segment_path(name))
+            if entry is None or entry["size"] != size:
+                stats = TaskStats.from_tasks(self.load_segment(name).values())
+                stale[name] = {"size": size, "stats": stats.to_dict()}
+            else:
+                stats = TaskStats.from_dict(entry["stats"])
+            total.merge(stats)
+        if stale:
+            with self._lock():
+                manifest = self._read_manifest()
+                manifest.setdefault("segments", {}).update(stale)
+                self._write_manifest(manifest)
+        return total
+
+    # --- Yazma ---
+
+    def append(self, tasks):
+        """Görevleri dilimlerine ekle; zaten arşivde olanlar atlanır.
+
+        Eklenen görev sayısını döndürür. Satırlar diske yazılıp eşitlendikten
+        sonra manifest güncellenir.
+        """
+        groups = {}
+        for task in tasks:
+            groups.setdefault(segment_name(task), []).append(task)
+
+        added = 0
+        with self._lock():
+            manifest = self._read_manifest()
+            entries = manifest.setdefault("segments", {})
+            for name, group in sorted(groups.items()):
+                existing = self.load_segment(name)
+                new = [task for task in group if task.id not in existing]
+                if not new:
+                    continue
+                data = "".join(json.dumps(task.to_dict(), ensure_ascii=False) + "\n"
+                               for task in new).encode("utf-8")
+                path = self._segment_path(name)
+                end = self.segments[name][1] if name in self.segments else 0
+                with open(path, 'ab') as file:
+                    # Çökmeden kalan yarım satır yeni kayıtlardan önce kesilir
+                    file.truncate(end)
+                    file.write(data)
+                    file.flush()
+                    os.fsync(file.fileno())
+                    size = file.tell()
+                for task in new:
+                    existing[task.id] = task
+                self.segments[name] = (size, size, existing)
+                entries[name] = {"size": size,
+                                 "stats": TaskStats.from_tasks(existing.values()).to_dict()}
+                added += len(new)
+            self._write_manifest(manifest)
+        return added
+
+    def mark_run(self, now):
+        """Arşivlemenin çalıştığı zamanı kaydet"""
+        with self._lock():
+            manifest = self._read_manifest()
+            manifest["last_run"] = now
+            self._write_manifest(manifest)
+
+    def _lock(self):
+        if self.file_lock is None:
+            os.makedirs(self.dir, exist_ok=True)
+            self.file_lock = FileLock(os.path.join(self.dir, "archive.lock"))
+        return self.file_lock
+
+    def _segment_path(self, name):
+        return os.path.join(self.dir, name + SEGMENT_EXTENSION)
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            # Manifest yoksa ya da bozuksa istatistikler dilimlerden hesaplanır
+            return {}
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+
+def segment_name(task):
+    """Görevin arşivde yazılacağı dilim (tamamlandığı ay)"""
+    return time.strftime("%Y-%m", time.localtime(task.completed_at or 0))
+
+
+def archive_completed(storage, archive, max_age_days, now=None):
+    """`max_age_days` günden önce tamamlanan görevleri arşive taşı.
+
+    Görevler önce arşive yazılır, sonra depodan silinir; arada çökme olursa
+    görev kaybolmaz, bir sonraki çalışmada arşivde bulunduğu için yeniden
+    eklenmez. Taşınan görev sayısını döndürür.
+    """
+    now = current_time() if now is None else now
+    cutoff = now - max_age_days * DAY
+    with storage.batch():
+        storage.refresh()
+        with storage.lock:
+            tasks = [task.copy() for task in storage.iter_tasks("tamamlandı")
+                     if task.completed_at is not None and task.completed_at < cutoff]
+        if tasks:
+            archive.append(tasks)
+            for task in tasks:
+                storage.delete(task.id)
+        archive.mark_run(now)
+    if tasks:
+        # Sıcak dosya arşivlenen görevler olmadan yeniden yazılır
+        storage.compact()
+    return len(tasks)
@@ -0,0 +1,121 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import open_storage
+from task import Task
+
+# Başlıklar "<nesne> <fiil>" kalıbından, isteğe bağlı bir nitelemeyle üretilir
+OBJECTS = [
+    "Haftalık raporu", "Faturayı", "Toplantı notlarını", "Sunumu", "Bütçe tablosunu",
+    "Müşteri e-postalarını", "Sözleşmeyi", "Kira ödemesini", "Diş randevusunu",
+    "Araç muayenesini", "Market listesini", "Çamaşırları", "Proje planını",
+    "Test senaryolarını", "Veritabanı yedeğini", "Doğum günü hediyesini",
+    "Uçak biletini", "Kitap özetini", "Vergi beyannamesini", "Ekip değerlendirmesini",
+    "Şirket web sitesini", "Görüşme sorularını", "Kod incelemesini", "Sunucu güncellemesini",
+]
+
+VERBS = [
+    "hazırla", "gönder", "öde", "kontrol et", "güncelle", "tamamla", "gözden geçir",
+    "planla", "ara", "düzenle", "yazdır", "onayla", "iptal et", "paylaş",
+]
+
+QUALIFIERS = ["", "", "", "acil", "bugün", "yarın", "cuma gününe kadar", "ay sonundan önce"]
+
+DESCRIPTIONS = [
+    "", "", "",
+    "Ayşe Hanım'dan gelen notları da ekle.",
+    "Geçen ayın rakamlarıyla karşılaştır.",
+    "Öğle arasında hallet, uzun sürmez.",
+    "İlgili belgeler ortak klasörde.",
+    "Şirket kartıyla ödeme yapılacak.",
+    "Gerekirse Mehmet Bey'e danış.",
+    "Çıktısını iki nüsha al.",
+]
+
+# Öncelik ve durum dağılımları (ağırlıklar)
+PRIORITY_WEIGHTS = {"düşük": 25, "orta": 50, "yüksek": 25}
+COMPLETED_RATIO = 0.4
+
+# Oluşturulma zamanları son bir yıla yayılır
+TIME_SPAN = 365 * 24 * 3600
+
+# Bekleyen görevlerin bu kadarının bitiş zamanı vardır; zamanlar şimdiden
+# bir ay önce ile bir ay sonrası arasına yayılır
+DUE_RATIO = 0.3
+DUE_SPAN = 30 * 24 * 3600
+
+# Görevlere sıfır ile iki arası etiket verilir
+TAGS = ["iş", "ev", "finans", "sağlık", "alışveriş", "proje", "okul", "acil"]
+MAX_TAGS = 2
+
+
+def generate_tasks(count, seed=0, now=None, numbered=False):
+    """Türkçe başlıklı, karışık öncelik ve durumlu `count` görev üret.
+
+    Aynı tohum (seed) her zaman aynı görevleri verir. numbered verilirse
+    başlıkların sonuna görev ID'si eklenir: başlıkların hepsi farklı olur
+    ama aynı kelimeleri paylaşır.
+    """
+    rng = random.Random(seed)
+    # Bitiş zamanları ayrı üreteçten; diğer alanlar eski dosyalarla aynı kalır
+    due_rng = random.Random(seed + 1)
+    tag_rng = random.Random(seed + 2)
+    now = int(time.time()) if now is None else now
+    priorities = list(PRIORITY_WEIGHTS)
+    weights = list(PRIORITY_WEIGHTS.values())
+    for task_id in range(1, count + 1):
+        title = f"{rng.choice(OBJECTS)} {rng.choice(VERBS)}"
+        qualifier = rng.choice(QUALIFIERS)
+        if qualifier:
+            title = f"{title} ({qualifier})"
+        if numbered:
+            title = f"{title} {task_id}"
+        created_at = now - rng.randrange(TIME_SPAN)
+        task = Task(task_id, title, rng.choice(DESCRIPTIONS),
+                    rng.choices(priorities, weights)[0], "bekliyor", created_at)
+        if rng.random() < COMPLETED_RATIO:
+            task.status = "tamamlandı"
+            task.completed_at = min(now, created_at + rng.randrange(14 * 24 * 3600))
+        elif due_rng.random() < DUE_RATIO:
+            task.due_at = now + due_rng.randrange(-DUE_SPAN, DUE_SPAN)
+        task.tags = tuple(sorted(tag_rng.sample(TAGS, tag_rng.randint(0, MAX_TAGS))))
+        yield task
+
+
+def write_task_file(path, count, seed=0, now=None, numbered=False):
+    """Sentetik görevleri verilen depoya (uzantısına göre JSON, .tdb, SQLite) yaz"""
+    storage = open_storage(path)
+    try:
+        storage.load()
+        if len(storage):
+            raise ValueError(f"Hedef depo bos degil: {path}")
+        storage.import_tasks(generate_tasks(count, seed, now, numbered), count + 1)
+    finally:
+        storage.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik gorev dosyasi uret")
+    parser.add_argument("count", type=int, help="Gorev sayisi (1000 - 1000000)")
+    parser.add_argument("-o", "--output", default="tasks.json",
+                        help="Hedef dosya; uzantiya gore JSON, .tdb veya SQLite (varsayilan: tasks.json)")
+    parser.add_argument("--seed", type=int, default=0, help="Rastgele tohum (varsayilan: 0)")
+    parser.add_argument("--numbered", action="store_true",
+                        help="Basliklarin sonuna gorev numarasi ekle (tum basliklar farkli olur)")
+    args = parser.parse_args()
+
+    try:
+        write_task_file(args.output, args.count, args.seed, numbered=args.numbered)
+    except (ValueError, OSError) as e:
+        print(f"❌ Uretim basarisiz: {e}")
+        sys.exit(1)
+    print(f"{args.count} gorev yazildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
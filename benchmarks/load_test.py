@@ -0,0 +1,222 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate import write_task_file
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# İstek türlerinin ağırlıkları: okuma ağırlıklı bir karışım
+DEFAULT_MIX = {"list": 50, "list_cached": 20, "get": 10, "stats": 5,
+               "add": 8, "complete": 4, "edit": 2, "delete": 1}
+
+
+class Client:
+    """Tek bir keep-alive bağlantısı üzerinden istek gönderen istemci"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+    async def request(self, method, path, body=None, headers=None):
+        """İstek gönder; (durum, başlıklar, gövde) döndür"""
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}",
+                 f"Content-Length: {len(data)}"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        length = int(response_headers.get("content-length", 0))
+        payload = await self.reader.readexactly(length) if length else b""
+        return status, response_headers, payload
+
+
+class LoadTest:
+    """Eşzamanlı istemcilerle karışık istekler gönderip gecikmeleri toplar"""
+
+    def __init__(self, host, port, clients, requests, mix, task_count, seed=0):
+        self.host = host
+        self.port = port
+        self.clients = clients
+        self.requests = requests
+        self.mix = mix
+        self.max_id = task_count
+        self.rng = random.Random(seed)
+        self.latencies = {kind: [] for kind in mix}
+        self.statuses = {}
+        self.not_modified = 0
+        self.etags = {}
+
+    async def run(self):
+        start = time.perf_counter()
+        await asyncio.gather(*(self.run_client() for _ in range(self.clients)))
+        return time.perf_counter() - start
+
+    async def run_client(self):
+        client = Client(self.host, self.port)
+        await client.connect()
+        kinds = list(self.mix)
+        weights = list(self.mix.values())
+        try:
+            for _ in range(self.requests):
+                kind = self.rng.choices(kinds, weights)[0]
+                start = time.perf_counter()
+                status = await getattr(self, "do_" + kind)(client)
+                self.latencies[kind].append(time.perf_counter() - start)
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+        finally:
+            await client.close()
+
+    def random_id(self):
+        return self.rng.randint(1, max(1, self.max_id))
+
+    async def do_list(self, client):
+        offset = self.rng.randrange(0, max(1, self.max_id), 50)
+        status, headers, body = await client.request(
+            "GET", f"/tasks?status=bekliyor&limit=50&offset={offset}")
+        return status
+
+    async def do_list_cached(self, client):
+        # Aynı sayfayı son ETag ile iste; değişiklik yoksa 304 beklenir
+        path = "/tasks?limit=50"
+        headers = {}
+        if path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+        status, response_headers, body = await client.request("GET", path, headers=headers)
+        if status == 304:
+            self.not_modified += 1
+        if "etag" in response_headers:
+            self.etags[path] = response_headers["etag"]
+        return status
+
+    async def do_get(self, client):
+        status, headers, body = await client.request("GET", f"/tasks/{self.random_id()}")
+        return status
+
+    async def do_stats(self, client):
+        status, headers, body = await client.request("GET", "/stats")
+        return status
+
+    async def do_add(self, client):
+        status, headers, body = await client.request(
+            "POST", "/tasks", {"title": "Yük testi görevi", "priority": "orta"})
+        if status == 201:
+            self.max_id = max(self.max_id, json.loads(body)["id"])
+        return status
+
+    async def do_complete(self, client):
+        status, headers, body = await client.request(
+            "POST", f"/tasks/{self.random_id()}/complete")
+        return status
+
+    async def do_edit(self, client):
+        status, headers, body = await client.request(
+            "PATCH", f"/tasks/{self.random_id()}", {"description": "Yük testinde düzenlendi"})
+        return status
+
+    async def do_delete(self, client):
+        status, headers, body = await client.request("DELETE", f"/tasks/{self.random_id()}")
+        return status
+
+    def report(self, elapsed):
+        total = sum(len(values) for values in self.latencies.values())
+        print(f"{total} istek, {elapsed:.2f} s, {total / elapsed:.0f} istek/s "
+              f"({self.clients} istemci)")
+        print(f"{'istek':<14} {'adet':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        print("-" * 52)
+        for kind, values in self.latencies.items():
+            if not values:
+                continue
+            values.sort()
+            print(f"{kind:<14} {len(values):>7} {_percentile(values, 0.50):>9.2f} "
+                  f"{_percentile(values, 0.95):>9.2f} {_percentile(values, 0.99):>9.2f}")
+        print(f"\nDurum kodlari: {dict(sorted(self.statuses.items()))}")
+        print(f"304 (degismedi) yanitlari: {self.not_modified}")
+        return not any(status >= 500 for status in self.statuses)
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))] * 1000
+
+
+def start_server(path):
+    """Sunucuyu boş bir portta alt süreç olarak başlat; (süreç, port) döndür"""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT_DIR, "server.py"), "--file", path, "--port", "0"],
+        stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Dinleniyor:"):
+        process.kill()
+        raise RuntimeError(f"Sunucu baslatilamadi: {line!r}")
+    return process, urlsplit(line.split()[-1]).port
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP API sunucusuna yerel yuk testi")
+    parser.add_argument("--url", help="Calisan sunucunun adresi (verilmezse gecici bir "
+                                      "dosyayla yeni sunucu baslatilir)")
+    parser.add_argument("--tasks", type=int, default=10000,
+                        help="Yeni sunucu icin uretilecek gorev sayisi (varsayilan: 10000)")
+    parser.add_argument("--backend", choices=["json", "tdb", "db"], default="json")
+    parser.add_argument("--clients", type=int, default=20,
+                        help="Eszamanli istemci sayisi (varsayilan: 20)")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="Istemci basina istek sayisi (varsayilan: 500)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    process = None
+    with tempfile.TemporaryDirectory(prefix="todo-load-") as tmp:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port
+            task_count = args.tasks
+        else:
+            path = os.path.join(tmp, f"tasks.{args.backend}")
+            print(f"{args.tasks} gorev uretiliyor...", file=sys.stderr)
+            write_task_file(path, args.tasks, args.seed)
+            process, port = start_server(path)
+            host = "127.0.0.1"
+            task_count = args.tasks
+        try:
+            test = LoadTest(host, port, args.clients, args.requests, DEFAULT_MIX,
+                            task_count, args.seed)
+            elapsed = asyncio.run(test.run())
+            ok = test.report(elapsed)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,608 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from duplicates import DuplicateIndex, find_duplicates
+from generate import OBJECTS, VERBS, write_task_file
+from task import current_time
+from todo_app import TodoApp
+
+try:
+    from todo_gui import TodoGUI
+    from task_view import VirtualTaskList
+except ImportError:
+    # tkinter kurulu değil; arayüz ölçümü atlanır
+    TodoGUI = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Ortanca süre bu oranı, bellek tepe değeri diğerini aşarsa gerileme sayılır.
+# Çok kısa süren işlemlerde ölçüm gürültüsü mutlak eşiklerle bastırılır.
+# Süreler makinenin hızına göre ölçeklenerek karşılaştırılır (bkz. calibrate).
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+MIN_TIME_DELTA_MS = 0.2
+MIN_MEMORY_DELTA_KB = 64
+
+# Kalibrasyon döngüsünün tur sayısı; en kısa tur alınır
+CALIBRATION_ROUNDS = 7
+
+# Toplu eklemede her ölçümün satır sayısı
+BULK_ROWS = 1000
+
+# Arayüz yenileme ölçümlerinin tekrar sayısı (--repeat'ten bağımsız).
+# Süzgeç durumları 3'lü ve 5'li döngülerle değişir: durum sayısı tek
+# olduğundan ortanca (p50) ortadaki durumun ölçümlerine düşer, iki durumun
+# sınırına değil. Tekrar sayısı 15'in katı olduğundan bellek ölçümü de her
+# zaman ilk süzgeç durumunda yapılır.
+GUI_SAMPLES = 45
+
+
+class Var:
+    """tk.StringVar yerine geçen basit değişken"""
+
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class HeadlessTree:
+    """ttk.Treeview'in VirtualTaskList'in kullandığı kısmı; çizim yapmaz"""
+
+    def __init__(self, height=30):
+        self.height = height
+        self.children = []
+
+    def cget(self, option):
+        return str(self.height)
+
+    def bind(self, *args):
+        pass
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.children.remove(iid)
+
+    def insert(self, parent, index, iid, values):
+        self.children.insert(index, iid)
+
+    def item(self, iid, values):
+        pass
+
+    def move(self, iid, parent, index):
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+
+class HeadlessScrollbar:
+    def configure(self, **options):
+        pass
+
+    def set(self, first, last):
+        pass
+
+
+if TodoGUI is not None:
+    class HeadlessGUI:
+        """TodoGUI'nin liste yenileme yolunu pencere açmadan çalıştırır"""
+
+        refresh_task_list = TodoGUI.refresh_task_list
+        selected_status = TodoGUI.selected_status
+        current_filter = TodoGUI.current_filter
+        read_day = TodoGUI.read_day
+        task_matches_filter = TodoGUI.task_matches_filter
+        task_row_values = TodoGUI.task_row_values
+        update_stats_bar = TodoGUI.update_stats_bar
+
+        def __init__(self, storage):
+            self.storage = storage
+            self.filter_var = Var("tümü")
+            self.search_var = Var("")
+            self.priority_filter_var = Var("tümü")
+            self.tag_filter_var = Var("")
+            self.any_tag_var = Var(False)
+            self.since_var = Var("")
+            self.until_var = Var("")
+            self.sort_var = Var("id")
+            self.stats_var = Var()
+            self.task_filter = None
+            self.task_view = VirtualTaskList(HeadlessTree(), HeadlessScrollbar(),
+                                             get_task=storage.get,
+                                             row_values=self.task_row_values,
+                                             matches=self.task_matches_filter)
+
+
+def calibrate():
+    """Makinenin o anki hızı: sabit, saf Python bir iş yükünün süresi (ms).
+
+    İş yükü uygulamanın sık yaptığı işlere benzer (metin biçimleme, sözlük
+    güncelleme, sıralama, JSON kodlama). Ölçülen süreler bu değerle birlikte
+    saklanır; başka bir makinede ya da makine o an yavaşken yapılan
+    karşılaştırmada temel süreler iki kalibrasyonun oranıyla ölçeklenir.
+    """
+    best = None
+    for _ in range(CALIBRATION_ROUNDS):
+        start = time.perf_counter()
+        counts = {}
+        for i in range(20000):
+            key = f"gorev {i % 997} rapor"
+            counts[key] = counts.get(key, 0) + len(key.split())
+        json.dumps(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def percentile(sorted_values, fraction):
+    """Sıralı değerlerin yüzdeliği (en yakın sıra yöntemi)"""
+    index = max(0, min(len(sorted_values) - 1,
+                       int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, peak):
+    """Saniye cinsinden gecikmelerden özet sonuç"""
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "count": len(latencies),
+        "ops_per_s": round(len(latencies) / total, 1) if total else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+class Benchmark:
+    """Bir depo dosyası üzerinde TodoApp işlemlerini ölçer.
+
+    Her işlem grubu üretilmiş dosyanın yeni bir kopyasıyla başlar; böylece
+    gruplar birbirini etkilemez. Süreler tracemalloc kapalıyken ölçülür,
+    bellek tepe değeri için işlem bir kez daha tracemalloc altında çalıştırılır.
+
+    Benzer görev ölçümleri, başlıkları numaralı (hepsi farklı, kelimeleri
+    ortak) ikinci dosya `numbered_source` üzerinde yapılır; üretilmiş
+    başlıkların az sayıda farklı biçimi indeksi olduğundan küçük gösterir.
+    """
+
+    def __init__(self, source, work_dir, size, operations, repeat, seed=0, numbered_source=None):
+        self.source = source
+        self.numbered_source = numbered_source or source
+        self.work_dir = work_dir
+        self.size = size
+        self.operations = operations
+        self.repeat = repeat
+        self.rng = random.Random(seed)
+        self.path = os.path.join(work_dir, os.path.basename(source))
+
+    def run(self):
+        """Tüm işlemleri ölç; işlem adı -> özet"""
+        results = {}
+        for name in ("load_tasks", "save_tasks", "add_task", "complete_task",
+                     "edit_task", "delete_task", "list_tasks", "next_tasks",
+                     "due_tasks", "report", "get_statistics", "gui_refresh", "gui_refresh_sorted",
+                     "gui_refresh_filtered", "duplicate_check", "bulk_add"):
+            if name.startswith("gui_") and TodoGUI is None:
+                continue
+            results[name] = getattr(self, "bench_" + name)()
+        return results
+
+    def fresh_copy(self, source=None):
+        """Üretilmiş dosyayı (ve varsa yan dosyalarını) çalışma dizinine kopyala.
+
+        Kopyanın yolunu döndürür.
+        """
+        source = source or self.source
+        for name in os.listdir(self.work_dir):
+            os.remove(os.path.join(self.work_dir, name))
+        source_dir = os.path.dirname(source)
+        prefix = os.path.basename(source)
+        for name in os.listdir(source_dir):
+            if name.startswith(prefix):
+                shutil.copy(os.path.join(source_dir, name), self.work_dir)
+        return os.path.join(self.work_dir, prefix)
+
+    def measure(self, setup, operation, count):
+        """setup() ile hazırlanan durum üzerinde operation(state, i) çağrılarını ölç"""
+        state = setup()
+        latencies = []
+        try:
+            for i in range(count):
+                start = time.perf_counter()
+                operation(state, i)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            self.teardown(state)
+
+        state = setup()
+        tracemalloc.start()
+        try:
+            operation(state, count)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            self.teardown(state)
+        return summarize(latencies, peak)
+
+    def open_app(self, source=None):
+        path = self.fresh_copy(source)
+        with silenced():
+            return TodoApp(path)
+
+    def open_indexed_app(self):
+        """Numaralı dosyayı aç ve benzer görev indeksini kur.
+
+        İndeks açık kalan süreçlerde bir kez kurulur; ölçümler her eklemedeki
+        ya da aramadaki denetimin maliyetini verir.
+        """
+        app = self.open_app(self.numbered_source)
+        app.storage.index(DuplicateIndex)
+        return app
+
+    def new_titles(self, count, start):
+        """Numaralı dosyadakilerle aynı kelimeleri paylaşan, yeni ve farklı başlıklar"""
+        rng = random.Random(start)
+        return [f"{rng.choice(OBJECTS)} {rng.choice(VERBS)} {start + i}" for i in range(count)]
+
+    def teardown(self, state):
+        app = state if isinstance(state, TodoApp) else getattr(state, "app", None)
+        if app is not None:
+            with silenced():
+                app.storage.close()
+
+    def sample_ids(self, count):
+        return [self.rng.randint(1, self.size) for _ in range(count)]
+
+    def bench_load_tasks(self):
+        def setup():
+            self.fresh_copy()
+            return Holder()
+
+        def operation(state, i):
+            if state.app is not None:
+                self.teardown(state)
+            with silenced():
+                state.app = TodoApp(self.path)
+        return self.measure(setup, operation, self.repeat)
+
+    def bench_save_tasks(self):
+        def operation(app, i):
+            app.save_tasks()
+        return self.measure(self.open_app, operation, self.repeat)
+
+    def bench_add_task(self):
+        # Her eklemede benzer görev denetimi de yapılır
+        titles = self.new_titles(self.operations + 1, self.size + 1)
+
+        def operation(app, i):
+            with silenced():
+                app.add_task(titles[i], "Performans ölçümü", "orta")
+        return self.measure(self.open_indexed_app, operation, self.operations)
+
+    def bench_duplicate_check(self):
+        # Var olan başlıkların harf hatalı biçimleri: aynı anahtar sözlükte
+        # bulunmaz, benzerler LSH kovalarından gelir
+        ids = self.sample_ids(self.operations + 1)
+
+        def operation(app, i):
+            title = app.storage.get(ids[i]).title
+            find_duplicates(app.storage, title[:3] + title[4:])
+        return self.measure(self.open_indexed_app, operation, self.operations)
+
+    def bench_bulk_add(self):
+        # Her ölçüm BULK_ROWS satırı benzer görev denetimiyle toplu ekler;
+        # satır başına maliyet depo ve girdi büyüdükçe artmamalı
+        batches = [[{"title": title} for title in self.new_titles(BULK_ROWS, start)]
+                   for start in range(self.size + 1, self.size + 1 + (self.repeat + 1) * BULK_ROWS,
+                                      BULK_ROWS)]
+
+        def operation(app, i):
+            with silenced():
+                app.import_tasks(batches[i])
+        return self.measure(self.open_indexed_app, operation, self.repeat)
+
+    def bench_complete_task(self):
+        ids = self.sample_ids(self.operations + 1)
+
+        def operation(app, i):
+            with silenced():
+                app.complete_task(ids[i])
+        return self.measure(self.open_app, operation, self.operations)
+
+    def bench_edit_task(self):
+        ids = self.sample_ids(self.operations + 1)
+
+        def operation(app, i):
+            with silenced():
+                app.edit_task(ids[i], f"Düzenlenen görev {i}", None, "yüksek")
+        return self.measure(self.open_app, operation, self.operations)
+
+    def bench_delete_task(self):
+        ids = self.rng.sample(range(1, self.size + 1), min(self.size, self.operations + 1))
+
+        def operation(app, i):
+            with silenced():
+                app.delete_task(ids[i % len(ids)])
+        return self.measure(self.open_app, operation, self.operations)
+
+    def bench_list_tasks(self):
+        def operation(app, i):
+            with silenced():
+                app.list_tasks("bekliyor" if i % 2 else None)
+        return self.measure(self.open_app, operation, self.repeat)
+
+    def bench_next_tasks(self):
+        def operation(app, i):
+            with silenced():
+                app.next_tasks(10)
+        return self.measure(self.open_app, operation, self.operations)
+
+    def bench_due_tasks(self):
+        def operation(app, i):
+            with silenced():
+                app.due_tasks()
+        return self.measure(self.open_app, operation, self.operations)
+
+    def bench_report(self):
+        # Sayaçlar ilk raporda kurulur; sonraki raporlar araya giren
+        # tamamlamalarla artımlı güncellenen sayaçlardan okunur
+        ids = self.sample_ids(self.operations + 1)
+
+        def setup():
+            app = self.open_app()
+            app.storage.on_dirty = lambda: None
+            return app
+
+        def operation(app, i):
+            app.storage.update(ids[i], status="tamamlandı", completed_at=current_time())
+            with silenced():
+                app.productivity_report()
+        return self.measure(setup, operation, self.operations)
+
+    def bench_get_statistics(self):
+        def operation(app, i):
+            with silenced():
+                app.get_statistics()
+        return self.measure(self.open_app, operation, self.operations)
+
+    def open_gui(self, sort="id"):
+        """Uygulamayı ve penceresiz arayüzü aç"""
+        state = Holder()
+        state.app = self.open_app()
+        state.gui = HeadlessGUI(state.app.storage)
+        # Arayüzde olduğu gibi disk yazımı yenilemeden ayrı yapılır
+        state.app.storage.on_dirty = lambda: None
+        state.gui.sort_var.set(sort)
+        return state
+
+    def bench_gui_refresh(self):
+        statuses = ("tümü", "bekliyor", "tamamlandı")
+
+        def setup():
+            state = self.open_gui()
+            # Her süzgecin ilk kullanımında kurulan yapılar ölçüme girmez
+            for status in statuses:
+                state.gui.filter_var.set(status)
+                state.gui.refresh_task_list()
+            return state
+
+        def operation(state, i):
+            state.gui.filter_var.set(statuses[i % 3])
+            state.gui.refresh_task_list()
+        return self.measure(setup, operation, GUI_SAMPLES)
+
+    def bench_gui_refresh_sorted(self):
+        # Sıralı indeks ve her durumun sıralı listesi kurulumda oluşturulur;
+        # her ölçümde araya bir değişiklik girer, yenilemeler artımlı
+        # güncellenen indeksi okur
+        ids = self.sample_ids(GUI_SAMPLES + 1)
+        statuses = ("tümü", "bekliyor", "tamamlandı")
+
+        def setup():
+            state = self.open_gui("öncelik")
+            for status in statuses:
+                state.gui.filter_var.set(status)
+                state.gui.refresh_task_list()
+            return state
+
+        def operation(state, i):
+            state.app.storage.update(ids[i], priority=("düşük", "orta", "yüksek")[i % 3])
+            state.gui.filter_var.set(statuses[i % 3])
+            state.gui.refresh_task_list()
+        return self.measure(setup, operation, GUI_SAMPLES)
+
+    def bench_gui_refresh_filtered(self):
+        # Etiket, öncelik ve durum birleşimleri bit eşlem indeksinden süzülür;
+        # her ölçümde araya bir etiket değişikliği girer
+        ids = self.sample_ids(GUI_SAMPLES + 1)
+        filters = [("tümü", "tümü", "iş", False), ("bekliyor", "yüksek", "iş", False),
+                   ("tümü", "tümü", "iş, acil", False), ("bekliyor", "tümü", "ev, finans", True),
+                   ("tamamlandı", "düşük", "proje", False)]
+
+        def apply(state, i):
+            status, priority, tags, any_tag = filters[i % len(filters)]
+            state.gui.filter_var.set(status)
+            state.gui.priority_filter_var.set(priority)
+            state.gui.tag_filter_var.set(tags)
+            state.gui.any_tag_var.set(any_tag)
+            state.gui.refresh_task_list()
+
+        def setup():
+            state = self.open_gui()
+            for i in range(len(filters)):
+                apply(state, i)
+            return state
+
+        def operation(state, i):
+            state.app.storage.update(ids[i], tags=("acil", "iş")[:i % 3])
+            apply(state, i)
+        return self.measure(setup, operation, GUI_SAMPLES)
+
+
+class Holder:
+    """Ölçüm sırasında değişen durumu taşır"""
+
+    def __init__(self):
+        self.app = None
+        self.gui = None
+
+
+@contextlib.contextmanager
+def silenced():
+    """Uygulamanın ekran çıktısını at (yazdırma maliyeti yine ölçülür)"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        yield
+
+
+def run_benchmarks(sizes, backend, operations, repeat, seed):
+    """Her boyut için dosya üret ve ölç; "backend/boyut/işlem" -> özet"""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="todo-bench-") as tmp:
+        for size in sizes:
+            source_dir = os.path.join(tmp, f"source-{size}")
+            work_dir = os.path.join(tmp, f"work-{size}")
+            os.makedirs(source_dir)
+            os.makedirs(work_dir)
+            source = os.path.join(source_dir, f"tasks.{backend}")
+            numbered_source = os.path.join(source_dir, f"numbered.{backend}")
+            print(f"{size} gorev uretiliyor ({backend})...", file=sys.stderr)
+            write_task_file(source, size, seed)
+            write_task_file(numbered_source, size, seed, numbered=True)
+            # Makine hızı ölçümlerden önce ve sonra ölçülür; ortalaması o
+            # boyuttaki ölçümlere eşlik eder
+            before = calibrate()
+            summaries = Benchmark(source, work_dir, size, operations, repeat, seed,
+                                  numbered_source).run()
+            calibration_ms = round((before + calibrate()) / 2, 4)
+            for name, summary in summaries.items():
+                key = f"{backend}/{size}/{name}"
+                summary["calibration_ms"] = calibration_ms
+                results[key] = summary
+                print(f"  {key}: p50 {summary['p50_ms']:.3f} ms", file=sys.stderr)
+            shutil.rmtree(source_dir)
+            shutil.rmtree(work_dir)
+    return results
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Temel değerlere göre gerilemeleri listele.
+
+    Temel süre, ölçüm anındaki kalibrasyonun temel değerinkine oranıyla
+    ölçeklenir: iki kat yavaş bir makinede beklenen süre de iki katıdır.
+    Kalibrasyonu olmayan (eski biçimli) kayıtların süreleri karşılaştırılmaz.
+    """
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if "calibration_ms" in base:
+            scale = current["calibration_ms"] / base["calibration_ms"]
+            expected = base["p50_ms"] * scale
+            limit = expected * (1 + time_tolerance)
+            if current["p50_ms"] > limit and current["p50_ms"] - expected > MIN_TIME_DELTA_MS:
+                regressions.append(f"{key}: p50 {current['p50_ms']:.3f} ms > "
+                                   f"{expected:.3f} ms (temel {base['p50_ms']:.3f} ms x hiz "
+                                   f"orani {scale:.2f}, +%{time_tolerance * 100:.0f})")
+        limit = base["peak_kb"] * (1 + memory_tolerance)
+        if current["peak_kb"] > limit and current["peak_kb"] - base["peak_kb"] > MIN_MEMORY_DELTA_KB:
+            regressions.append(f"{key}: bellek {current['peak_kb']:.0f} KB > "
+                               f"{base['peak_kb']:.0f} KB (+%{memory_tolerance * 100:.0f})")
+    return regressions
+
+
+def print_table(results):
+    """Sonuçları tablo olarak yazdır"""
+    print(f"{'olcum':<32} {'islem/s':>10} {'p50 ms':>10} {'p95 ms':>10} "
+          f"{'p99 ms':>10} {'tepe KB':>10}")
+    print("-" * 87)
+    for key, summary in results.items():
+        ops = summary["ops_per_s"]
+        print(f"{key:<32} {ops if ops is not None else 0:>10.1f} "
+              f"{summary['p50_ms']:>10.3f} {summary['p95_ms']:>10.3f} "
+              f"{summary['p99_ms']:>10.3f} {summary['peak_kb']:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="TodoApp/TodoGUI performans olcumu; temel degerlere gore gerileme kontrolu")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Gorev sayilari (varsayilan: 1000 10000 100000)")
+    parser.add_argument("--backend", choices=["json", "tdb", "db"], default="json",
+                        help="Depolama bicimi (varsayilan: json)")
+    parser.add_argument("--operations", type=int, default=200,
+                        help="Tek gorevlik islemlerin tekrar sayisi (varsayilan: 200)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Yukleme, kaydetme, listeleme tekrar sayisi (varsayilan: 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Temel deger dosyasi (varsayilan: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Sonuclari temel deger olarak kaydet (mevcut kayitlarla birlestirilir)")
+    parser.add_argument("--accept-regressions", action="store_true",
+                        help="--save-baseline ile: gerileme olsa da kaydet (bilerek kabul edilen "
+                             "yavaslamalar icin)")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--output", help="Sonuclari JSON olarak bu dosyaya da yaz")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.backend, args.operations, args.repeat, args.seed)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} gerileme:")
+        for line in regressions:
+            print(f"   {line}")
+        if not (args.save_baseline and args.accept_regressions):
+            if args.save_baseline:
+                print("Temel degerler kaydedilmedi (bilerek kabul ediliyorsa: --accept-regressions)")
+            sys.exit(1)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(),
+                       "machine": platform.machine(),
+                       "results": dict(sorted(baseline.items()))}, file, indent=2)
+            file.write("\n")
+        print(f"\nTemel degerler kaydedildi: {args.baseline}")
+        return
+    print("\nGerileme yok." if baseline else "\nTemel deger dosyasi yok; karsilastirma yapilmadi.")
+
+
+if __name__ == "__main__":
+    main()
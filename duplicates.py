@@ -0,0 +1,237 @@
+import hashlib
+import random
+import sys
+
+from search import tokenize
+
+# Benzerlik eşiği: başlıkların üçlü harf kümelerinin Jaccard benzerliği
+DUPLICATE_THRESHOLD = 0.7
+
+# MinHash imzası BANDS * ROWS kutudan oluşur; LSH'de her bant ayrı bir kova
+# anahtarıdır. 8 x 4 ile Jaccard 0.8 olan başlıklar %98, 0.7 olanlar %89
+# olasılıkla aday olur; 0.1 benzerlikteki başlıkların aday olma olasılığı
+# binde birin altındadır.
+BANDS = 8
+ROWS = 4
+BINS = BANDS * ROWS
+_BIN_BITS = BINS.bit_length() - 1
+
+# Bir kovada en çok bu kadar anahtar tutulur. Ortak kelimeli başlıklar
+# (ör. "Faturayı öde 12", "Faturayı öde 13", ...) aynı kovalara düşer; dolu bir
+# kovaya eklenen anahtar oradaki anahtarlara zaten en az dört kutuda eştir.
+# Böylece bir aramada doğrulanan aday sayısı BANDS * BUCKET_SIZE ile sınırlı
+# kalır ve arama süresi depo büyüdükçe artmaz.
+BUCKET_SIZE = 32
+
+_EMPTY = 1 << 64
+
+# Boş kutuların değer alacağı kutuların sabit, rastgele sırası
+_PROBES = [random.Random(i).choices(range(BINS), k=4 * BINS) for i in range(BINS)]
+
+# Shingle özetleri. Süreçten sürece değişen hash() yerine sabit bir özet
+# kullanılır; aynı girdi her çalıştırmada aynı kovalara düşer ve aynı
+# benzerleri verir. Farklı üçlülerin sayısı sınırlıdır, özetler bir kez
+# hesaplanıp saklanır.
+_hashes = {}
+
+
+def title_key(title):
+    """Başlığın karşılaştırma anahtarı: katlanmış kelimeler tek boşlukla.
+
+    "Python çalış!" ile "python  calis" aynı anahtarı verir.
+    """
+    return " ".join(tokenize(title))
+
+
+def shingles(key):
+    """Anahtarın üçlü harf (shingle) kümesi; baş ve sona boşluk eklenir"""
+    text = f" {key} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(first, second):
+    """İki shingle kümesinin Jaccard benzerliği"""
+    if not first and not second:
+        return 1.0
+    common = len(first & second)
+    return common / (len(first) + len(second) - common)
+
+
+def signature(shingle_set):
+    """Tek geçişli (one-permutation) MinHash imzası.
+
+    Her shingle bir kez özetlenir; özetin alt bitleri kutuyu, kalanı değeri
+    seçer ve her kutuda en küçük değer tutulur. Boş kalan kutular, her kutu
+    için sabit rastgele bir sırayla denenen ilk dolu kutunun değerini alır
+    (optimal densification); böylece k ayrı özet fonksiyonu yerine shingle
+    başına tek özet yeter ve boş kutular birbirine bağlı olmaz.
+    """
+    bins = [_EMPTY] * BINS
+    hashes = _hashes
+    for shingle in shingle_set:
+        value = hashes.get(shingle)
+        if value is None:
+            value = _shingle_hash(shingle)
+        index = value & (BINS - 1)
+        value >>= _BIN_BITS
+        if value < bins[index]:
+            bins[index] = value
+    if _EMPTY in bins and min(bins) < _EMPTY:
+        filled = bins[:]
+        for i in range(BINS):
+            if filled[i] == _EMPTY:
+                for source in _PROBES[i]:
+                    if filled[source] < _EMPTY:
+                        bins[i] = filled[source]
+                        break
+                else:
+                    bins[i] = min(filled)
+    return tuple(bins)
+
+
+def _shingle_hash(shingle):
+    value = _hashes[sys.intern(shingle)] = int.from_bytes(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+    return value
+
+
+def band_keys(sig):
+    """İmzanın LSH bant anahtarları"""
+    return [hash(sig[start:start + ROWS]) for start in range(0, BINS, ROWS)]
+
+
+class DuplicateIndex:
+    """Aynı ve benzer başlıklı görevleri bulmak için indeks.
+
+    Aynı görevler, katlanmış başlık anahtarı -> görev ID'leri sözlüğünden
+    tek bir sözlük aramasıyla bulunur. Benzerler için her farklı anahtarın
+    MinHash imzası bantlara bölünür ve her bant bir kovaya (LSH) konur;
+    yeni başlık yalnızca bantlarından biri eşleşen anahtarlarla
+    karşılaştırılır. Görevlerin tamamı taranmaz. Aynı başlıklı görevler tek
+    anahtarı paylaştığından shingle kümesi ve imza farklı başlık başına bir
+    kez hesaplanır. Kümeler adaylar doğrulanırken yeniden kullanılmak üzere
+    demet olarak saklanır; üçlü metinleri sys.intern ile paylaşılır. İndeks
+    depodaki değişiklik bildirimleriyle artımlı güncellenir.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.shingle_sets = {}
+        self.buckets = [{} for _ in range(BANDS)]
+
+    def build(self, tasks):
+        """İndeksi görevlerden baştan kur"""
+        self.keys = {}
+        self.shingle_sets = {}
+        self.buckets = [{} for _ in range(BANDS)]
+        keys = self.keys
+        # Aynı başlık metinleri bir kez katlanır
+        title_keys = {}
+        for task in tasks:
+            key = title_keys.get(task.title)
+            if key is None:
+                key = title_keys[task.title] = title_key(task.title)
+            ids = keys.get(key)
+            if ids is None:
+                keys[key] = {task.id}
+            else:
+                ids.add(task.id)
+        for key in keys:
+            self._add_key(key)
+
+    def on_change(self, old, new):
+        """Depo değişiklik bildirimi: başlık değiştiyse anahtarı güncelle"""
+        old_key = title_key(old.title) if old is not None else None
+        new_key = title_key(new.title) if new is not None else None
+        if old_key == new_key and old is not None and new is not None:
+            return
+        if old is not None:
+            ids = self.keys.get(old_key)
+            if ids is not None:
+                ids.discard(old.id)
+                if not ids:
+                    del self.keys[old_key]
+                    self._remove_key(old_key)
+        if new is not None:
+            ids = self.keys.get(new_key)
+            if ids is None:
+                self.keys[new_key] = {new.id}
+                self._add_key(new_key)
+            else:
+                ids.add(new.id)
+
+    def find(self, title, threshold=DUPLICATE_THRESHOLD):
+        """Başlığa benzeyen görevler: (benzerlik, görev ID) listesi, en benzer önce.
+
+        Katlanmış başlığı aynı olan görevlerin benzerliği 1.0'dır.
+        """
+        key = title_key(title)
+        if not key:
+            return []
+        matches = [(1.0, task_id) for task_id in self.keys.get(key, ())]
+        query = shingles(key)
+        candidates = set()
+        for bucket, band in zip(self.buckets, band_keys(signature(query))):
+            found = bucket.get(band)
+            if found is None:
+                continue
+            if type(found) is str:
+                candidates.add(found)
+            else:
+                candidates |= found
+        candidates.discard(key)
+        # similarity() burada açılır: saklanan kümeler demettir ve adaylar sık
+        # sınandığından çağrı maliyeti belirgindir
+        size = len(query)
+        shingle_sets = self.shingle_sets
+        for candidate in candidates:
+            shingle_set = shingle_sets[candidate]
+            common = len(query.intersection(shingle_set))
+            score = common / (size + len(shingle_set) - common)
+            if score >= threshold:
+                matches.extend((score, task_id) for task_id in self.keys[candidate])
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return matches
+
+    # Kovaların çoğunda tek anahtar olur; bellek için tek anahtar küme yerine
+    # doğrudan metin olarak tutulur
+
+    def _add_key(self, key):
+        shingle_set = self.shingle_sets[key] = tuple(map(sys.intern, shingles(key)))
+        for bucket, band in zip(self.buckets, band_keys(signature(shingle_set))):
+            keys = bucket.get(band)
+            if keys is None:
+                bucket[band] = key
+            elif type(keys) is str:
+                bucket[band] = {keys, key}
+            elif len(keys) < BUCKET_SIZE:
+                keys.add(key)
+
+    def _remove_key(self, key):
+        for bucket, band in zip(self.buckets, band_keys(signature(self.shingle_sets.pop(key)))):
+            keys = bucket.get(band)
+            if keys is None:
+                continue
+            if type(keys) is str:
+                if keys == key:
+                    del bucket[band]
+                continue
+            keys.discard(key)
+            if len(keys) == 1:
+                bucket[band] = keys.pop()
+
+
+def find_duplicates(storage, title, status=None, limit=5, threshold=DUPLICATE_THRESHOLD):
+    """Depoda başlığa benzeyen görevler: (benzerlik, görev) listesi.
+
+    status verilirse yalnızca o durumdaki görevler döner.
+    """
+    result = []
+    for score, task_id in storage.index(DuplicateIndex).find(title, threshold):
+        task = storage.get(task_id)
+        if task is None or (status is not None and task.status != status):
+            continue
+        result.append((score, task))
+        if len(result) == limit:
+            break
+    return result
@@ -0,0 +1,286 @@
+import re
+from datetime import date, datetime, timedelta
+from itertools import compress
+
+from ordering import CompletedAtOrder, CreatedOrder
+
+# Etiketler virgül ya da boşlukla ayrılır; baştaki "#" yok sayılır
+TAG_SEPARATOR = re.compile(r"[,\s]+")
+
+# bin() çıktısındaki "0"/"1" karakterlerini 0/1 baytlarına çevirir
+BIT_TABLE = bytes.maketrans(b"01", b"\x00\x01")
+
+# Dönem adları: bugün/dün ile bu ve geçen hafta/ay/yıl
+PERIOD_NAMES = ("bugun", "dun", "bu-hafta", "gecen-hafta", "bu-ay", "gecen-ay",
+                "bu-yil", "gecen-yil")
+PERIOD_ALIASES = {"bugün": "bugun", "dün": "dun", "geçen-hafta": "gecen-hafta",
+                  "geçen-ay": "gecen-ay", "bu-yıl": "bu-yil", "geçen-yıl": "gecen-yil"}
+
+
+def parse_tags(value):
+    """Etiket metnini ya da listesini sıralı, tekrarsız küçük harfli etiketlere çevir.
+
+    Listedeki öğeler de ayırıcılardan bölünür: etiketler SQLite, .tdb ve
+    CSV'de virgülle birleştirilip bölündüğünden virgül ya da boşluk içeren
+    bir etiket hiçbir depoda tek etiket olarak kalamaz.
+    """
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = [value]
+    tags = {tag.lstrip("#").lower() for item in value for tag in TAG_SEPARATOR.split(item)}
+    tags.discard("")
+    return tuple(sorted(tags))
+
+
+def parse_day(text, end=False):
+    """Tarih sınırını zaman damgasına çevir.
+
+    Yalnızca tarih verilirse başlangıç için günün başı, bitiş (end) için
+    günün son saniyesi kullanılır. Okunamayan metinde ValueError yükseltilir.
+    """
+    text = text.strip()
+    value = datetime.fromisoformat(text)
+    if end and len(text) <= len("YYYY-MM-DD"):
+        value += timedelta(days=1, seconds=-1)
+    return int(value.timestamp())
+
+
+def _day_start(day):
+    return int(datetime.combine(day, datetime.min.time()).timestamp())
+
+
+def _named_period(name, today):
+    # (ilk gün, sonraki dönemin ilk günü)
+    if name in ("bugun", "dun"):
+        day = today - timedelta(days=name == "dun")
+        return day, day + timedelta(days=1)
+    if name.endswith("hafta"):
+        start = today - timedelta(days=today.weekday())
+        if name.startswith("gecen"):
+            start -= timedelta(days=7)
+        return start, start + timedelta(days=7)
+    if name.endswith("ay"):
+        start = today.replace(day=1)
+        if name.startswith("gecen"):
+            start = (start - timedelta(days=1)).replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        return start, end
+    year = today.year - name.startswith("gecen")
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def _calendar_period(text):
+    # "YYYY", "YYYY-MM" ya da "YYYY-MM-DD"
+    parts = text.split("-")
+    if len(parts) == 1:
+        year = int(parts[0])
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    if len(parts) == 2:
+        start = date(int(parts[0]), int(parts[1]), 1)
+        return start, (start + timedelta(days=32)).replace(day=1)
+    start = date.fromisoformat(text)
+    return start, start + timedelta(days=1)
+
+
+def parse_period(text, today=None):
+    """Dönemi (başlangıç, bitiş) zaman damgası çiftine çevir; bitiş dahildir.
+
+    "bugun", "dun", "bu-hafta", "gecen-hafta", "bu-ay", "gecen-ay",
+    "bu-yil", "gecen-yil", "YYYY", "YYYY-MM", "YYYY-MM-DD" ya da iki
+    ucu bu biçimlerde "A..B" aralığı yazılabilir (uçlardan biri boş
+    bırakılabilir). Haftalar pazartesi başlar. Okunamayan metinde
+    ValueError yükseltilir.
+    """
+    text = text.strip().lower()
+    today = date.today() if today is None else today
+    if ".." in text:
+        first, last = text.split("..", 1)
+        start = parse_period(first, today)[0] if first.strip() else None
+        end = parse_period(last, today)[1] if last.strip() else None
+        return start, end
+    name = PERIOD_ALIASES.get(text, text)
+    if name in PERIOD_NAMES:
+        start, end = _named_period(name, today)
+    else:
+        start, end = _calendar_period(text)
+    return _day_start(start), _day_start(end) - 1
+
+
+def _in_range(value, start, end):
+    # Zamanı olmayan görev hiçbir aralığa girmez
+    return (value is not None and (start is None or value >= start)
+            and (end is None or value <= end))
+
+
+def bitmap_from_ids(ids):
+    """ID'lerden bit eşlem (i. bit = i ID'li görev) oluştur"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    data = bytearray(max(ids) // 8 + 1)
+    for task_id in ids:
+        data[task_id >> 3] |= 1 << (task_id & 7)
+    return int.from_bytes(data, "little")
+
+
+def bitmap_ids(bits, after=None):
+    """Bit eşlemdeki ID'leri artan sırayla listele (after verilirse ondan büyükler).
+
+    Bitler Python döngüsü yerine bin() metni ve itertools.compress ile
+    çözülür; bir milyon bitlik eşlem onlarca milisaniyede açılır.
+    """
+    start = 0
+    if after is not None:
+        start = after + 1
+        bits >>= start
+    if not bits:
+        return []
+    flags = bin(bits)[:1:-1].encode("ascii").translate(BIT_TABLE)
+    return list(compress(range(start, start + len(flags)), flags))
+
+
+class FilterIndex:
+    """Durum, öncelik ve etiketler için bit eşlem (bitmap) indeksi.
+
+    Her değer için görev ID'lerini bit olarak tutan bir Python tam sayısı
+    saklanır. Birleşik süzgeçler görevlere tek tek bakmadan eşlemlerin
+    kesişimi (&) ve birleşimiyle (|) hesaplanır; bu işlemler C düzeyinde,
+    milyon görevde bile mikrosaniyeler içinde yapılır. İndeks depodaki
+    değişiklik bildirimleriyle artımlı güncellenir: değişen değerin bitleri
+    çevrilir (^).
+    """
+
+    def __init__(self):
+        self.bitmaps = {}
+
+    @staticmethod
+    def keys(task):
+        """Görevin yer aldığı eşlemler: ("status", değer), ("priority", değer), ("tag", etiket)"""
+        return {("status", task.status), ("priority", task.priority),
+                *(("tag", tag) for tag in task.tags)}
+
+    def build(self, tasks):
+        """İndeksi görevlerden baştan kur"""
+        groups = {}
+        for task in tasks:
+            for key in self.keys(task):
+                ids = groups.get(key)
+                if ids is None:
+                    ids = groups[key] = []
+                ids.append(task.id)
+        self.bitmaps = {key: bitmap_from_ids(ids) for key, ids in groups.items()}
+
+    def on_change(self, old, new):
+        """Depo değişiklik bildirimi: değişen değerlerin bitlerini çevir"""
+        old_keys = self.keys(old) if old is not None else set()
+        new_keys = self.keys(new) if new is not None else set()
+        if old_keys:
+            bit = 1 << old.id
+            for key in old_keys - new_keys:
+                self.bitmaps[key] ^= bit
+        if new_keys:
+            bit = 1 << new.id
+            for key in new_keys - old_keys:
+                self.bitmaps[key] = self.bitmaps.get(key, 0) ^ bit
+
+    def bitmap(self, kind, value):
+        """Değere sahip görevlerin eşlemi"""
+        return self.bitmaps.get((kind, value), 0)
+
+    def tags(self):
+        """Kullanılan etiketler ve görev sayıları"""
+        return {value: bits.bit_count() for (kind, value), bits in self.bitmaps.items()
+                if kind == "tag" and bits}
+
+
+class TaskFilter:
+    """Birleşik görev süzgeci: durum, öncelik, etiketler (hepsi ya da herhangi
+    biri), oluşturulma ve tamamlanma tarihi aralıkları.
+
+    select() eşleşen görevlerin eşlemini depo indekslerinden hesaplar;
+    matches() tek bir görevi (ör. arayüzde değişen satırı) sınar.
+    """
+
+    def __init__(self, status=None, priority=None, tags=(), any_tag=False,
+                 since=None, until=None, completed_since=None, completed_until=None):
+        self.status = status
+        self.priority = priority
+        self.tags = tuple(tags)
+        self.any_tag = any_tag
+        self.since = since
+        self.until = until
+        self.completed_since = completed_since
+        self.completed_until = completed_until
+
+    def is_empty(self):
+        return self.status is None and not self.needs_index()
+
+    def needs_index(self):
+        """Durum süzgecinin ötesinde bir ölçüt var mı"""
+        return (self.priority is not None or bool(self.tags)
+                or self.since is not None or self.until is not None
+                or self.has_completed_range())
+
+    def has_completed_range(self):
+        return self.completed_since is not None or self.completed_until is not None
+
+    def matches(self, task):
+        if self.status is not None and task.status != self.status:
+            return False
+        if self.priority is not None and task.priority != self.priority:
+            return False
+        if self.tags:
+            check = any if self.any_tag else all
+            if not check(tag in task.tags for tag in self.tags):
+                return False
+        if self.since is not None or self.until is not None:
+            if not _in_range(task.created_at, self.since, self.until):
+                return False
+        if self.has_completed_range():
+            if not _in_range(task.completed_at, self.completed_since, self.completed_until):
+                return False
+        return True
+
+    def select(self, storage):
+        """Eşleşen görevlerin eşlemi; ölçüt yoksa None (tüm görevler).
+
+        Depo kilidi tutulurken çağrılmalıdır.
+        """
+        if self.is_empty():
+            return None
+        index = storage.index(FilterIndex)
+        parts = []
+        if self.status is not None:
+            parts.append(index.bitmap("status", self.status))
+        if self.priority is not None:
+            parts.append(index.bitmap("priority", self.priority))
+        if self.tags:
+            tag_bits = [index.bitmap("tag", tag) for tag in self.tags]
+            if self.any_tag:
+                bits = 0
+                for part in tag_bits:
+                    bits |= part
+                parts.append(bits)
+            else:
+                parts.extend(tag_bits)
+        # Seçici (az bitli) eşlemler önce: kesişim hızla küçülür
+        parts.sort(key=int.bit_count)
+        bits = parts[0] if parts else None
+        for part in parts[1:]:
+            bits &= part
+            if not bits:
+                return 0
+        # Tarih aralıkları zamana göre sıralı indekslerden ikili aramayla
+        # okunur; yalnızca aralıktaki anahtarlara bakılır
+        ranges = []
+        if self.since is not None or self.until is not None:
+            ranges.append((CreatedOrder, self.since, self.until))
+        if self.has_completed_range():
+            ranges.append((CompletedAtOrder, self.completed_since, self.completed_until))
+        for order, start, end in ranges:
+            if bits == 0:
+                break
+            found = bitmap_from_ids(storage.index(order).between(start, end))
+            bits = found if bits is None else bits & found
+        return bits
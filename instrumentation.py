@@ -0,0 +1,174 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# Ölçüm kapalıyken tüm zamanlayıcılar bu tek nesneyi döndürür
+_DISABLED = nullcontext()
+
+
+class TimerStats:
+    """Tek bir işlemin süre toplamları ve son ölçümleri"""
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    # Yüzdelikler en son bu kadar ölçümden hesaplanır
+    SAMPLES = 1024
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=self.SAMPLES)
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.samples.append(elapsed)
+
+    def percentile(self, fraction):
+        """Son ölçümlerin yüzdeliği (saniye)"""
+        samples = sorted(self.samples)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def to_dict(self):
+        return {"count": self.count,
+                "total_ms": self.total * 1000,
+                "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+                "p50_ms": self.percentile(0.50) * 1000,
+                "p95_ms": self.percentile(0.95) * 1000,
+                "max_ms": self.max * 1000}
+
+
+class Metrics:
+    """Süreç genelinde işlem süreleri ve sayaçlar.
+
+    Varsayılan olarak kapalıdır: timed() paylaşılan boş bir bağlam yöneticisi
+    döndürür, count() yalnızca bir bayrağa bakar; ölçülen kodun ek maliyeti
+    bir metod çağrısıdır. İz (trace) açıksa her ölçüm ayrıca Chrome trace
+    olayı olarak saklanır (chrome://tracing veya Perfetto ile açılabilir).
+    Yazıcı iş parçacığından da kayıt yapılabilir.
+    """
+
+    # İz kaydı bu kadar olaydan sonra durur (bellek sınırı)
+    MAX_EVENTS = 100000
+
+    def __init__(self):
+        self.enabled = False
+        self.tracing = False
+        self.lock = threading.Lock()
+        self.reset()
+
+    def enable(self, trace=False):
+        """Ölçümü aç; trace ile her ölçüm olay olarak da saklanır"""
+        self.tracing = trace
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.tracing = False
+
+    def reset(self):
+        """Toplanan tüm ölçümleri sil"""
+        with self.lock:
+            self.timers = {}
+            self.counters = {}
+            self.events = []
+            self.started = time.perf_counter()
+
+    def timed(self, name):
+        """Bloğun süresini `name` işlemine ekleyen bağlam yöneticisi"""
+        if not self.enabled:
+            return _DISABLED
+        return _Timer(self, name)
+
+    def count(self, name, amount=1):
+        """Sayacı artır"""
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, name, start, elapsed):
+        """perf_counter() başlangıcı ve süresi (saniye) verilen ölçümü ekle"""
+        with self.lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                stats = self.timers[name] = TimerStats()
+            stats.add(elapsed)
+            if self.tracing and len(self.events) < self.MAX_EVENTS:
+                self.events.append({"name": name, "ph": "X",
+                                    "ts": (start - self.started) * 1e6,
+                                    "dur": elapsed * 1e6,
+                                    "pid": os.getpid(),
+                                    "tid": threading.get_ident()})
+
+    def to_dict(self):
+        """Ölçümlerin JSON'a yazılabilir özeti"""
+        with self.lock:
+            return {"timers": {name: stats.to_dict()
+                               for name, stats in sorted(self.timers.items())},
+                    "counters": dict(sorted(self.counters.items()))}
+
+    def summary(self):
+        """Ölçümlerin tablo halinde metin özeti"""
+        data = self.to_dict()
+        lines = [f"{'islem':<20} {'adet':>8} {'toplam ms':>11} {'ort ms':>9} "
+                 f"{'p50 ms':>9} {'p95 ms':>9} {'en fazla ms':>12}",
+                 "-" * 84]
+        for name, stats in data["timers"].items():
+            lines.append(f"{name:<20} {stats['count']:>8} {stats['total_ms']:>11.2f} "
+                         f"{stats['mean_ms']:>9.3f} {stats['p50_ms']:>9.3f} "
+                         f"{stats['p95_ms']:>9.3f} {stats['max_ms']:>12.3f}")
+        if not data["timers"]:
+            lines.append("(olcum yok)")
+        if data["counters"]:
+            lines.append("")
+            for name, value in data["counters"].items():
+                lines.append(f"{name:<20} {value:>8}")
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        """Olayları ve özeti Chrome trace JSON biçiminde yaz"""
+        with self.lock:
+            events = list(self.events)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "metrics": self.to_dict()}, file)
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.record(self.name, self.start, time.perf_counter() - self.start)
+
+
+# Uygulamanın tek ölçüm toplayıcısı
+metrics = Metrics()
+
+
+def timed(name):
+    """Fonksiyonun her çağrısını `name` işlemi olarak ölçen dekoratör"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return function(*args, **kwargs)
+            with _Timer(metrics, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,84 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Süreçler arası, dosya tabanlı tavsiye niteliğinde (advisory) kilit.
+
+    Kilit iç içe alınabilir; aynı süreçteki iş parçacıkları da ayrıca
+    sıralanır. Kilit dosyasının içeriği, kilit tutulurken okunup yazılabilen
+    küçük bir sayaçtır (ör. süreçler arasında paylaşılan sonraki görev ID'si).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.depth = 0
+        self.thread_lock = threading.RLock()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def acquire(self):
+        self.thread_lock.acquire()
+        if self.depth == 0:
+            try:
+                if self.file is None:
+                    self.file = open(self.path, 'a+b')
+                if fcntl is not None:
+                    fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+                else:
+                    self.file.seek(0)
+                    while True:
+                        try:
+                            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            # LK_LOCK ~10 saniye dener; kilit hâlâ tutuluyorsa beklemeye devam
+                            continue
+            except BaseException:
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.thread_lock.release()
+
+    def read_counter(self):
+        """Kilit dosyasındaki sayacı oku (boşsa 0); kilit tutulurken çağrılmalı"""
+        self.file.seek(0)
+        text = self.file.read(32).strip()
+        try:
+            return int(text)
+        except ValueError:
+            return 0
+
+    def write_counter(self, value):
+        """Kilit dosyasındaki sayacı değiştir; kilit tutulurken çağrılmalı"""
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write(str(value).encode("ascii"))
+        self.file.flush()
+
+    def close(self):
+        with self.thread_lock:
+            if self.file is not None and self.depth == 0:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,267 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+
+from search import normalize
+
+# Öncelik sırası: küçük değer önce gelir; bilinmeyen öncelik "orta" sayılır
+PRIORITY_RANKS = {"yüksek": 0, "orta": 1, "düşük": 2}
+
+
+class SortedKeyList:
+    """Parçalara bölünmüş sıralı anahtar listesi.
+
+    Anahtarlar en fazla 2 * LOAD uzunlukta sıralı parçalarda tutulur; parça
+    sonları ayrı bir listede ikili aramayla bulunur. Ekleme ve silme tüm
+    listeyi kaydırmak yerine tek bir parçayı değiştirir; ilk anahtarlar
+    doğrudan ilk parçadan okunur.
+    """
+
+    LOAD = 512
+
+    def __init__(self, keys=()):
+        keys = sorted(keys)
+        load = self.LOAD
+        self.chunks = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self.maxes = [chunk[-1] for chunk in self.chunks]
+        self.size = len(keys)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def __getitem__(self, index):
+        """Sıradaki `index`. anahtar; parça uzunlukları üzerinden bulunur"""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        for chunk in self.chunks:
+            if index < len(chunk):
+                return chunk[index]
+            index -= len(chunk)
+
+    def iter_after(self, key):
+        """`key`'den büyük anahtarları sırayla üret"""
+        i = bisect_right(self.maxes, key)
+        if i == len(self.chunks):
+            return
+        chunk = self.chunks[i]
+        yield from chunk[bisect_right(chunk, key):]
+        for chunk in self.chunks[i + 1:]:
+            yield from chunk
+
+    def irange(self, low, high):
+        """low <= anahtar <= high olan anahtarları sırayla üret.
+
+        Başlangıç parçası ve parça içindeki konum ikili aramayla bulunur;
+        yalnızca aralıktaki anahtarlar okunur.
+        """
+        i = bisect_left(self.maxes, low)
+        if i == len(self.chunks):
+            return
+        chunk = self.chunks[i]
+        j = bisect_left(chunk, low)
+        for chunk in self.chunks[i:]:
+            if chunk[-1] <= high:
+                yield from chunk[j:]
+            else:
+                yield from chunk[j:bisect_right(chunk, high)]
+                return
+            j = 0
+
+    def add(self, key):
+        """Anahtarı sırasına ekle"""
+        self.size += 1
+        if not self.chunks:
+            self.chunks.append([key])
+            self.maxes.append(key)
+            return
+        i = bisect_left(self.maxes, key)
+        if i == len(self.maxes):
+            i -= 1
+        chunk = self.chunks[i]
+        insort(chunk, key)
+        self.maxes[i] = chunk[-1]
+        if len(chunk) > 2 * self.LOAD:
+            # Büyüyen parçayı ikiye böl
+            self.chunks[i:i + 1] = [chunk[:self.LOAD], chunk[self.LOAD:]]
+            self.maxes[i:i + 1] = [chunk[self.LOAD - 1], chunk[-1]]
+
+    def remove(self, key):
+        """Anahtarı çıkar; yoksa False"""
+        i = bisect_left(self.maxes, key)
+        if i == len(self.maxes):
+            return False
+        chunk = self.chunks[i]
+        j = bisect_left(chunk, key)
+        if j == len(chunk) or chunk[j] != key:
+            return False
+        del chunk[j]
+        self.size -= 1
+        if chunk:
+            self.maxes[i] = chunk[-1]
+        else:
+            del self.chunks[i]
+            del self.maxes[i]
+        return True
+
+
+class SortedIndex:
+    """Görevleri bir sıralama anahtarına göre tutan indeks.
+
+    Alt sınıflar key(task) tanımlar; anahtarın son elemanı görev ID'sidir,
+    böylece eşit anahtarlar ID sırasına girer ve ID anahtardan okunur. Her
+    durum için ayrı, tüm görevler için de bir (None) sıralı liste tutulur;
+    listeler anahtar nesnelerini paylaşır. İndeks depodaki değişiklik
+    bildirimleriyle artımlı güncellenir; listeyi sıralı göstermek için her
+    seferinde baştan sıralama gerekmez.
+
+    Kurulumda anahtarlar yalnızca toplanır, her liste ilk kullanımda bir kez
+    sıralanır. Henüz sıralanmamış bir listeden ilk kez yalnızca ilk N anahtar
+    istenirse sıralamadan (heapq) alınır; tek seferlik komutlar bu yüzden
+    O(n log N) ile yetinir.
+    """
+
+    def __init__(self):
+        self.lists = {}
+        self.unsorted = {}
+        self.peeked = set()
+
+    @staticmethod
+    def key(task):
+        raise NotImplementedError
+
+    def build(self, tasks):
+        """İndeksi görevlerden baştan kur"""
+        unsorted = {None: []}
+        every = unsorted[None]
+        key = self.key
+        for task in tasks:
+            task_key = key(task)
+            every.append(task_key)
+            keys = unsorted.get(task.status)
+            if keys is None:
+                keys = unsorted[task.status] = []
+            keys.append(task_key)
+        self.lists = {}
+        self.unsorted = unsorted
+        self.peeked = set()
+
+    def on_change(self, old, new):
+        """Depo değişiklik bildirimi: eski anahtarı çıkar, yenisini ekle"""
+        if old is not None:
+            old_key = self.key(old)
+            self._list(old.status).remove(old_key)
+            self._list(None).remove(old_key)
+        if new is not None:
+            new_key = self.key(new)
+            self._list(new.status).add(new_key)
+            self._list(None).add(new_key)
+
+    def keys(self, status=None, after=None):
+        """Anahtarları sırayla üret (status verilmezse tüm görevler).
+
+        after verilirse yalnızca bu anahtardan sonra gelenler üretilir.
+        """
+        if after is not None:
+            return self._list(status).iter_after(after)
+        return iter(self._list(status))
+
+    def ids(self, status=None, limit=None):
+        """Görev ID'lerini sırayla listele"""
+        keys = self._list(status)
+        if limit is None:
+            return [key[-1] for chunk in keys.chunks for key in chunk]
+        return [key[-1] for key in islice(keys, limit)]
+
+    def first(self, status, count):
+        """Durumu verilen ilk `count` görevin ID'leri"""
+        keys = self.unsorted.get(status)
+        if keys is not None and status not in self.peeked:
+            # Tek seferlik istekte sıralamaya gerek yok; tekrar istenirse sıralanır
+            self.peeked.add(status)
+            return [key[-1] for key in heapq.nsmallest(count, keys)]
+        return self.ids(status, count)
+
+    def _list(self, status):
+        keys = self.lists.get(status)
+        if keys is None:
+            keys = self.lists[status] = SortedKeyList(self.unsorted.pop(status, ()))
+        return keys
+
+
+class PriorityOrder(SortedIndex):
+    """Önce yüksek öncelik, aynı öncelikte önce eski görev"""
+
+    @staticmethod
+    def key(task):
+        return (PRIORITY_RANKS.get(task.priority, 1), task.created_at or 0, task.id)
+
+
+class CompletionOrder(SortedIndex):
+    """Önce en son tamamlanan; tamamlanmamışlar sonda"""
+
+    @staticmethod
+    def key(task):
+        completed_at = task.completed_at
+        return (completed_at is None, -(completed_at or 0), task.id)
+
+
+class TimeOrder(SortedIndex):
+    """Bir zaman alanına göre artan sıra; zamanı olmayan görevler sonda.
+
+    Alt sınıflar `field` tanımlar. Zaman aralığı sorguları sıralı listede
+    ikili aramayla aralığın başına atlar ve aralık bitince durur.
+    """
+
+    field = None
+
+    @classmethod
+    def key(cls, task):
+        value = getattr(task, cls.field)
+        return (value is None, value or 0, task.id)
+
+    def range_keys(self, start=None, end=None, status=None):
+        """Zamanı start <= zaman <= end olan anahtarları sırayla üret (sınırlar isteğe bağlı)"""
+        low = (False,) if start is None else (False, start)
+        high = (False, float("inf")) if end is None else (False, end, float("inf"))
+        return self._list(status).irange(low, high)
+
+    def between(self, start=None, end=None, status=None):
+        """Zamanı aralıktaki görevlerin ID'leri, zaman sırasıyla"""
+        return [key[-1] for key in self.range_keys(start, end, status)]
+
+
+class DueOrder(TimeOrder):
+    """Önce bitiş zamanı en yakın olan; bitiş zamanı olmayanlar sonda"""
+
+    field = "due_at"
+
+
+class CreatedOrder(TimeOrder):
+    """Oluşturulma zamanına göre; tarih aralığı süzgecinde kullanılır"""
+
+    field = "created_at"
+
+
+class CompletedAtOrder(TimeOrder):
+    """Tamamlanma zamanına göre artan; "bu hafta tamamlananlar" gibi aralıklar için"""
+
+    field = "completed_at"
+
+
+class TitleOrder(SortedIndex):
+    """Başlığa göre; büyük/küçük harf ve Türkçe karakterlerden bağımsız"""
+
+    @staticmethod
+    def key(task):
+        return (normalize(task.title), task.id)
+
+
+# Kullanıcıya gösterilen sıralama adları
+SORT_ORDERS = {"oncelik": PriorityOrder, "tamamlanma": CompletionOrder, "bitis": DueOrder,
+               "baslik": TitleOrder}
@@ -0,0 +1,84 @@
+import calendar
+from datetime import datetime, time, timedelta
+
+from task import Task, current_time
+
+# Tekrar kuralları: ad -> (birim, adım)
+RECURRENCES = {"günlük": ("day", 1), "haftalık": ("day", 7),
+               "aylık": ("month", 1), "yıllık": ("month", 12)}
+
+# Tahmini adım sayısı için birimlerin en uzun süresi (saniye); yaz saati
+# geçişleri için bir saat pay bırakılır
+UNIT_SECONDS = {"day": 25 * 60 * 60, "month": 31 * 24 * 60 * 60}
+
+# Yalnızca tarih verilen bitiş zamanı o günün sonuna kurulur
+END_OF_DAY = time(23, 59)
+
+# Tarih yerine yazılabilen göreli günler
+RELATIVE_DAYS = {"bugun": 0, "bugün": 0, "yarin": 1, "yarın": 1}
+
+
+def parse_due(text, now=None):
+    """Bitiş zamanını çöz: "YYYY-MM-DD", "YYYY-MM-DD HH:MM", "bugun", "yarin".
+
+    Saat verilmezse gün sonu (23:59) kullanılır. Okunamayan metinde
+    ValueError yükseltilir.
+    """
+    text = text.strip().lower()
+    days = RELATIVE_DAYS.get(text)
+    if days is not None:
+        now = current_time() if now is None else now
+        day = datetime.fromtimestamp(now).date() + timedelta(days=days)
+        return int(datetime.combine(day, END_OF_DAY).timestamp())
+    value = datetime.fromisoformat(text)
+    if len(text) <= len("YYYY-MM-DD"):
+        value = datetime.combine(value.date(), END_OF_DAY)
+    return int(value.timestamp())
+
+
+def _shift(start, unit, amount):
+    # Ay sonundan taşan gün ayın son gününe çekilir (31 Ocak -> 28 Şubat)
+    if unit == "day":
+        return start + timedelta(days=amount)
+    month = start.month - 1 + amount
+    year = start.year + month // 12
+    month = month % 12 + 1
+    day = min(start.day, calendar.monthrange(year, month)[1])
+    return start.replace(year=year, month=month, day=day)
+
+
+def next_due(due_at, rule, after):
+    """Kurala göre `after`'dan sonraki ilk bitiş zamanı.
+
+    Adımlar yerel saatle atılır; günlük görev yaz saati geçişinde de aynı
+    saatte kalır. Bitiş zamanı yoksa `after`'dan bir adım sonrası döner.
+    """
+    unit, step = RECURRENCES[rule]
+    if due_at is None:
+        due_at = after
+    start = datetime.fromtimestamp(due_at)
+    # Uzun süre gecikmiş görevde adımlar tek tek sayılmaz
+    count = max(1, (after - due_at) // (step * UNIT_SECONDS[unit]))
+    while True:
+        value = int(_shift(start, unit, step * count).timestamp())
+        if value > after:
+            return value
+        count += 1
+
+
+def complete_and_repeat(storage, task, now=None):
+    """Görevi tamamla; tekrarlanan görevse sonraki örneğini ekle.
+
+    (tamamlanan görev, eklenen görev ya da None) döndürür. Sonraki örnek aynı
+    başlık, açıklama, öncelik, etiketler ve kuralla, tamamlanma anından sonraki ilk
+    bitiş zamanıyla oluşturulur.
+    """
+    now = current_time() if now is None else now
+    completed = storage.update(task.id, status="tamamlandı", completed_at=now)
+    if completed is None or task.recurrence not in RECURRENCES:
+        return completed, None
+    spawned = Task(storage.allocate_id(), task.title, task.description, task.priority,
+                   "bekliyor", created_at=now,
+                   due_at=next_due(task.due_at, task.recurrence, now),
+                   recurrence=task.recurrence, tags=task.tags)
+    return completed, storage.add(spawned)
@@ -0,0 +1,109 @@
+import heapq
+
+from task import current_time
+
+
+class ReminderScheduler:
+    """Bitiş zamanı gelen bekleyen görevler için hatırlatıcı.
+
+    Bitiş zamanı olan bekleyen görevler (zaman, ID) çiftleri olarak bir
+    min-yığında tutulur ve tek bir `root.after` zamanlayıcısı yığının
+    tepesindeki zamana kurulur; zamanlayıcı çaldığında yalnızca zamanı gelen
+    kayıtlar yığından alınır, liste taranmaz. Görev değiştiğinde yeni kaydı
+    yığına eklenir; eski kayıt silinmez, tepeye geldiğinde `scheduled`
+    tablosundaki güncel zamanla uyuşmadığı için atlanır. Atlanacak kayıtlar
+    çoğalınca yığın baştan kurulur. Bir bitiş zamanı için bir kez hatırlatılır;
+    bitiş zamanı değişirse yeniden hatırlatılır.
+
+    Yalnızca arayüz iş parçacığından çağrılmalıdır.
+    """
+
+    # root.after için en uzun bekleme (ms); daha uzak zamanlarda ara uyanış
+    MAX_DELAY = 24 * 60 * 60 * 1000
+
+    def __init__(self, root, get_task, on_due):
+        self.root = root
+        self.get_task = get_task
+        self.on_due = on_due
+        self.heap = []
+        # Görev ID -> hatırlatılacak bitiş zamanı
+        self.scheduled = {}
+        # Hatırlatması yapılmış görevler: ID -> bitiş zamanı
+        self.reminded = {}
+        self.timer = None
+        self.deadline = None
+
+    def build(self, tasks):
+        """Hatırlatmaları görevlerden baştan kur"""
+        self.scheduled = {task.id: task.due_at for task in tasks
+                          if self._due_at(task) is not None}
+        self._rebuild_heap()
+        self._arm()
+
+    def update(self, task_ids):
+        """Değişen görevlerin hatırlatmalarını güncelle"""
+        for task_id in task_ids:
+            due_at = self._due_at(self.get_task(task_id))
+            if due_at is None:
+                self.scheduled.pop(task_id, None)
+            elif self.scheduled.get(task_id) != due_at:
+                self.scheduled[task_id] = due_at
+                heapq.heappush(self.heap, (due_at, task_id))
+        if len(self.heap) > 2 * len(self.scheduled) + 64:
+            self._rebuild_heap()
+        self._arm()
+
+    def cancel(self):
+        """Kurulu zamanlayıcıyı iptal et"""
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+            self.deadline = None
+
+    def _due_at(self, task):
+        # Hatırlatılacak bitiş zamanı; hatırlatma gerekmiyorsa None
+        if task is None or task.status != "bekliyor" or task.due_at is None:
+            return None
+        if self.reminded.get(task.id) == task.due_at:
+            return None
+        return task.due_at
+
+    def _rebuild_heap(self):
+        self.heap = [(due_at, task_id) for task_id, due_at in self.scheduled.items()]
+        heapq.heapify(self.heap)
+
+    def _discard_stale(self):
+        heap = self.heap
+        while heap and self.scheduled.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _arm(self):
+        # Zamanlayıcı yalnızca en yakın zaman değiştiyse yeniden kurulur
+        self._discard_stale()
+        deadline = self.heap[0][0] if self.heap else None
+        if deadline == self.deadline:
+            return
+        self.cancel()
+        if deadline is None:
+            return
+        delay = min(max(0, deadline - current_time()) * 1000, self.MAX_DELAY)
+        self.timer = self.root.after(delay, self._fire)
+        self.deadline = deadline
+
+    def _fire(self):
+        self.timer = None
+        self.deadline = None
+        now = current_time()
+        due = []
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            due_at, task_id = heapq.heappop(heap)
+            if self.scheduled.get(task_id) == due_at:
+                del self.scheduled[task_id]
+                self.reminded[task_id] = due_at
+                task = self.get_task(task_id)
+                if task is not None:
+                    due.append(task)
+        self._arm()
+        if due:
+            self.on_due(due)
@@ -0,0 +1,153 @@
+from datetime import date
+
+from ordering import SortedKeyList
+from task import current_time
+
+# Rapor varsayılanları: günlük dökümde gün, haftalık eğilimde hafta sayısı
+DEFAULT_REPORT_DAYS = 14
+DEFAULT_REPORT_WEEKS = 8
+
+
+def day_of(timestamp):
+    """Zaman damgasının yerel takvim günü (date.toordinal değeri)"""
+    return date.fromtimestamp(timestamp).toordinal()
+
+
+def week_start(day):
+    """Günün haftasının pazartesisi (1. gün pazartesidir)"""
+    return day - (day - 1) % 7
+
+
+class ProductivityIndex:
+    """Verimlilik raporu için artımlı sayaçlar.
+
+    Her gün için eklenen ve tamamlanan görev sayıları ile tamamlanan
+    görevlerin tamamlanma süreleri (sıralı liste) tutulur. Sayaçlar depodaki
+    değişiklik bildirimleriyle güncellenir; rapor görev listesini taramadan,
+    yalnızca istenen günlerin sayaçlarından hazırlanır. Yıllarca geçmişi olan
+    bir depoda bile gün sayısı birkaç bini geçmez.
+    """
+
+    def __init__(self):
+        self.created_days = {}
+        self.completed_days = {}
+        self.durations = SortedKeyList()
+
+    @staticmethod
+    def entry(task):
+        """Görevin sayaçlara katkısı: (eklenme günü, tamamlanma günü, süre)"""
+        created_day = None if task.created_at is None else day_of(task.created_at)
+        if task.status != "tamamlandı" or task.completed_at is None:
+            return created_day, None, None
+        duration = None
+        if task.created_at is not None:
+            duration = max(0, task.completed_at - task.created_at)
+        return created_day, day_of(task.completed_at), duration
+
+    def build(self, tasks):
+        """Sayaçları görevlerden baştan kur"""
+        self.created_days = {}
+        self.completed_days = {}
+        durations = []
+        for task in tasks:
+            created_day, completed_day, duration = self.entry(task)
+            self._count(self.created_days, created_day, 1)
+            self._count(self.completed_days, completed_day, 1)
+            if duration is not None:
+                durations.append(duration)
+        self.durations = SortedKeyList(durations)
+
+    def on_change(self, old, new):
+        """Depo değişiklik bildirimi: eski katkıyı çıkar, yenisini ekle"""
+        old_entry = self.entry(old) if old is not None else (None, None, None)
+        new_entry = self.entry(new) if new is not None else (None, None, None)
+        if old_entry == new_entry:
+            # Başlık, öncelik gibi alanların değişmesi sayaçları etkilemez
+            return
+        for (created_day, completed_day, duration), step in ((old_entry, -1), (new_entry, 1)):
+            self._count(self.created_days, created_day, step)
+            self._count(self.completed_days, completed_day, step)
+            if duration is not None:
+                if step > 0:
+                    self.durations.add(duration)
+                else:
+                    self.durations.remove(duration)
+
+    @staticmethod
+    def _count(days, day, step):
+        if day is None:
+            return
+        count = days.get(day, 0) + step
+        if count:
+            days[day] = count
+        else:
+            del days[day]
+
+    def median_duration(self):
+        """Tamamlanma süresinin ortancası (saniye); tamamlanan yoksa None"""
+        durations = self.durations
+        size = len(durations)
+        if not size:
+            return None
+        middle = size // 2
+        if size % 2:
+            return durations[middle]
+        return (durations[middle - 1] + durations[middle]) // 2
+
+    def backlog_before(self, day):
+        """`day` gününden önce eklenip o güne kadar tamamlanmamış görev sayısı"""
+        created = sum(count for created_day, count in self.created_days.items() if created_day < day)
+        completed = sum(count for completed_day, count in self.completed_days.items()
+                        if completed_day < day)
+        return created - completed
+
+    def report(self, days=DEFAULT_REPORT_DAYS, weeks=DEFAULT_REPORT_WEEKS, now=None):
+        """Günlük döküm, haftalık eğilim ve ortanca tamamlanma süresi.
+
+        Günlük satırlar (gün, eklenen, tamamlanan); haftalık satırlar
+        (pazartesi, eklenen, tamamlanan, hafta sonundaki açık iş) olarak
+        eskiden yeniye döner. Günler date.toordinal değerleridir.
+        """
+        today = day_of(current_time() if now is None else now)
+        first_day = min(today - days + 1, week_start(today) - 7 * (weeks - 1))
+        created_days = self.created_days
+        completed_days = self.completed_days
+
+        # Açık iş eğilimi için dönem başındaki birikim bir kez toplanır,
+        # sonra gün gün ilerletilir
+        backlog = self.backlog_before(first_day)
+        daily = []
+        for day in range(first_day, today + 1):
+            created = created_days.get(day, 0)
+            completed = completed_days.get(day, 0)
+            backlog += created - completed
+            daily.append((day, created, completed, backlog))
+
+        weekly = []
+        for start in range(week_start(today) - 7 * (weeks - 1), today + 1, 7):
+            rows = daily[start - first_day:start - first_day + 7]
+            weekly.append((start, sum(row[1] for row in rows), sum(row[2] for row in rows),
+                           rows[-1][3]))
+
+        return {
+            "daily": [row[:3] for row in daily[len(daily) - days:]],
+            "weekly": weekly,
+            "median_duration": self.median_duration(),
+            "completed": sum(completed_days.values()),
+            "backlog": backlog,
+        }
+
+
+def format_duration(seconds, units=("gun", "saat", "dakika")):
+    """Süreyi "3 gun 4 saat" biçiminde yaz; units gün, saat, dakika adlarıdır"""
+    if seconds is None:
+        return "-"
+    day_unit, hour_unit, minute_unit = units
+    minutes = seconds // 60
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days} {day_unit} {hours} {hour_unit}"
+    if hours:
+        return f"{hours} {hour_unit} {minutes} {minute_unit}"
+    return f"{minutes} {minute_unit}"
@@ -0,0 +1,131 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+
+# Türkçe harfleri ASCII karşılıklarına katla (ı/i, ş/s, ğ/g, ü/u, ö/o, ç/c).
+# "İ" ve "I" lower() öncesinde çevrilir; aksi halde "İ".lower() noktalı "i̇" verir.
+TURKISH_FOLD = str.maketrans({
+    "ı": "i", "I": "i", "İ": "i",
+    "ş": "s", "Ş": "s",
+    "ğ": "g", "Ğ": "g",
+    "ü": "u", "Ü": "u",
+    "ö": "o", "Ö": "o",
+    "ç": "c", "Ç": "c",
+})
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Metni arama için katla: küçük harf, Türkçe harfler ve aksanlar ASCII"""
+    text = text.translate(TURKISH_FOLD).lower()
+    if not text.isascii():
+        # Kalan aksanlı harfler (â, î, é ...) için birleşik işaretleri at
+        text = "".join(ch for ch in unicodedata.normalize("NFKD", text)
+                       if not unicodedata.combining(ch))
+    return text
+
+
+def tokenize(text):
+    """Metni katlanmış kelimelere ayır"""
+    return TOKEN_PATTERN.findall(normalize(text))
+
+
+def task_tokens(task):
+    """Görevin başlık ve açıklamasındaki kelimeler"""
+    return set(tokenize(task.title)) | set(tokenize(task.description or ""))
+
+
+class SearchIndex:
+    """Başlık ve açıklamalar üzerinde ters indeks (kelime -> görev ID'leri).
+
+    Kelimeler sıralı bir listede de tutulur; böylece yazarken arama için
+    önek eşleşmeleri ikili aramayla bulunur. İndeks, depodaki değişiklik
+    bildirimleriyle artımlı olarak güncellenir.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.terms = []
+        self.task_terms = {}
+
+    def build(self, tasks):
+        """İndeksi görevlerden baştan kur"""
+        postings = {}
+        task_terms = {}
+        for task in tasks:
+            tokens = task_tokens(task)
+            task_terms[task.id] = tokens
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is None:
+                    postings[token] = {task.id}
+                else:
+                    ids.add(task.id)
+        self.postings = postings
+        self.task_terms = task_terms
+        self.terms = sorted(postings)
+
+    def on_change(self, old, new):
+        """Depo değişiklik bildirimi: eski görevi çıkar, yenisini ekle"""
+        if old is not None:
+            self.remove(old.id)
+        if new is not None:
+            self.add(new)
+
+    def add(self, task):
+        """Görevi indekse ekle"""
+        tokens = task_tokens(task)
+        self.task_terms[task.id] = tokens
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                self.postings[token] = {task.id}
+                insort(self.terms, token)
+            else:
+                ids.add(task.id)
+
+    def remove(self, task_id):
+        """Görevi indeksten çıkar"""
+        for token in self.task_terms.pop(task_id, ()):
+            ids = self.postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                del self.terms[bisect_left(self.terms, token)]
+
+    def search(self, query, limit=None):
+        """Sorgudaki tüm kelimeleri (önek olarak) içeren görev ID'lerini sırayla döndür"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        # Uzun (seçici) önekler önce: kesişim kümesi hızla küçülür
+        result = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            ids = self._prefix_ids(token)
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+        ids = sorted(result)
+        return ids if limit is None else ids[:limit]
+
+    def _prefix_ids(self, prefix):
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\uffff", start)
+        if end - start == 0:
+            return set()
+        if end - start == 1:
+            return self.postings[self.terms[start]]
+        ids = set()
+        for term in self.terms[start:end]:
+            ids |= self.postings[term]
+        return ids
+
+
+def matches(task, query):
+    """Görev, sorgudaki tüm kelimeleri önek olarak içeriyor mu"""
+    tokens = task_tokens(task)
+    return all(any(token.startswith(word) for token in tokens)
+               for word in tokenize(query))
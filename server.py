@@ -0,0 +1,577 @@
+import argparse
+import asyncio
+import json
+import secrets
+import signal
+import sys
+from datetime import date
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from filters import TaskFilter, bitmap_ids, parse_period, parse_tags
+from ordering import SORT_ORDERS, PriorityOrder
+from recurrence import RECURRENCES, complete_and_repeat, parse_due
+from reports import DEFAULT_REPORT_DAYS, DEFAULT_REPORT_WEEKS, ProductivityIndex
+from search import SearchIndex
+from todo_app import PRIORITIES, STATUSES, TodoApp, export_record, normalize_choice
+
+# İstek sınırları
+MAX_HEADERS = 100
+MAX_BODY = 1024 * 1024
+
+# Liste sayfalama
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+# Raporda istenebilecek en uzun dönem (gün)
+MAX_REPORT_DAYS = 3660
+
+# İstek gövdesinde kabul edilen görev alanları; zamanlama alanları ve
+# etiketler null olabilir
+EDITABLE_FIELDS = ("title", "description", "priority", "due_at", "recurrence", "tags")
+NULLABLE_FIELDS = ("due_at", "recurrence", "tags")
+
+
+class HTTPError(Exception):
+    """İstemciye durum koduyla döndürülecek hata"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class TaskServer:
+    """TodoApp işlemlerini JSON HTTP API olarak sunan asyncio sunucusu.
+
+    Okumalar bellekteki depodan doğrudan yanıtlanır. Değişiklikler tek bir
+    yazıcı görevinin kuyruğuna girer: yazıcı kuyrukta biriken değişiklikleri
+    sırayla uygular, hepsini tek seferde kalıcı yapar (tek fsync ya da tek
+    SQLite işlemi) ve yanıtlar ancak bundan sonra gönderilir. Liste, görev ve
+    istatistik yanıtları her değişiklikte artan sürüm numarasından üretilen
+    ETag taşır; If-None-Match eşleşirse gövde hesaplanmadan 304 döner. Sayaçlar
+    her açılışta sıfırdan başladığından ETag'e sunucunun her başlatılışta
+    rastgele seçilen kimliği de eklenir; yeniden başlatmadan önceki bir ETag
+    hiçbir zaman eşleşmez.
+    Yazıcı boşta kaldığında diğer süreçlerin değişiklikleri alınır.
+    """
+
+    # Bir yazımda birleştirilecek en fazla değişiklik
+    MAX_BATCH = 1000
+
+    # Boşta iken diğer süreçlerin değişikliklerini alma aralığı (saniye)
+    REFRESH_INTERVAL = 1.0
+
+    def __init__(self, app):
+        self.app = app
+        self.storage = app.storage
+        self.errors = []
+        self.storage.on_error = self.errors.append
+        # Değişiklikler yazıcı görevinde topluca kalıcı yapılır
+        self.storage.on_dirty = lambda: None
+        self.version = 0
+        self.instance = secrets.token_hex(8)
+        self.storage.subscribe(self.on_change)
+        self.mutations = None
+        self.writer_task = None
+        self.stopping = False
+        # Süzgeç -> sıralı ID listesi; sürüm (ETag) değişince boşaltılır.
+        # Aynı süzgeçle farklı sayfalar istendiğinde liste yeniden kurulmaz.
+        self.id_cache = {}
+        self.id_cache_etag = None
+
+    def on_change(self, old, new):
+        """Depo dinleyicisi; yazıcı iş parçacığından da çağrılabilir"""
+        self.version += 1
+
+    def etag(self):
+        return f'"{self.instance}-{self.storage.reloads}-{self.version}"'
+
+    async def start(self, host, port):
+        """Yazıcı görevini başlat ve bağlantıları dinle"""
+        self.mutations = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self.run_writer())
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def stop(self):
+        """Kuyruktaki değişiklikleri yazıp yazıcıyı durdur.
+
+        Kuyruğa bir bitiş işareti (None) konur ve yazıcının ondan önceki tüm
+        değişiklikleri yazıp yanıtlamasını beklenir; yazıcı iptal edilmez.
+        """
+        self.stopping = True
+        await self.mutations.put(None)
+        await self.writer_task
+
+    # --- Yazıcı ---
+
+    async def submit(self, function, *args):
+        """Değişikliği yazıcı kuyruğuna koy; kalıcı olunca sonucunu döndür"""
+        if self.stopping:
+            raise HTTPError(503, "Sunucu kapaniyor")
+        future = asyncio.get_running_loop().create_future()
+        await self.mutations.put((function, args, future))
+        return await future
+
+    async def run_writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                item = await asyncio.wait_for(self.mutations.get(), self.REFRESH_INTERVAL)
+            except asyncio.TimeoutError:
+                await loop.run_in_executor(None, self.refresh)
+                continue
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = False
+            while len(batch) < self.MAX_BATCH and not self.mutations.empty():
+                item = self.mutations.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self.errors.clear()
+            outcomes = []
+            with self.storage.batch():
+                for function, args, future in batch:
+                    try:
+                        outcomes.append((future, function(*args), None))
+                    except HTTPError as e:
+                        outcomes.append((future, None, e))
+                    except Exception as e:
+                        # Beklenmeyen hata yazıcıyı durdurmamalı
+                        print(f"❌ Islem basarisiz: {e!r}", file=sys.stderr)
+                        outcomes.append((future, None, HTTPError(500, "Sunucu hatasi")))
+            await loop.run_in_executor(None, self.storage.flush)
+
+            failure = None
+            if self.errors:
+                failure = HTTPError(500, f"Gorevler kaydedilemedi: {self.errors[0]}")
+            for future, result, error in outcomes:
+                if future.done():
+                    continue
+                if error is None:
+                    error = failure
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            if stopping:
+                return
+
+    def refresh(self):
+        """Diğer süreçlerin değişikliklerini al (yazıcıda, boşta iken)"""
+        self.storage.refresh()
+
+    # --- Değişiklikler (yazıcıda çalışır) ---
+
+    def add_task(self, fields):
+        task = self.app.create_task(fields["title"], fields.get("description", ""),
+                                    fields.get("priority", "orta"), fields.get("due_at"),
+                                    fields.get("recurrence"), fields.get("tags") or ())
+        if self.storage.add(task) is None:
+            raise HTTPError(500, "Gorev eklenemedi")
+        return 201, export_record(task)
+
+    def complete_task(self, task_id):
+        task = self.storage.get(task_id)
+        if task is None:
+            raise HTTPError(404, f"Gorev bulunamadi: ID {task_id}")
+        if task.status == "tamamlandı":
+            return 200, export_record(task)
+        completed, spawned = complete_and_repeat(self.storage, task)
+        record = export_record(completed)
+        if spawned is not None:
+            record["next"] = export_record(spawned)
+        return 200, record
+
+    def edit_task(self, task_id, fields):
+        task = self.storage.update(task_id, **fields)
+        if task is None:
+            raise HTTPError(404, f"Gorev bulunamadi: ID {task_id}")
+        return 200, export_record(task)
+
+    def delete_task(self, task_id):
+        if self.storage.delete(task_id) is None:
+            raise HTTPError(404, f"Gorev bulunamadi: ID {task_id}")
+        return 204, None
+
+    # --- Okumalar ---
+
+    def list_tasks(self, query):
+        status = _choice(query, "status", STATUSES)
+        priority = _choice(query, "priority", PRIORITIES)
+        tags = parse_tags(query.get("tag", []))
+        any_tag = query.get("any_tag", ["0"])[0].lower() in ("1", "true")
+        since, until = _period(query, "created")
+        completed_since, completed_until = _period(query, "completed")
+        sort = _choice(query, "sort", list(SORT_ORDERS))
+        text = query.get("q", [""])[0]
+        limit = min(_int(query, "limit", DEFAULT_LIMIT), MAX_LIMIT)
+        offset = _int(query, "offset", 0)
+
+        storage = self.storage
+        # Yazıcı iş parçacığı diğer süreçlerin değişikliklerini uygularken beklenir
+        with storage.lock:
+            task_filter = TaskFilter(status, priority, tags, any_tag, since, until,
+                                     completed_since, completed_until)
+            task_ids = self.query_ids(task_filter, text.strip(), sort)
+            page = [export_record(storage.get(task_id))
+                    for task_id in task_ids[offset:offset + limit]]
+        return {"total": len(task_ids), "offset": offset, "limit": limit, "tasks": page}
+
+    def query_ids(self, task_filter, text, sort=None):
+        """Süzgece uyan görevlerin sıralı ID'leri (depo kilidi tutulurken)"""
+        etag = self.etag()
+        if etag != self.id_cache_etag:
+            self.id_cache = {}
+            self.id_cache_etag = etag
+        status = task_filter.status
+        key = (status, task_filter.priority, task_filter.tags, task_filter.any_tag,
+               task_filter.since, task_filter.until, task_filter.completed_since,
+               task_filter.completed_until, text, sort)
+        task_ids = self.id_cache.get(key)
+        if task_ids is not None:
+            return task_ids
+
+        storage = self.storage
+        # Durum dışındaki ölçütler bit eşlem indeksinden tek seferde süzülür
+        bits = task_filter.select(storage) if task_filter.needs_index() else None
+        if sort is not None:
+            # Sıralı indeks değişikliklerle güncel tutulur; yalnızca süzülür
+            task_ids = storage.index(SORT_ORDERS[sort]).ids(status)
+            if text:
+                found = set(storage.index(SearchIndex).search(text))
+                task_ids = [task_id for task_id in task_ids if task_id in found]
+            if bits is not None:
+                wanted = set(bitmap_ids(bits))
+                task_ids = [task_id for task_id in task_ids if task_id in wanted]
+            self.id_cache[key] = task_ids
+            return task_ids
+        if text:
+            task_ids = storage.index(SearchIndex).search(text)
+            if bits is not None:
+                wanted = set(bitmap_ids(bits))
+                task_ids = [task_id for task_id in task_ids if task_id in wanted]
+            elif status is not None:
+                task_ids = [task_id for task_id in task_ids
+                            if storage.get(task_id).status == status]
+        elif bits is not None:
+            task_ids = bitmap_ids(bits)
+        else:
+            task_ids = storage.task_ids(status)
+        task_ids = self.id_cache[key] = sorted(task_ids)
+        return task_ids
+
+    def get_task(self, task_id):
+        with self.storage.lock:
+            task = self.storage.get(task_id)
+            if task is None:
+                raise HTTPError(404, f"Gorev bulunamadi: ID {task_id}")
+            return export_record(task)
+
+    def next_tasks(self, query):
+        count = min(_int(query, "limit", 5), MAX_LIMIT)
+        with self.storage.lock:
+            task_ids = self.storage.index(PriorityOrder).first("bekliyor", count)
+            return {"tasks": [export_record(self.storage.get(task_id))
+                              for task_id in task_ids]}
+
+    def get_report(self, query):
+        days = min(_int(query, "days", DEFAULT_REPORT_DAYS), MAX_REPORT_DAYS)
+        weeks = min(_int(query, "weeks", DEFAULT_REPORT_WEEKS), MAX_REPORT_DAYS // 7)
+        with self.storage.lock:
+            report = self.storage.index(ProductivityIndex).report(days, weeks)
+        report["daily"] = [{"day": date.fromordinal(day).isoformat(), "created": created,
+                            "completed": completed}
+                           for day, created, completed in report["daily"]]
+        report["weekly"] = [{"week": date.fromordinal(start).isoformat(), "created": created,
+                             "completed": completed, "backlog": backlog}
+                            for start, created, completed, backlog in report["weekly"]]
+        return report
+
+    def get_stats(self):
+        with self.storage.lock:
+            stats = self.storage.stats
+            return {"total": stats.total, "completed": stats.completed,
+                    "pending": stats.pending, "completion_rate": stats.completion_rate,
+                    "priorities": stats.priorities()}
+
+    # --- HTTP ---
+
+    async def dispatch(self, method, target, headers, body):
+        """İsteği işle; (durum, gövde, ek başlıklar) döndür"""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["tasks"]:
+            if method == "GET":
+                return self.cached(headers, lambda: self.list_tasks(query))
+            if method == "POST":
+                fields = _task_fields(_json_body(body), create=True)
+                return await self.submit(self.add_task, fields) + ({},)
+            raise HTTPError(405, "Desteklenmeyen yontem")
+
+        if len(parts) in (2, 3) and parts[0] == "tasks":
+            try:
+                task_id = int(parts[1])
+            except ValueError:
+                raise HTTPError(404, "Bulunamadi") from None
+            if len(parts) == 3:
+                if parts[2] != "complete":
+                    raise HTTPError(404, "Bulunamadi")
+                if method != "POST":
+                    raise HTTPError(405, "Desteklenmeyen yontem")
+                return await self.submit(self.complete_task, task_id) + ({},)
+            if method == "GET":
+                return self.cached(headers, lambda: self.get_task(task_id))
+            if method == "PATCH":
+                fields = _task_fields(_json_body(body), create=False)
+                return await self.submit(self.edit_task, task_id, fields) + ({},)
+            if method == "DELETE":
+                return await self.submit(self.delete_task, task_id) + ({},)
+            raise HTTPError(405, "Desteklenmeyen yontem")
+
+        if parts == ["stats"]:
+            if method != "GET":
+                raise HTTPError(405, "Desteklenmeyen yontem")
+            return self.cached(headers, self.get_stats)
+
+        if parts == ["report"]:
+            if method != "GET":
+                raise HTTPError(405, "Desteklenmeyen yontem")
+            # Rapor günün tarihine de bağlı olduğundan ETag ile önbelleğe alınmaz
+            return 200, self.get_report(query), {}
+
+        if parts == ["next"]:
+            if method != "GET":
+                raise HTTPError(405, "Desteklenmeyen yontem")
+            return self.cached(headers, lambda: self.next_tasks(query))
+
+        raise HTTPError(404, "Bulunamadi")
+
+    def cached(self, headers, build):
+        """ETag eşleşirse 304, değilse build() sonucunu döndür"""
+        etag = self.etag()
+        if _etag_matches(headers.get("if-none-match"), etag):
+            return 304, None, {"ETag": etag}
+        return 200, build(), {"ETag": etag}
+
+    async def handle_connection(self, reader, writer):
+        """Bağlantıdaki istekleri sırayla yanıtla (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as e:
+                    await _write_response(writer, e.status, {"error": str(e)}, {}, False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = (connection != "close" if version == "HTTP/1.1"
+                              else connection == "keep-alive")
+                try:
+                    status, payload, extra = await self.dispatch(method, target, headers, body)
+                except HTTPError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, {}
+                except Exception as e:
+                    print(f"❌ Istek basarisiz: {method} {target}: {e!r}", file=sys.stderr)
+                    status, payload, extra = 500, {"error": "Sunucu hatasi"}, {}
+                await _write_response(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader):
+    """Bir HTTP isteği oku; bağlantı kapandıysa None"""
+    try:
+        line = await reader.readline()
+    except ValueError:
+        raise HTTPError(414, "Istek satiri cok uzun") from None
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Gecersiz istek satiri") from None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(431, "Cok fazla baslik")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "transfer-encoding" in headers:
+        raise HTTPError(501, "Parcali govde desteklenmiyor")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Gecersiz Content-Length") from None
+    if length > MAX_BODY:
+        raise HTTPError(413, "Govde cok buyuk")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version, headers, body
+
+
+async def _write_response(writer, status, payload, extra, keep_alive):
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    body = b""
+    if status not in (204, 304):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        lines.append("Content-Type: application/json; charset=utf-8")
+        lines.append(f"Content-Length: {len(body)}")
+    lines.extend(f"{name}: {value}" for name, value in extra.items())
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+def _json_body(body):
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Gecersiz JSON") from None
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Govde bir JSON nesnesi olmali")
+    return data
+
+
+def _task_fields(data, create):
+    """İstek gövdesindeki görev alanlarını doğrula"""
+    unknown = set(data) - set(EDITABLE_FIELDS)
+    if unknown:
+        raise HTTPError(400, f"Bilinmeyen alan: {', '.join(sorted(unknown))}")
+    fields = {}
+    for field in EDITABLE_FIELDS:
+        if field not in data:
+            continue
+        value = data[field]
+        if value is None and field in NULLABLE_FIELDS:
+            fields[field] = () if field == "tags" else None
+            continue
+        if field == "tags":
+            if not isinstance(value, list) or not all(isinstance(tag, str) for tag in value):
+                raise HTTPError(400, "'tags' metin listesi olmali")
+            fields[field] = parse_tags(value)
+            continue
+        if not isinstance(value, str):
+            raise HTTPError(400, f"'{field}' metin olmali")
+        value = value.strip()
+        if field == "priority":
+            value = normalize_choice(value)
+            if value not in PRIORITIES:
+                raise HTTPError(400, f"Gecersiz oncelik: {data[field]}")
+        elif field == "recurrence":
+            value = normalize_choice(value)
+            if value not in RECURRENCES:
+                raise HTTPError(400, f"Gecersiz tekrar: {data[field]}")
+        elif field == "due_at":
+            try:
+                value = parse_due(value)
+            except ValueError:
+                raise HTTPError(400, f"Gecersiz bitis zamani: {data[field]}") from None
+        fields[field] = value
+    if "title" in fields and not fields["title"]:
+        raise HTTPError(400, "Baslik bos olamaz")
+    if create and "title" not in fields:
+        raise HTTPError(400, "'title' zorunlu")
+    return fields
+
+
+def _choice(query, name, choices):
+    value = query.get(name, [None])[0]
+    if value is None:
+        return None
+    value = normalize_choice(value)
+    if value not in choices:
+        raise HTTPError(400, f"Gecersiz {name}: {query[name][0]}")
+    return value
+
+
+def _period(query, name):
+    value = query.get(name, [None])[0]
+    if value is None:
+        return None, None
+    try:
+        return parse_period(value)
+    except ValueError:
+        raise HTTPError(400, f"Gecersiz {name}: {value}") from None
+
+
+def _int(query, name, default):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise HTTPError(400, f"Gecersiz {name}") from None
+    if value < 0:
+        raise HTTPError(400, f"Gecersiz {name}")
+    return value
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+async def serve(app, host, port):
+    server = TaskServer(app)
+    listener = await server.start(host, port)
+    address = listener.sockets[0].getsockname()
+    print(f"Dinleniyor: http://{address[0]}:{address[1]}", flush=True)
+    # SIGTERM'de de bekleyen değişiklikler yazılarak kapanılır
+    stopped = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+    except NotImplementedError:
+        # Windows: yalnızca Ctrl+C
+        pass
+    try:
+        async with listener:
+            await stopped.wait()
+    finally:
+        await server.stop()
+    print("Sunucu kapatiliyor...")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="To Do List JSON HTTP API sunucusu")
+    parser.add_argument("-f", "--file", default="tasks.json",
+                        help="Gorev dosyasi; .db/.sqlite uzantisi SQLite kullanir (varsayilan: tasks.json)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080,
+                        help="Dinlenecek port; 0 bos bir port secer (varsayilan: 8080)")
+    args = parser.parse_args()
+
+    app = TodoApp(args.file)
+    try:
+        asyncio.run(serve(app, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nSunucu kapatiliyor...")
+    finally:
+        app.storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+import heapq
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from task import TASK_FIELDS, Task
+
+# İkili anlık görüntü (.tdb) düzeni, küçük uçlu (little-endian):
+#
+#   başlık  | meta (JSON) | ID sütunu | durum sütunu | kayıtlar | metin yığını
+#
+# ID sütunu artan sıralı 8 baytlık ID'lerdir; i. ID'nin kaydı kayıtlar
+# bölgesinde i * RECORD.size konumundadır (ID -> konum tablosu). Durum
+# sütunu, filtrelerin kayıtlara dokunmadan taranabilmesi için ayrı tutulur.
+# Başlık ve açıklamalar metin yığınında UTF-8 olarak durur; kayıtlar yalnızca
+# konum/uzunluklarını içerir. Öncelik ve durum değerleri meta'daki değer
+# tablosunun sıra numaralarıdır.
+
+MAGIC = b"TDB1"
+VERSION = 3
+
+# magic, sürüm, seq, next_id, görev sayısı, meta konumu, meta uzunluğu,
+# ID sütunu, durum sütunu, kayıtlar ve metin yığını konumları
+HEADER = struct.Struct("<4sIqqqqqqqqq")
+
+# başlık konumu/uzunluğu, açıklama konumu/uzunluğu, öncelik kodu,
+# oluşturulma, tamamlanma ve bitiş zamanı, tekrar kuralı ve etiketlerin
+# kodu (etiketler virgülle birleştirilmiş tek değer olarak kodlanır)
+RECORD = struct.Struct("<QIQIHqqqHH")
+
+# Eski sürümlerin kayıtları: sürüm 1'de bitiş zamanı ve tekrar kuralı,
+# sürüm 2'de etiketler yoktur
+RECORDS = {1: struct.Struct("<QIQIHqq"), 2: struct.Struct("<QIQIHqqqH"), VERSION: RECORD}
+
+# Boş zaman (ör. tamamlanmamış görevin tamamlanma zamanı) yerine yazılan değer
+NO_TIME = -2 ** 63
+
+# Eski kayıtlarda olmayan alanların karşılıkları: bitiş zamanı, tekrar
+# kuralı kodu, etiket kodu
+ADDED_DEFAULTS = (NO_TIME, None, None)
+
+TAG_SEPARATOR = ","
+
+
+class SnapshotFormatError(ValueError):
+    """İkili anlık görüntü okunamadığında yükseltilir"""
+
+
+def is_snapshot(path):
+    """Dosya ikili anlık görüntü biçiminde mi"""
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def read_seq(path):
+    """Anlık görüntünün nesil numarasını başlıktan oku (ikili değilse None)"""
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size or not header.startswith(MAGIC):
+        return None
+    return HEADER.unpack(header)[2]
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def encode_snapshot(seq, next_id, stats, rows):
+    """TASK_FIELDS sırasındaki satırları (ID'ye göre artan) ikili biçime çevir"""
+    ids = array("q")
+    statuses = array("H")
+    records = bytearray()
+    heap = bytearray()
+    codes = {}
+
+    def code(value):
+        number = codes.get(value)
+        if number is None:
+            number = codes[value] = len(codes)
+        return number
+
+    for (task_id, title, description, priority, status, created_at, completed_at,
+         due_at, recurrence, tags) in rows:
+        ids.append(task_id)
+        statuses.append(code(status))
+        title = title.encode("utf-8")
+        description = description.encode("utf-8")
+        title_offset = len(heap)
+        heap += title
+        description_offset = len(heap)
+        heap += description
+        records += RECORD.pack(
+            title_offset, len(title), description_offset, len(description),
+            code(priority),
+            NO_TIME if created_at is None else created_at,
+            NO_TIME if completed_at is None else completed_at,
+            NO_TIME if due_at is None else due_at,
+            code(recurrence), code(TAG_SEPARATOR.join(tags)))
+
+    if sys.byteorder == "big":
+        # Sütunlar dosyaya doğrudan yazılır; büyük uçlu sistemlerde çevir
+        ids.byteswap()
+        statuses.byteswap()
+
+    meta = json.dumps({"fields": TASK_FIELDS, "stats": stats, "values": list(codes)},
+                      ensure_ascii=False).encode("utf-8")
+    meta_offset = HEADER.size
+    ids_offset = _align(meta_offset + len(meta))
+    status_offset = ids_offset + len(ids) * 8
+    records_offset = _align(status_offset + len(statuses) * 2)
+    heap_offset = records_offset + len(records)
+
+    parts = [HEADER.pack(MAGIC, VERSION, seq, next_id, len(ids), meta_offset,
+                         len(meta), ids_offset, status_offset, records_offset,
+                         heap_offset),
+             meta]
+    parts.append(bytes(ids_offset - meta_offset - len(meta)))
+    parts.append(ids.tobytes())
+    parts.append(statuses.tobytes())
+    parts.append(bytes(records_offset - status_offset - len(statuses) * 2))
+    parts.append(records)
+    parts.append(heap)
+    return b"".join(parts)
+
+
+class SnapshotReader:
+    """Belleğe eşlenmiş (mmap) ikili anlık görüntü.
+
+    Dosya açılırken yalnızca başlık ve meta okunur; görevler istendikçe
+    kayıtlarından çözülür. Bu yüzden açılış süresi görev sayısından
+    bağımsızdır.
+    """
+
+    def __init__(self, path):
+        self.map = None
+        self.ids = None
+        self.statuses = None
+        self.file = open(path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, version, self.seq, self.next_id, self.count, meta_offset,
+             meta_length, ids_offset, status_offset, self.records_offset,
+             self.heap_offset) = HEADER.unpack_from(self.map)
+            if magic != MAGIC or version not in RECORDS:
+                raise SnapshotFormatError(f"Desteklenmeyen dosya bicimi: {path}")
+            meta = json.loads(self.map[meta_offset:meta_offset + meta_length])
+            if self.heap_offset > len(self.map):
+                raise SnapshotFormatError(f"Dosya eksik: {path}")
+        except (struct.error, ValueError, OSError) as e:
+            self.close()
+            if isinstance(e, SnapshotFormatError):
+                raise
+            raise SnapshotFormatError(str(e)) from e
+
+        self.record = RECORDS[version]
+        self.tag_cache = {}
+        self.stats = meta["stats"]
+        self.values = meta["values"]
+        view = memoryview(self.map)
+        ids = view[ids_offset:ids_offset + self.count * 8]
+        statuses = view[status_offset:status_offset + self.count * 2]
+        if sys.byteorder == "big":
+            # Sütunlar dosyada küçük uçlu; eşlemek yerine çevrilmiş kopyayı kullan
+            self.ids = array("q", ids)
+            self.statuses = array("H", statuses)
+            self.ids.byteswap()
+            self.statuses.byteswap()
+        else:
+            self.ids = ids.cast("q")
+            self.statuses = statuses.cast("H")
+
+    def close(self):
+        """Eşlemeyi ve dosyayı kapat"""
+        for view in (self.ids, self.statuses):
+            if isinstance(view, memoryview):
+                view.release()
+        self.ids = self.statuses = None
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def index_of(self, task_id):
+        """Görevin kayıt sırası (yoksa None)"""
+        i = bisect_left(self.ids, task_id)
+        if i < self.count and self.ids[i] == task_id:
+            return i
+        return None
+
+    def row(self, i):
+        """i. kaydı TASK_FIELDS sırasındaki değer listesine çöz"""
+        record = self.record
+        (title_offset, title_length, description_offset, description_length,
+         priority, created_at, completed_at, *added) = record.unpack_from(
+            self.map, self.records_offset + i * record.size)
+        # Eski sürümlerde olmayan alanlar boş sayılır
+        due_at, recurrence, tags = (*added, *ADDED_DEFAULTS[len(added):])
+        heap = self.heap_offset
+        return [self.ids[i],
+                str(self.map[heap + title_offset:heap + title_offset + title_length], "utf-8"),
+                str(self.map[heap + description_offset:
+                             heap + description_offset + description_length], "utf-8"),
+                self.values[priority],
+                self.values[self.statuses[i]],
+                None if created_at == NO_TIME else created_at,
+                None if completed_at == NO_TIME else completed_at,
+                None if due_at == NO_TIME else due_at,
+                None if recurrence is None else self.values[recurrence],
+                self.tags(tags)]
+
+    def tags(self, code):
+        # Aynı etiket birleşimi her kayıtta yeniden bölünmez
+        if code is None:
+            return ()
+        tags = self.tag_cache.get(code)
+        if tags is None:
+            value = self.values[code]
+            tags = self.tag_cache[code] = tuple(value.split(TAG_SEPARATOR)) if value else ()
+        return tags
+
+    def task(self, i):
+        """i. kaydı görev nesnesine çöz"""
+        return Task.from_row(self.row(i))
+
+    def status_code(self, status):
+        try:
+            return self.values.index(status)
+        except ValueError:
+            return None
+
+
+class MappedTasks:
+    """ID -> görev eşlemesi; temel veriler ikili anlık görüntüden tembelce okunur.
+
+    Okunan görevler önbellekte tutulur ve yerinde güncellenir; sonradan
+    eklenenler ve silinenler ayrıca izlenir. Sözlük arayüzünün JsonStorage'ın
+    kullandığı kısmını sağlar.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.cache = {}
+        self.added = {}
+        self.deleted = set()
+
+    def __len__(self):
+        return self.reader.count - len(self.deleted) + len(self.added)
+
+    def __contains__(self, task_id):
+        return self.get(task_id) is not None
+
+    def __iter__(self):
+        for task_id in self.reader.ids:
+            if task_id not in self.deleted:
+                yield task_id
+        yield from self.added
+
+    def get(self, task_id, default=None):
+        task = self.cache.get(task_id)
+        if task is not None:
+            return task
+        task = self.added.get(task_id)
+        if task is not None:
+            return task
+        if task_id in self.deleted:
+            return default
+        i = self.reader.index_of(task_id)
+        if i is None:
+            return default
+        task = self.cache[task_id] = self.reader.task(i)
+        return task
+
+    def __setitem__(self, task_id, task):
+        if task_id not in self.deleted and self.reader.index_of(task_id) is not None:
+            self.cache[task_id] = task
+        else:
+            self.deleted.discard(task_id)
+            self.added[task_id] = task
+
+    def pop(self, task_id):
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        if self.added.pop(task_id, None) is None:
+            del self.cache[task_id]
+            self.deleted.add(task_id)
+        return task
+
+    def values(self):
+        """Görevleri ID sırasıyla üret; önbellekte olmayanlar önbelleğe alınmaz"""
+        reader = self.reader
+        for i, task_id in enumerate(reader.ids):
+            task = self.cache.get(task_id)
+            if task is not None:
+                yield task
+            elif task_id not in self.deleted:
+                yield reader.task(i)
+        yield from self.added.values()
+
+    def items(self):
+        for task in self.values():
+            yield task.id, task
+
+    def ids(self, status=None):
+        """ID'leri, isteğe bağlı duruma göre, görevleri çözmeden listele"""
+        reader = self.reader
+        if status is None:
+            ids = reader.ids.tolist()
+        else:
+            code = reader.status_code(status)
+            ids = [] if code is None else [
+                task_id for task_id, task_code in zip(reader.ids, reader.statuses)
+                if task_code == code]
+        touched = self.deleted | self.cache.keys()
+        if touched:
+            # Değişen görevlerin durumu artık sütundakinden farklı olabilir
+            ids = [task_id for task_id in ids if task_id not in touched]
+            ids.extend(task_id for task_id, task in self.cache.items()
+                       if status is None or task.status == status)
+            ids.sort()
+        ids.extend(task_id for task_id, task in self.added.items()
+                   if status is None or task.status == status)
+        return ids
+
+    def freeze(self):
+        """Anlık görüntü yazımı için o anki durumun ucuz bir kopyası.
+
+        Temel dosya değişmez; yalnızca önbellekteki ve eklenen görevlerin
+        değerleri kopyalanır.
+        """
+        return FrozenTasks(self.reader,
+                           {task_id: task.to_row() for task_id, task in self.cache.items()},
+                           set(self.deleted),
+                           [task.to_row() for task in self.added.values()])
+
+
+class FrozenTasks:
+    """MappedTasks'in bir andaki hali; satırları kilit dışında üretir"""
+
+    def __init__(self, reader, changed, deleted, added):
+        self.reader = reader
+        self.changed = changed
+        self.deleted = deleted
+        self.added = added
+
+    def rows(self):
+        """Satırları ID'ye göre artan sırada üret"""
+        return heapq.merge(self._base_rows(), sorted(self.added), key=_row_id)
+
+    def _base_rows(self):
+        reader = self.reader
+        for i, task_id in enumerate(reader.ids):
+            row = self.changed.get(task_id)
+            if row is not None:
+                yield row
+            elif task_id not in self.deleted:
+                yield reader.row(i)
+
+
+def _row_id(row):
+    return row[0]
@@ -0,0 +1,72 @@
+class TaskStats:
+    """Görev istatistiklerini artımlı olarak tutan toplam.
+
+    Ekleme, güncelleme ve silme işlemleri sayaçları O(1) sürede günceller;
+    istatistik görünümü bu yüzden görev sayısından bağımsız olarak anında
+    hazırlanır.
+    """
+
+    def __init__(self, total=0, by_status=None, by_priority=None):
+        self.total = total
+        self.by_status = dict(by_status or {})
+        self.by_priority = dict(by_priority or {})
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """Görevleri bir kez tarayarak istatistikleri hesapla"""
+        stats = cls()
+        for task in tasks:
+            stats.add(task)
+        return stats
+
+    @classmethod
+    def from_dict(cls, data):
+        """Kaydedilmiş istatistikleri yükle"""
+        return cls(data["total"], data["by_status"], data["by_priority"])
+
+    def to_dict(self):
+        """İstatistikleri kaydedilebilir sözlüğe çevir"""
+        return {
+            "total": self.total,
+            "by_status": dict(self.by_status),
+            "by_priority": dict(self.by_priority)
+        }
+
+    def add(self, task):
+        """Görevi sayaçlara ekle"""
+        self.total += 1
+        self.by_status[task.status] = self.by_status.get(task.status, 0) + 1
+        self.by_priority[task.priority] = self.by_priority.get(task.priority, 0) + 1
+
+    def remove(self, task):
+        """Görevi sayaçlardan çıkar"""
+        self.total -= 1
+        self.by_status[task.status] -= 1
+        self.by_priority[task.priority] -= 1
+
+    def merge(self, other):
+        """Başka bir istatistiğin sayaçlarını bunlara ekle"""
+        self.total += other.total
+        for status, count in other.by_status.items():
+            self.by_status[status] = self.by_status.get(status, 0) + count
+        for priority, count in other.by_priority.items():
+            self.by_priority[priority] = self.by_priority.get(priority, 0) + count
+
+    @property
+    def completed(self):
+        return self.by_status.get("tamamlandı", 0)
+
+    @property
+    def pending(self):
+        return self.total - self.completed
+
+    @property
+    def completion_rate(self):
+        """Tamamlanma oranı (yüzde); görev yoksa None"""
+        if self.total == 0:
+            return None
+        return (self.completed / self.total) * 100
+
+    def priorities(self):
+        """Sıfır olmayan öncelik sayaçlarını döndür"""
+        return {priority: count for priority, count in self.by_priority.items() if count}
@@ -0,0 +1,1211 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.request import pathname2url
+
+from instrumentation import metrics, timed
+from locking import FileLock
+from snapshot import (FrozenTasks, MappedTasks, SnapshotFormatError, SnapshotReader,
+                      encode_snapshot, is_snapshot, read_seq)
+from stats import TaskStats
+from task import TASK_FIELDS, TIME_FIELDS, Task, format_time, parse_time
+
+# Bu uzantılara sahip dosyalar SQLite veritabanı olarak açılır
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Bu uzantılara sahip dosyalar ikili, belleğe eşlenen anlık görüntü kullanır
+BINARY_EXTENSIONS = (".tdb",)
+
+class CorruptDataError(ValueError):
+    """Veri dosyası okunamadığında yükseltilir"""
+
+
+def open_storage(path, on_error=None, read_only=False):
+    """Dosya uzantısına göre uygun depolama sınıfını oluştur.
+
+    read_only verilirse depo yalnızca okunur: kapatılırken hiçbir şey
+    yazılmaz, günlük sıkıştırılmaz ve veri dosyalarına dokunulmaz.
+    """
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        return SqliteStorage(path, on_error, read_only)
+    if path.lower().endswith(BINARY_EXTENSIONS):
+        return BinaryStorage(path, on_error, read_only)
+    return JsonStorage(path, on_error, read_only)
+
+
+def migrate(source_path, target_path):
+    """Görevleri bir depodan boş bir depoya ID'leriyle birlikte taşı"""
+    source = open_storage(source_path, read_only=True)
+    target = open_storage(target_path)
+    try:
+        source.load()
+        target.load()
+        if len(target):
+            raise ValueError(f"Hedef depo bos degil: {target_path}")
+        target.import_tasks(source.iter_tasks(), source.next_id)
+        return len(target)
+    finally:
+        source.close()
+        target.close()
+
+
+class BaseStorage:
+    """Depolama sınıflarının ortak davranışları"""
+
+    def __init__(self, path, on_error=None, read_only=False):
+        self.path = path
+        self.on_error = on_error
+        # Salt okunur depoda değişiklik yapılmaz; kapatmak diske yazmaz
+        self.read_only = read_only
+        self.next_id = 1
+        # Ayarlanırsa değişiklikler hemen yazılmaz, bu fonksiyon çağrılır
+        # (bkz. BackgroundWriter)
+        self.on_dirty = None
+        # lock bellekteki durumu, write_lock dosya/işlem yazımlarını korur
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+        # Değişiklik dinleyicileri: listener(eski_görev, yeni_görev)
+        self.listeners = []
+        self.indexes = {}
+        # Veri baştan yüklendikçe artar; bu durumda dinleyicilere görevler
+        # tek tek bildirilmez
+        self.reloads = 0
+
+    def subscribe(self, listener):
+        """Her ekleme/güncelleme/silmede çağrılacak dinleyiciyi kaydet.
+
+        Eklemede eski görev, silmede yeni görev None olarak verilir.
+        """
+        self.listeners.append(listener)
+
+    def index(self, index_class):
+        """Bu depo için indeksin tek örneğini döndür; ilk kullanımda kurulur.
+
+        İndeks sınıfları build(tasks) ve on_change(eski, yeni) sağlar ve
+        kurulduktan sonra değişikliklerle artımlı olarak güncellenir.
+        """
+        # Kurulum bellek kilidi altında yapılır: yeniden yükleme ile aynı anda
+        # kurulan indeks eski görevlerden oluşup öyle kalmaz
+        with self.lock:
+            index = self.indexes.get(index_class)
+            if index is None:
+                index = index_class()
+                index.build(self.iter_tasks())
+                self.subscribe(index.on_change)
+                self.indexes[index_class] = index
+            return index
+
+    def allocate_id(self):
+        """Daha önce hiç kullanılmamış yeni bir görev ID'si ver"""
+        task_id = self.next_id
+        self.next_id += 1
+        return task_id
+
+    def close(self):
+        """Bekleyen değişiklikleri yaz ve açık kaynakları serbest bırak"""
+        if not self.read_only:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Blok içindeki tüm değişiklikleri sonunda tek seferde kalıcı yap"""
+        on_dirty = self.on_dirty
+        self.on_dirty = _ignore
+        try:
+            yield self
+        finally:
+            self.on_dirty = on_dirty
+            self._changed()
+
+    def _notify(self, old, new):
+        for listener in self.listeners:
+            listener(old, new)
+
+    def data_files(self):
+        """Değişiklikleri izlenecek dosyalar (diğer süreçlerin yazdıkları)"""
+        return [self.path]
+
+    def _reloaded(self):
+        # Veri baştan yüklendi: indeksler bırakılır, ilk kullanımda yeniden kurulur
+        with self.lock:
+            for index in self.indexes.values():
+                self.listeners.remove(index.on_change)
+            self.indexes.clear()
+            self.reloads += 1
+
+    def _changed(self):
+        if self.on_dirty is None:
+            self.flush()
+        else:
+            self.on_dirty()
+
+    def _report(self, error):
+        if self.on_error is None:
+            raise error
+        self.on_error(error)
+
+
+class JsonStorage(BaseStorage):
+    """Görevleri JSON anlık görüntüsü ve ekleme günlüğü (journal) ile sakla.
+
+    Her değişiklik dosyanın tamamı yeniden yazılmadan, günlüğe tek satırlık
+    bir kayıt olarak eklenir. Yüklemede anlık görüntü okunur ve günlük
+    üzerine uygulanır. Günlük yeterince büyüdüğünde güncel durum geçici bir
+    dosyaya yazılıp atomik olarak yeniden adlandırılır (sıkıştırma).
+
+    Görevler bellekte ID'ye göre bir sözlükte tutulur; bu sayede arama,
+    düzenleme ve silme sabit zamanlıdır. Yeni ID'ler kalıcı ve yalnızca
+    artan bir sayaçtan alınır, silinen bir görevin ID'si tekrar kullanılmaz.
+    İstatistikler her değişiklikte güncellenir ve anlık görüntüyle saklanır.
+
+    Aynı dosyayı birden çok süreç paylaşabilir. Yazımlar `<dosya>.lock`
+    üzerindeki kilitle sıralanır; her yazımdan önce diğer süreçlerin günlüğe
+    eklediği kayıtlar okunup yalnızca ilgili görevlere uygulanır. Kayıtların
+    ve anlık görüntünün `seq` değeri nesil numarasıdır: başka bir sürecin
+    sıkıştırma yaptığı bu numaradan anlaşılır. ID sayacı kilit dosyasında
+    paylaşıldığından iki süreç aynı ID'yi vermez.
+    """
+
+    # Günlük, en az bu kadar kayıt ve görev sayısı kadar kayıt biriktirince
+    # sıkıştırılır; böylece sıkıştırma maliyeti değişiklik başına O(1) kalır.
+    COMPACT_MIN_RECORDS = 500
+
+    # Günlük dosyası okumalar arasında açık tutulur; başka bir süreç onu
+    # sıkıştırıp sildiğinde kalan kayıtlar yine okunabilir. Windows'ta açık
+    # dosya silinemeyeceği için her okumada yeniden açılır.
+    KEEP_JOURNAL_OPEN = os.name != "nt"
+
+    def __init__(self, path, on_error=None, read_only=False):
+        super().__init__(path, on_error, read_only)
+        self.journal_path = path + ".journal"
+        self.file_lock = FileLock(path + ".lock")
+        self.tasks = {}
+        self.stats = TaskStats()
+        # seq: diskteki son kaydın nesil numarası (bekleyen kayıtlar numarasını
+        # yazılırken alır); snapshot_seq: okunan/yazılan son anlık görüntününki
+        self.seq = 0
+        self.snapshot_seq = 0
+        self.journal_records = 0
+        self.journal_offset = 0
+        self.journal_file = None
+        self.pending = []
+        self.batch_thread = None
+
+    def __len__(self):
+        return len(self.tasks)
+
+    @timed("load")
+    def load(self):
+        """Anlık görüntüyü oku ve günlüğü üzerine uygula"""
+        with self.file_lock, self.lock:
+            self._close_journal()
+            self.tasks = {}
+            self.stats = TaskStats()
+            self.next_id = 1
+            self.seq = 0
+            self.journal_records = 0
+            self.pending = []
+            if os.path.exists(self.path):
+                self._read_snapshot()
+            self.snapshot_seq = self.seq
+            self._read_journal()
+
+    def _read_snapshot(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except json.JSONDecodeError as e:
+            raise CorruptDataError(str(e)) from e
+        stats = None
+        if isinstance(data, list):
+            # Eski biçim: düz görev listesi
+            rows = data
+        else:
+            rows = data["tasks"]
+            self.seq = data.get("seq", 0)
+            self.next_id = data.get("next_id", 1)
+            stats = data.get("stats")
+        # Güncel biçimde görevler TASK_FIELDS sırasında değer listeleridir,
+        # eski dosyalarda sözlüktür
+        tasks = [Task.from_row(row) if isinstance(row, list) else Task.from_dict(row)
+                 for row in rows]
+
+        max_id = max((task.id for task in tasks), default=0)
+        self.next_id = max(self.next_id, max_id + 1)
+        for task in tasks:
+            if task.id in self.tasks:
+                # Eski sürümlerin ürettiği çakışan ID'ye yenisini ver
+                task.id = super().allocate_id()
+            self.tasks[task.id] = task
+
+        if stats is None:
+            # İstatistik içermeyen eski dosya: bir kez hesapla
+            self.stats = TaskStats.from_tasks(self.tasks.values())
+        else:
+            self.stats = TaskStats.from_dict(stats)
+
+    def _read_snapshot_seq(self):
+        # Anlık görüntü {"seq":N,...} ile başlar; dosyanın tamamı okunmaz
+        try:
+            with open(self.path, 'rb') as file:
+                head = file.read(64)
+        except FileNotFoundError:
+            return 0
+        match = re.match(rb'\{"seq":(\d+)', head)
+        return int(match.group(1)) if match else 0
+
+    def reset(self):
+        """Bozuk veriyi kenara al ve boş bir depoyla başla"""
+        with self.file_lock:
+            if os.path.exists(self.path):
+                os.replace(self.path, self.path + ".corrupt")
+            self.tasks = {}
+            self.stats = TaskStats()
+            self.next_id = 1
+            self.seq = 0
+            self.pending = []
+            self.compact()
+
+    def close(self):
+        """Bekleyen değişiklikleri yaz ve açık dosyaları kapat"""
+        super().close()
+        self._close_journal()
+        self.file_lock.close()
+
+    @contextmanager
+    def batch(self):
+        """Blok içindeki tüm değişiklikleri sonunda tek seferde kalıcı yap.
+
+        Blok boyunca dosya kilidi tutulur; ortak ID sayacı bir kez okunur ve
+        sonunda bir kez yazılır.
+        """
+        with super().batch(), self.file_lock:
+            outer = self.batch_thread
+            self.next_id = max(self.next_id, self.file_lock.read_counter())
+            self.batch_thread = threading.get_ident()
+            try:
+                yield self
+            finally:
+                self.batch_thread = outer
+                self.file_lock.write_counter(self.next_id)
+
+    def allocate_id(self):
+        """Bu dosyayı kullanan tüm süreçlerde benzersiz yeni bir görev ID'si ver"""
+        if self.batch_thread == threading.get_ident():
+            return super().allocate_id()
+        with self.file_lock:
+            self.next_id = max(self.next_id, self.file_lock.read_counter())
+            task_id = super().allocate_id()
+            self.file_lock.write_counter(self.next_id)
+        return task_id
+
+    def get(self, task_id):
+        """ID'si verilen görevi döndür (yoksa None)"""
+        if metrics.enabled:
+            metrics.count("lookup")
+        return self.tasks.get(task_id)
+
+    def iter_tasks(self, status=None, priority=None, after=None):
+        """Görevleri ekleme sırasıyla, isteğe bağlı duruma/önceliğe göre süz.
+
+        after verilirse yalnızca ID'si bundan büyük görevler üretilir.
+        """
+        tasks = self.tasks.values()
+        if after is not None:
+            tasks = (task for task in tasks if task.id > after)
+        if status is not None:
+            tasks = (task for task in tasks if task.status == status)
+        if priority is not None:
+            tasks = (task for task in tasks if task.priority == priority)
+        return iter(tasks)
+
+    def task_ids(self, status=None):
+        """Görev ID'lerini, isteğe bağlı duruma göre süzerek listele"""
+        if status is None:
+            return list(self.tasks)
+        return [task_id for task_id, task in self.tasks.items() if task.status == status]
+
+    def import_tasks(self, tasks, next_id):
+        """Görevleri ID'leriyle birlikte içeri al ve tek seferde kaydet"""
+        with self.write_lock, self.file_lock:
+            self._sync()
+            with self.lock:
+                for task in tasks:
+                    self.tasks[task.id] = task
+                    self.stats.add(task)
+                    self._notify(None, task)
+                self.next_id = max(self.next_id, next_id)
+                # Toplu içe alma günlüğe yazılmaz; nesil numarası artırılır ki
+                # diğer süreçler anlık görüntüyü yeniden yüklesin
+                self.seq += 1
+            self.file_lock.write_counter(max(self.next_id, self.file_lock.read_counter()))
+            self._write_snapshot()
+
+    def add(self, task):
+        """Görev ekle ve günlüğe yaz"""
+        return self._commit({"op": "add", "task": task})
+
+    def update(self, task_id, **fields):
+        """Görevin verilen alanlarını güncelle ve günlüğe yaz"""
+        return self._commit({"op": "update", "id": task_id, "fields": fields})
+
+    def delete(self, task_id):
+        """Görevi sil ve günlüğe yaz"""
+        return self._commit({"op": "delete", "id": task_id})
+
+    def refresh(self):
+        """Diğer süreçlerin yaptığı değişiklikleri uygula; değişiklik varsa True"""
+        with self.file_lock:
+            return self._sync()
+
+    def data_files(self):
+        return [self.path, self.journal_path]
+
+    def flush(self):
+        """Diğer süreçlerin kayıtlarını al, bekleyenleri tek seferde diske yaz"""
+        with self.write_lock, self.file_lock:
+            self._sync()
+            self._write_pending()
+            if self.journal_records >= max(self.COMPACT_MIN_RECORDS, len(self.tasks)):
+                self._write_snapshot()
+
+    def compact(self):
+        """Güncel durumu yeni anlık görüntüye yaz ve günlüğü sıfırla"""
+        with self.write_lock, self.file_lock:
+            self._sync()
+            self._write_pending()
+            self._write_snapshot()
+
+    def _commit(self, record):
+        with self.lock:
+            task = self._apply(record)
+            if task is None:
+                return None
+            self.pending.append(record)
+        self._changed()
+        return task
+
+    @timed("sync")
+    def _sync(self):
+        # Dosya kilidi tutulurken çağrılır
+        snapshot_seq = self._read_snapshot_seq()
+        changed = False
+        if snapshot_seq != self.snapshot_seq:
+            # Başka bir süreç sıkıştırma yaptı. Eski günlüğün kalan kayıtları
+            # okunduktan sonra durum yeni anlık görüntüye eşitse yeniden
+            # yüklemeye gerek yoktur.
+            if self.journal_file is not None:
+                changed = self._read_journal(truncate=False)
+            self._close_journal()
+            if self.seq != snapshot_seq:
+                self._reload()
+                return True
+            self.snapshot_seq = snapshot_seq
+        return self._read_journal() or changed
+
+    def _reload(self):
+        # Bellek kilidi bekleyenlerin alınmasından yeniden uygulanmasına kadar
+        # tutulur; aradaki yükleme sırasında başka bir iş parçacığının yaptığı
+        # değişiklik bekleyenler listesinin üzerine yazılıp kaybolmaz
+        with self.lock:
+            pending = self.pending
+            self._reloaded()
+            self.load()
+            # Henüz yazılmamış yerel değişiklikler yeni durumun üzerine
+            # uygulanır; yükleme sırasında (ör. bir dinleyiciden) eklenenler de
+            # korunur
+            for record in pending:
+                self._apply(record)
+            self.pending = pending + self.pending
+
+    def _read_journal(self, truncate=True):
+        file = self.journal_file
+        if file is None:
+            try:
+                file = open(self.journal_path, 'rb')
+            except FileNotFoundError:
+                return False
+        try:
+            with self.lock:
+                changed = self._apply_journal(file)
+            size = os.fstat(file.fileno()).st_size
+        finally:
+            if self.KEEP_JOURNAL_OPEN:
+                self.journal_file = file
+            else:
+                file.close()
+
+        if truncate and self.journal_offset < size and not self.read_only:
+            # Çökme sırasında yarım kalmış kayıt; kes ki sonraki eklemeler
+            # geçerli satırlardan sonra gelsin
+            with open(self.journal_path, 'r+b') as file:
+                file.truncate(self.journal_offset)
+        return changed
+
+    def _apply_journal(self, file):
+        changed = False
+        touched = set()
+        file.seek(self.journal_offset)
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            self.journal_offset += len(line)
+            self.journal_records += 1
+            if record["seq"] <= self.seq:
+                # Anlık görüntüye zaten dahil edilmiş kayıt
+                continue
+            if record["op"] == "add":
+                record["task"] = Task.from_dict(record["task"])
+            else:
+                touched.add(record["id"])
+            self._apply(record)
+            self.seq = record["seq"]
+            changed = True
+
+        if touched:
+            # Başka süreçlerin değiştirdiği görevlerde henüz yazılmamış yerel
+            # değişiklikler üstte kalır (diske de onlardan sonra yazılacaklar)
+            for record in self.pending:
+                if record["op"] != "add" and record["id"] in touched:
+                    self._apply(record)
+        return changed
+
+    def _close_journal(self):
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
+        self.journal_offset = 0
+
+    def _write_pending(self):
+        # Dosya kilidi tutulurken ve _sync sonrasında çağrılır: günlüğün sonu
+        # journal_offset'tedir, kayıtlar diskteki son kayıttan sonra numaralanır
+        with self.lock:
+            records = self.pending
+            self.pending = []
+            seq = self.seq
+            lines = []
+            for record in records:
+                seq += 1
+                record["seq"] = seq
+                lines.append(json.dumps(record, ensure_ascii=False, default=Task.to_dict) + "\n")
+        if not lines:
+            return
+        data = "".join(lines).encode("utf-8")
+        try:
+            with metrics.timed("save.journal"), open(self.journal_path, 'ab') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+                offset = file.tell()
+            metrics.count("save.journal.bytes", len(data))
+            with self.lock:
+                self.seq = seq
+            self.journal_offset = offset
+            self.journal_records += len(lines)
+        except OSError as e:
+            # Kayıtlar bir sonraki denemede yazılmak üzere geri konur; yarım
+            # yazılmış satırlar diğer süreçler okumadan önce kesilir
+            with self.lock:
+                self.pending[:0] = records
+            try:
+                with open(self.journal_path, 'r+b') as file:
+                    file.truncate(self.journal_offset)
+            except OSError:
+                pass
+            self._report(e)
+
+    @timed("save.snapshot")
+    def _write_snapshot(self):
+        # Durumun kopyası kilit altında alınır; serileştirme ve disk yazımı
+        # kilit dışında yapılır, böylece bu sırada yapılan değişiklikler
+        # beklemez. Kopya henüz yazılmamış kayıtları da içerir; kopyadan
+        # sonraki kayıtlar bekleyen listede kalır.
+        with self.lock:
+            included = len(self.pending)
+            state = self._capture_snapshot()
+        try:
+            data = self._encode_snapshot(state)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'wb') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            metrics.count("save.snapshot.bytes", len(data))
+            with self.lock:
+                self._install_snapshot(tmp_path, state)
+                del self.pending[:included]
+                self.seq = self.snapshot_seq = state["seq"]
+
+            # Anlık görüntü günlükteki tüm kayıtları içeriyor
+            self._close_journal()
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.journal_records = 0
+        except OSError as e:
+            self._report(e)
+
+    def _capture_snapshot(self):
+        return {"seq": self.seq + len(self.pending), "next_id": self.next_id,
+                "stats": self.stats.to_dict(),
+                "fields": TASK_FIELDS,
+                "tasks": [task.to_row() for task in self.tasks.values()]}
+
+    def _encode_snapshot(self, state):
+        return json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _install_snapshot(self, tmp_path, state):
+        os.replace(tmp_path, self.path)
+
+    def _apply(self, record):
+        op = record["op"]
+        if op == "add":
+            task = record["task"]
+            if task.id in self.tasks:
+                task.id = super().allocate_id()
+            self.tasks[task.id] = task
+            self.next_id = max(self.next_id, task.id + 1)
+            self.stats.add(task)
+            self._notify(None, task)
+            return task
+
+        task = self.tasks.get(record["id"])
+        if task is None:
+            return None
+        if op == "update":
+            old = task.copy() if self.listeners else None
+            self.stats.remove(task)
+            task.update(record["fields"])
+            self.stats.add(task)
+            self._notify(old, task)
+            return task
+        if op == "delete":
+            self.stats.remove(task)
+            self._notify(task, None)
+            return self.tasks.pop(record["id"])
+        return None
+
+
+class BinaryStorage(JsonStorage):
+    """JsonStorage ile aynı günlüğü kullanan, ikili anlık görüntülü depo.
+
+    Anlık görüntü belleğe eşlenir (mmap); açılışta yalnızca başlık okunur ve
+    görevler erişildikçe çözülür, böylece büyük listeler de anında açılır.
+    Durum filtresi ve ID listesi görevleri çözmeden sütunlardan okunur.
+    JSON biçimindeki bir dosya da açılabilir; ilk sıkıştırmada ikili biçime
+    çevrilir.
+    """
+
+    def __init__(self, path, on_error=None, read_only=False):
+        super().__init__(path, on_error, read_only)
+        self.reader = None
+
+    def reset(self):
+        """Bozuk veriyi kenara al ve boş bir depoyla başla"""
+        self._close_reader()
+        super().reset()
+
+    def close(self):
+        """Bekleyenleri yaz ve eşlenmiş dosyayı kapat"""
+        super().close()
+        with self.lock:
+            self.tasks = {}
+            self._close_reader()
+
+    def task_ids(self, status=None):
+        """Görev ID'lerini, isteğe bağlı duruma göre süzerek listele"""
+        if isinstance(self.tasks, MappedTasks):
+            return self.tasks.ids(status)
+        return super().task_ids(status)
+
+    def _read_snapshot_seq(self):
+        try:
+            seq = read_seq(self.path)
+        except FileNotFoundError:
+            return 0
+        return super()._read_snapshot_seq() if seq is None else seq
+
+    def _read_snapshot(self):
+        if not is_snapshot(self.path):
+            super()._read_snapshot()
+            return
+        try:
+            reader = SnapshotReader(self.path)
+        except SnapshotFormatError as e:
+            raise CorruptDataError(str(e)) from e
+        self._close_reader()
+        self.reader = reader
+        self.tasks = MappedTasks(reader)
+        self.seq = reader.seq
+        self.next_id = reader.next_id
+        self.stats = TaskStats.from_dict(reader.stats)
+
+    def _capture_snapshot(self):
+        # Eşlenmiş dosya değişmediğinden yalnızca değişen görevler kopyalanır
+        if isinstance(self.tasks, MappedTasks):
+            tasks = self.tasks.freeze()
+        else:
+            tasks = [self.tasks[task_id].to_row() for task_id in sorted(self.tasks)]
+        return {"seq": self.seq + len(self.pending), "next_id": self.next_id,
+                "stats": self.stats.to_dict(), "tasks": tasks}
+
+    def _encode_snapshot(self, state):
+        tasks = state["tasks"]
+        rows = tasks.rows() if isinstance(tasks, FrozenTasks) else tasks
+        return encode_snapshot(state["seq"], state["next_id"], state["stats"], rows)
+
+    def _install_snapshot(self, tmp_path, state):
+        # Kilit altında çağrılır. Kopyadan sonra gelen değişiklikler varsa
+        # yeni dosya güncel durumun tamamı değildir.
+        current = self.seq + len(self.pending) == state["seq"]
+        if os.name == "nt" and self.reader is not None:
+            # Windows'ta eşlenmiş dosyanın yerine yenisi konamaz
+            if not current:
+                self.tasks = dict(self.tasks.items())
+            self._close_reader()
+        os.replace(tmp_path, self.path)
+        if not current:
+            # Mevcut eşleme ve önbellek geçerli kalır
+            return
+        # Yeni dosyayı eşle, önbelleği bırak. Eski eşleme, üzerinde süren
+        # okumalar bitince kendiliğinden kapanır.
+        self.reader = SnapshotReader(self.path)
+        self.tasks = MappedTasks(self.reader)
+
+    def _close_reader(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+
+class SqliteStorage(BaseStorage):
+    """Görevleri indeksli bir SQLite tablosunda sakla.
+
+    Görevler belleğe toplu olarak yüklenmez; her işlem tek satırlık bir
+    sorgu ya da güncellemedir. Durum, öncelik ve zaman damgası sütunları
+    indekslidir, böylece süzülmüş listeler tablo taraması gerektirmez.
+    Zamanlar tabloda okunur metin olarak durur ve satır okunurken/yazılırken
+    zaman damgasına çevrilir. İstatistik sayaçları tetikleyicilerle aynı
+    işlem içinde güncellenir.
+
+    Birden çok süreç aynı veritabanını kullanabilir: yazma işlemi ilk
+    değişiklikte BEGIN IMMEDIATE ile açılır ve o sırada diğer süreçlerin
+    onayladığı değişiklikler `changes` tablosundan okunup dinleyicilere
+    iletilir. Bu tabloya tetikleyicilerle her değişen görevin ID'si ve eski
+    hali yazılır; böylece yalnızca değişen görevler yeniden okunur.
+    """
+
+    # Sıkıştırmada changes tablosunda bırakılan son kayıt sayısı; bundan daha
+    # geride kalan süreçler indekslerini baştan kurar
+    CHANGES_KEPT = 10000
+
+    # Başka bir süreç yazarken beklenecek en uzun süre (saniye)
+    BUSY_TIMEOUT = 10
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TEXT,
+            completed_at TEXT,
+            due_at TEXT,
+            recurrence TEXT,
+            tags TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks (completed_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_due_at ON tasks (status, due_at);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS stats (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO stats (key, value) VALUES
+                ('total', 1), ('status:' || NEW.status, 1), ('priority:' || NEW.priority, 1)
+                ON CONFLICT (key) DO UPDATE SET value = value + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_delete AFTER DELETE ON tasks
+        BEGIN
+            UPDATE stats SET value = value - 1
+                WHERE key IN ('total', 'status:' || OLD.status, 'priority:' || OLD.priority);
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_update AFTER UPDATE OF status, priority ON tasks
+        BEGIN
+            UPDATE stats SET value = value - 1
+                WHERE key IN ('status:' || OLD.status, 'priority:' || OLD.priority);
+            INSERT INTO stats (key, value) VALUES
+                ('status:' || NEW.status, 1), ('priority:' || NEW.priority, 1)
+                ON CONFLICT (key) DO UPDATE SET value = value + 1;
+        END;
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            op TEXT NOT NULL,
+            task_id INTEGER,
+            title TEXT,
+            description TEXT,
+            priority TEXT,
+            status TEXT,
+            created_at TEXT,
+            completed_at TEXT,
+            due_at TEXT,
+            recurrence TEXT,
+            tags TEXT
+        );
+        CREATE TRIGGER IF NOT EXISTS tasks_changes_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO changes (op, task_id) VALUES ('insert', NEW.id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_changes_update AFTER UPDATE ON tasks
+        BEGIN
+            INSERT INTO changes (op, task_id, title, description, priority, status,
+                                 created_at, completed_at, due_at, recurrence, tags)
+                VALUES ('update', OLD.id, OLD.title, OLD.description, OLD.priority,
+                        OLD.status, OLD.created_at, OLD.completed_at, OLD.due_at,
+                        OLD.recurrence, OLD.tags);
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_changes_delete AFTER DELETE ON tasks
+        BEGIN
+            INSERT INTO changes (op, task_id, title, description, priority, status,
+                                 created_at, completed_at, due_at, recurrence, tags)
+                VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.priority,
+                        OLD.status, OLD.created_at, OLD.completed_at, OLD.due_at,
+                        OLD.recurrence, OLD.tags);
+        END;
+    """
+
+    # Sonradan eklenen sütunlar: eski veritabanlarına açılışta eklenir
+    ADDED_COLUMNS = ("due_at", "recurrence", "tags")
+
+    COLUMNS = ", ".join(TASK_FIELDS)
+
+    def __init__(self, path, on_error=None, read_only=False):
+        super().__init__(path, on_error, read_only)
+        self.conn = None
+        # Dinleyicilere iletilmiş son changes kaydı ve PRAGMA data_version
+        self.change_seq = 0
+        self.data_version = None
+
+    def __len__(self):
+        return self.stats.total
+
+    @property
+    def stats(self):
+        """Tetikleyicilerin tuttuğu sayaçlardan istatistikleri oku"""
+        stats = TaskStats()
+        for key, value in self.conn.execute("SELECT key, value FROM stats"):
+            kind, _, name = key.partition(":")
+            if kind == "total":
+                stats.total = value
+            elif kind == "status":
+                stats.by_status[name] = value
+            elif kind == "priority":
+                stats.by_priority[name] = value
+        return stats
+
+    @timed("load")
+    def load(self):
+        """Veritabanını aç, gerekirse tabloları oluştur"""
+        try:
+            # Arka plan yazıcısı işlemi başka bir iş parçacığından onaylar;
+            # bağlantı kullanımı self.lock ile sıralanır
+            if self.read_only:
+                # Salt okunur bağlantı: şema oluşturulmaz ve güncellenmez;
+                # eski şemalar ilk yazılabilir açılışta güncellenir
+                uri = f"file:{pathname2url(os.path.abspath(self.path))}?mode=ro"
+                self.conn = sqlite3.connect(uri, timeout=self.BUSY_TIMEOUT,
+                                            check_same_thread=False, uri=True)
+            else:
+                self.conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT,
+                                            check_same_thread=False)
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+                with self.conn:
+                    self._add_missing_columns()
+                    self.conn.executescript(self.SCHEMA)
+                    self._rebuild_stats_if_missing()
+            row = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+            max_id = self.conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0] or 0
+            self.change_seq = self.conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+            self.data_version = self._data_version()
+        except sqlite3.DatabaseError as e:
+            self.close()
+            raise CorruptDataError(str(e)) from e
+        self.next_id = max(row[0] if row else 1, max_id + 1)
+
+    def reset(self):
+        """Bozuk veritabanını kenara al ve boş bir veritabanıyla başla"""
+        self.close()
+        if os.path.exists(self.path):
+            os.replace(self.path, self.path + ".corrupt")
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        self.load()
+
+    def close(self):
+        """Bekleyen işlemi onayla ve veritabanı bağlantısını kapat"""
+        if self.conn is not None:
+            if not self.read_only:
+                self.flush()
+            self.conn.close()
+            self.conn = None
+
+    def get(self, task_id):
+        """ID'si verilen görevi döndür (yoksa None)"""
+        if metrics.enabled:
+            metrics.count("lookup")
+        return self._query(
+            f"SELECT {self.COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+
+    def iter_tasks(self, status=None, priority=None, after=None):
+        """Görevleri ID sırasıyla, isteğe bağlı duruma/önceliğe göre süz.
+
+        after verilirse yalnızca ID'si bundan büyük görevler üretilir.
+        """
+        conditions = []
+        params = []
+        if after is not None:
+            conditions.append("id > ?")
+            params.append(after)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if priority is not None:
+            conditions.append("priority = ?")
+            params.append(priority)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._query(
+            f"SELECT {self.COLUMNS} FROM tasks{where} ORDER BY id", params)
+
+    def task_ids(self, status=None):
+        """Görev ID'lerini indeksten, isteğe bağlı duruma göre süzerek listele"""
+        if status is None:
+            rows = self.conn.execute("SELECT id FROM tasks ORDER BY id")
+        else:
+            rows = self.conn.execute(
+                "SELECT id FROM tasks WHERE status = ? ORDER BY id", (status,))
+        return [row[0] for row in rows]
+
+    def allocate_id(self):
+        """Veritabanındaki sayaçtan, tüm süreçlerde benzersiz yeni bir ID ver"""
+        with self.lock:
+            try:
+                self._begin()
+            except sqlite3.Error as e:
+                self._report(e)
+            return super().allocate_id()
+
+    def add(self, task):
+        """Görevi tek satır olarak ekle"""
+        placeholders = ", ".join("?" * len(TASK_FIELDS))
+        try:
+            with self.lock:
+                self._begin()
+                self.conn.execute(
+                    f"INSERT INTO tasks ({self.COLUMNS}) VALUES ({placeholders})",
+                    _db_values(task))
+                self._save_next_id()
+        except sqlite3.Error as e:
+            self._report(e)
+            return None
+        self._notify(None, task)
+        self._changed()
+        return task
+
+    def update(self, task_id, **fields):
+        """Görevin yalnızca verilen alanlarını güncelle"""
+        unknown = set(fields) - set(TASK_FIELDS[1:])
+        if unknown:
+            raise ValueError(f"Bilinmeyen alan: {', '.join(sorted(unknown))}")
+        if fields:
+            assignments = ", ".join(f"{field} = ?" for field in fields)
+            values = [_db_value(field, value) for field, value in fields.items()]
+            try:
+                with self.lock:
+                    self._begin()
+                    old = self.get(task_id) if self.listeners else None
+                    cursor = self.conn.execute(
+                        f"UPDATE tasks SET {assignments} WHERE id = ?",
+                        [*values, task_id])
+            except sqlite3.Error as e:
+                self._report(e)
+                return None
+            if cursor.rowcount == 0:
+                return None
+            task = self.get(task_id)
+            self._notify(old, task)
+            self._changed()
+            return task
+        return self.get(task_id)
+
+    def delete(self, task_id):
+        """Görevi sil ve silinen görevi döndür"""
+        try:
+            with self.lock:
+                self._begin()
+                task = self.get(task_id)
+                if task is None:
+                    return None
+                self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        except sqlite3.Error as e:
+            self._report(e)
+            return None
+        self._notify(task, None)
+        self._changed()
+        return task
+
+    def import_tasks(self, tasks, next_id):
+        """Görevleri ID'leriyle birlikte tek bir işlemde içeri al"""
+        placeholders = ", ".join("?" * len(TASK_FIELDS))
+        self.next_id = max(self.next_id, next_id)
+        with self.write_lock, self.lock:
+            try:
+                self._begin()
+                start = self.conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+                self.conn.executemany(
+                    f"INSERT INTO tasks ({self.COLUMNS}) VALUES ({placeholders})",
+                    (_db_values(task) for task in tasks))
+                self._save_next_id()
+                # Görev başına değişiklik kaydı yerine tek bir "yeniden yükle"
+                # kaydı: diğer süreçler indekslerini baştan kurar
+                self.conn.execute("DELETE FROM changes WHERE seq > ?", (start,))
+                self.conn.execute("INSERT INTO changes (op) VALUES ('reload')")
+                self._commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+
+    def refresh(self):
+        """Diğer süreçlerin onayladığı değişiklikleri al; değişiklik varsa True"""
+        with self.lock:
+            if self.conn.in_transaction:
+                # Yazma işlemi açıkken başka süreç yazamaz; değişiklikler
+                # işlem başında alındı
+                return False
+            try:
+                version = self._data_version()
+                if version == self.data_version:
+                    return False
+                self.data_version = version
+                return self._catch_up()
+            except sqlite3.Error as e:
+                self._report(e)
+                return False
+
+    def data_files(self):
+        # WAL kipinde diğer bağlantıların onayladıkları önce -wal dosyasına yazılır
+        return [self.path, self.path + "-wal"]
+
+    def flush(self):
+        """Bekleyen değişiklikleri tek bir işlem olarak onayla"""
+        with self.write_lock, self.lock:
+            try:
+                self._commit()
+            except sqlite3.Error as e:
+                self._report(e)
+
+    def compact(self):
+        """Bekleyenleri onayla, eski değişiklik kayıtlarını sil ve WAL'ı aktar"""
+        self.flush()
+        try:
+            with self.write_lock, self.lock:
+                self._begin()
+                self.conn.execute(
+                    "DELETE FROM changes WHERE seq <= (SELECT MAX(seq) FROM changes) - ?",
+                    (self.CHANGES_KEPT,))
+                self._commit()
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            self._report(e)
+
+    def _begin(self):
+        # self.lock tutulurken, ilk değişiklikten önce çağrılır. Yazma kilidi
+        # hemen alınır; o ana kadar diğer süreçlerin onayladıkları uygulanır.
+        # Kilit işlem sonuna kadar tutulduğundan ID sayacı bir kez okunur.
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+            self.next_id = max(self.next_id, row[0] if row else 1)
+            self._catch_up()
+
+    def _commit(self):
+        # İşlem açıkken eklenen değişiklik kayıtlarının hepsi bu bağlantınındır
+        if not self.conn.in_transaction:
+            return
+        last = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+        with metrics.timed("save.commit"):
+            self.conn.commit()
+        metrics.count("save.commit.changes", last - self.change_seq)
+        self.change_seq = last
+        self.data_version = self._data_version()
+
+    @timed("sync")
+    def _catch_up(self):
+        previous = self.change_seq
+        rows = self.conn.execute(
+            f"""SELECT seq, op, task_id, {', '.join(TASK_FIELDS[1:])} FROM changes
+                WHERE seq > ? ORDER BY seq""", (previous,)).fetchall()
+        if not rows:
+            return False
+        self.change_seq = rows[-1][0]
+        if rows[0][0] != previous + 1 or any(row[1] == "reload" for row in rows):
+            # Aradaki kayıtlar sıkıştırmada silinmiş ya da toplu içe alma yapılmış
+            self._reloaded()
+            return True
+        if not self.listeners:
+            return True
+
+        # Görev başına ilk kayıttaki eski hal ile güncel satır bildirilir
+        old_tasks = {}
+        for seq, op, task_id, *old in rows:
+            if task_id not in old_tasks:
+                old_tasks[task_id] = None if op == "insert" else _task_row(None, [task_id, *old])
+        for task_id, old in old_tasks.items():
+            new = self.get(task_id)
+            if old is not None or new is not None:
+                self._notify(old, new)
+        return True
+
+    def _data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _add_missing_columns(self):
+        # Şema yeni sütunlar olmadan oluşturulmuşsa tablolar genişletilir;
+        # eski tetikleyiciler yeni sütunları kopyalamadığından yeniden kurulur
+        migrated = False
+        for table in ("tasks", "changes"):
+            columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for column in self.ADDED_COLUMNS:
+                if columns and column not in columns:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+                    migrated = True
+        if migrated:
+            self.conn.execute("DROP TRIGGER IF EXISTS tasks_changes_update")
+            self.conn.execute("DROP TRIGGER IF EXISTS tasks_changes_delete")
+
+    def _rebuild_stats_if_missing(self):
+        # İstatistik tablosu olmadan oluşturulmuş veritabanları için bir kez
+        if self.conn.execute("SELECT 1 FROM stats WHERE key = 'total'").fetchone():
+            return
+        self.conn.execute("INSERT INTO stats (key, value) SELECT 'total', COUNT(*) FROM tasks")
+        self.conn.execute("""INSERT INTO stats (key, value)
+                             SELECT 'status:' || status, COUNT(*) FROM tasks GROUP BY status""")
+        self.conn.execute("""INSERT INTO stats (key, value)
+                             SELECT 'priority:' || priority, COUNT(*) FROM tasks GROUP BY priority""")
+
+    def _query(self, sql, params):
+        cursor = self.conn.cursor()
+        cursor.row_factory = _task_row
+        return cursor.execute(sql, params)
+
+    def _save_next_id(self):
+        self.conn.execute(
+            """INSERT INTO meta (key, value) VALUES ('next_id', ?)
+               ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)""",
+            (self.next_id,))
+
+
+class BackgroundWriter:
+    """Değişiklikleri arka planda, art arda gelenleri birleştirerek yazan iş parçacığı.
+
+    Her değişiklikten sonra `delay` saniye sessizlik beklenir; değişiklikler
+    kesintisiz sürse bile ilk bekleyen değişiklik en geç `max_delay` saniye
+    içinde yazılır. Hatalar deponun on_error fonksiyonuna iletilir.
+    """
+
+    def __init__(self, storage, delay=0.3, max_delay=2.0):
+        self.storage = storage
+        self.delay = delay
+        self.max_delay = max_delay
+        self._condition = threading.Condition()
+        self._first_change = None
+        self._last_change = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="todo-writer", daemon=True)
+        storage.on_dirty = self.notify
+        self._thread.start()
+
+    def notify(self):
+        """Yeni bir değişiklik olduğunu bildir"""
+        with self._condition:
+            now = time.monotonic()
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            self._condition.notify()
+
+    def close(self):
+        """İş parçacığını durdur ve bekleyen değişiklikleri hemen yaz"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.storage.on_dirty = None
+        self.storage.flush()
+
+    def _run(self):
+        with self._condition:
+            while True:
+                while self._first_change is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+
+                deadline = min(self._last_change + self.delay,
+                               self._first_change + self.max_delay)
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+                self._first_change = None
+                self._condition.release()
+                try:
+                    self.storage.flush()
+                finally:
+                    self._condition.acquire()
+
+
+def _ignore():
+    pass
+
+
+def _db_values(task):
+    return (task.id, task.title, task.description, task.priority, task.status,
+            format_time(task.created_at), format_time(task.completed_at),
+            format_time(task.due_at), task.recurrence, ",".join(task.tags))
+
+
+def _db_value(field, value):
+    if field in TIME_FIELDS:
+        return format_time(parse_time(value))
+    if field == "tags":
+        return ",".join(value or ())
+    return value
+
+
+def _task_row(cursor, row):
+    return Task(row[0], row[1], row[2], row[3], row[4],
+                parse_time(row[5]), parse_time(row[6]), parse_time(row[7]), row[8],
+                row[9].split(",") if row[9] else ())
@@ -0,0 +1,110 @@
+import sys
+import time
+from datetime import datetime
+
+TASK_FIELDS = ("id", "title", "description", "priority", "status",
+               "created_at", "completed_at", "due_at", "recurrence", "tags")
+
+TIME_FIELDS = ("created_at", "completed_at", "due_at")
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def current_time():
+    """Şu anki zaman, tam sayı Unix zaman damgası olarak"""
+    return int(time.time())
+
+
+def parse_time(value):
+    """Zaman damgasına çevir; eski "%Y-%m-%d %H:%M:%S" metinleri de kabul edilir"""
+    if value is None or isinstance(value, int):
+        return value
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def format_time(value):
+    """Zaman damgasını yerel saatle okunur metne çevir"""
+    if value is None:
+        return None
+    # time.strftime, datetime nesnesi oluşturmadığı için yaklaşık iki kat hızlı
+    return time.strftime(TIME_FORMAT, time.localtime(value))
+
+
+class Task:
+    """Tek bir görev; sözlük yerine sabit yuvalı (__slots__) nesne.
+
+    Öncelik ve durum değerleri paylaşılan (intern edilmiş) metinlerdir,
+    zamanlar tam sayı Unix zaman damgası olarak tutulur. Böylece her görev
+    sözlük ve biçimlendirilmiş tarih metinleri yerine birkaç işaretçi yer
+    kaplar. Sözlük/JSON dönüşümü yalnızca depolama sınırında yapılır.
+
+    Bitiş zamanı (due_at) ve tekrar kuralı (recurrence) isteğe bağlıdır;
+    bu alanlar eklenmeden önce yazılmış kayıtlarda None olur. Etiketler
+    (tags) sıralı, paylaşılan metinlerden oluşan bir demettir.
+    """
+
+    __slots__ = TASK_FIELDS
+
+    def __init__(self, id, title, description, priority, status,
+                 created_at=None, completed_at=None, due_at=None, recurrence=None, tags=()):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.priority = sys.intern(priority)
+        self.status = sys.intern(status)
+        self.created_at = created_at
+        self.completed_at = completed_at
+        self.due_at = due_at
+        self.recurrence = None if recurrence is None else sys.intern(recurrence)
+        self.tags = tuple(map(sys.intern, tags)) if tags else ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Sözlükten (JSON kaydı) görev oluştur"""
+        return cls(data["id"], data["title"], data.get("description") or "",
+                   data["priority"], data["status"],
+                   parse_time(data.get("created_at")),
+                   parse_time(data.get("completed_at")),
+                   parse_time(data.get("due_at")),
+                   data.get("recurrence"),
+                   data.get("tags") or ())
+
+    @classmethod
+    def from_row(cls, row):
+        """TASK_FIELDS sırasındaki değer listesinden görev oluştur.
+
+        Eski biçimdeki kısa satırlarda eksik alanlar varsayılan değerini alır.
+        """
+        return cls(*row)
+
+    def to_dict(self):
+        """Görevi JSON'a yazılabilir sözlüğe çevir"""
+        return {field: getattr(self, field) for field in TASK_FIELDS}
+
+    def to_row(self):
+        """Görevi TASK_FIELDS sırasındaki değer listesine çevir"""
+        return [self.id, self.title, self.description, self.priority,
+                self.status, self.created_at, self.completed_at,
+                self.due_at, self.recurrence, self.tags]
+
+    def copy(self):
+        return Task(*self.to_row())
+
+    def update(self, fields):
+        """Verilen alanları güncelle; eski metin zamanlar da çevrilir"""
+        for field, value in fields.items():
+            if field in TIME_FIELDS:
+                value = parse_time(value)
+            elif field in ("priority", "status") or (field == "recurrence" and value):
+                value = sys.intern(value)
+            elif field == "tags":
+                value = tuple(map(sys.intern, value or ()))
+            setattr(self, field, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self.to_row() == other.to_row()
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.title!r}, status={self.status!r})"
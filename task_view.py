@@ -0,0 +1,226 @@
+from bisect import bisect_left
+from tkinter import ttk
+
+from instrumentation import metrics, timed
+
+
+class VirtualTaskList:
+    """Treeview üzerinde sanal, fark tabanlı görev listesi.
+
+    Süzgeçten geçen görevlerin yalnızca ID'leri gösterim sırasında tutulur
+    (varsayılan artan ID; sort_key verilirse o anahtara göre) ve Treeview'de
+    sadece görünür pencereye düşen satırlar oluşturulur.
+    Kaydırma ve değişiklikler mevcut satırlarla karşılaştırılarak uygulanır;
+    böylece arayüz gecikmesi liste boyutundan bağımsız kalır.
+    """
+
+    def __init__(self, tree, scrollbar, get_task, row_values, matches):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.get_task = get_task
+        self.row_values = row_values
+        self.matches = matches
+        self.ids = []
+        self.sort_key = None
+        self.offset = 0
+        self.page_size = int(tree.cget("height"))
+        self.rows = {}
+
+        scrollbar.configure(command=self.on_scroll)
+        tree.bind("<Configure>", self.on_resize)
+        tree.bind("<MouseWheel>", self.on_mousewheel)
+        tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        tree.bind("<Button-5>", lambda e: self.scroll(3))
+        tree.bind("<Up>", self.on_arrow)
+        tree.bind("<Down>", self.on_arrow)
+        tree.bind("<Prior>", lambda e: self.scroll(-self.page_size) or "break")
+        tree.bind("<Next>", lambda e: self.scroll(self.page_size) or "break")
+
+    def set_ids(self, ids, sort_key=None):
+        """Listeyi baştan kur (ör. filtre değiştiğinde).
+
+        sort_key verilirse ids zaten bu anahtara göre sıralı kabul edilir;
+        sonraki değişiklikler aynı anahtarla yerine yerleştirilir.
+        """
+        self.sort_key = sort_key
+        self.ids = sorted(ids) if sort_key is None else list(ids)
+        self.offset = 0
+        self.render()
+
+    def upsert(self, task):
+        """Eklenen ya da değişen tek bir görevi listeye uygula"""
+        self._place(task.id, task)
+        self.render()
+
+    def patch(self, task_ids):
+        """Başka yerde değişen görevleri güncel hallerine göre uygula.
+
+        Silinen görevler çıkarılır; pencere tüm değişikliklerden sonra bir
+        kez çizilir.
+        """
+        if self.sort_key is not None:
+            # Sıralı görünümde değişenler önce topluca çıkarılır; ikili arama
+            # sırasında komşular arasında eski haliyle görev kalmaz
+            changed = set(task_ids)
+            self.ids = [task_id for task_id in self.ids if task_id not in changed]
+            for task_id in changed:
+                self._insert_sorted(task_id, self.get_task(task_id))
+        else:
+            for task_id in task_ids:
+                self._place(task_id, self.get_task(task_id))
+        self.render()
+
+    def remove(self, task_id):
+        """Silinen bir görevi listeden çıkar"""
+        self._place(task_id, None)
+        self.render()
+
+    def _place(self, task_id, task):
+        if self.sort_key is not None:
+            self._place_sorted(task_id, task)
+            return
+        i = bisect_left(self.ids, task_id)
+        present = i < len(self.ids) and self.ids[i] == task_id
+        if task is not None and self.matches(task):
+            if not present:
+                self.ids.insert(i, task_id)
+        elif present:
+            del self.ids[i]
+
+    def _place_sorted(self, task_id, task):
+        # Eski anahtar bilinmediğinden eski konum taranarak bulunur
+        try:
+            self.ids.remove(task_id)
+        except ValueError:
+            pass
+        self._insert_sorted(task_id, task)
+
+    def _insert_sorted(self, task_id, task):
+        # Yeni konum komşu görevlerin anahtarlarıyla ikili aramayla seçilir
+        if task is None or not self.matches(task):
+            return
+        key = self.sort_key(task)
+        lo, hi = 0, len(self.ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            other = self.get_task(self.ids[mid])
+            if other is not None and self.sort_key(other) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.ids.insert(lo, task_id)
+
+    def scroll(self, delta):
+        """Pencereyi verilen satır sayısı kadar kaydır"""
+        self.offset += delta
+        self.render()
+
+    @timed("render")
+    def render(self):
+        """Görünür pencereyi mevcut satırlarla karşılaştırarak güncelle"""
+        max_offset = max(0, len(self.ids) - self.page_size)
+        self.offset = min(max(self.offset, 0), max_offset)
+        window = self.ids[self.offset:self.offset + self.page_size]
+        wanted = {str(task_id) for task_id in window}
+
+        # Pencere dışına çıkan satırları kaldır
+        children = []
+        stale = []
+        for iid in self.tree.get_children():
+            (children if iid in wanted else stale).append(iid)
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                self.rows.pop(iid, None)
+
+        # Treeview'e yapılan satır ekleme/güncelleme/taşıma sayısı
+        tree_ops = len(stale)
+        index = 0
+        for task_id in window:
+            iid = str(task_id)
+            task = self.get_task(task_id)
+            if task is None:
+                if iid in self.rows:
+                    self.tree.delete(iid)
+                    children.remove(iid)
+                    del self.rows[iid]
+                    tree_ops += 1
+                continue
+            values = self.row_values(task)
+            if iid not in self.rows:
+                self.tree.insert("", index, iid=iid, values=values)
+                children.insert(index, iid)
+                tree_ops += 1
+            else:
+                if self.rows[iid] != values:
+                    self.tree.item(iid, values=values)
+                    tree_ops += 1
+                if children[index] != iid:
+                    self.tree.move(iid, "", index)
+                    children.remove(iid)
+                    children.insert(index, iid)
+                    tree_ops += 1
+            self.rows[iid] = values
+            index += 1
+
+        metrics.count("render.tree_ops", tree_ops)
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        """Kaydırma çubuğunu tüm listeye göre ayarla"""
+        total = len(self.ids)
+        if total <= self.page_size:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self.offset / total
+        last = min(self.offset + self.page_size, total) / total
+        self.scrollbar.set(first, last)
+
+    def on_scroll(self, action, amount, unit=None):
+        """Kaydırma çubuğu komutlarını pencere kaymasına çevir"""
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.ids))
+            self.render()
+        elif action == "scroll":
+            step = self.page_size if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        # Windows tekerlek adımı 120'nin katlarıdır
+        self.scroll(step * max(1, abs(event.delta) // 120) * 3)
+        return "break"
+
+    def on_arrow(self, event):
+        """Ok tuşlarıyla pencere kenarından sonraki satırlara geç"""
+        children = self.tree.get_children()
+        if not children:
+            return None
+        focus = self.tree.focus()
+        if event.keysym == "Down" and focus == children[-1]:
+            self.scroll(1)
+        elif event.keysym == "Up" and focus == children[0]:
+            self.scroll(-1)
+        else:
+            return None
+
+        children = self.tree.get_children()
+        target = children[-1] if event.keysym == "Down" else children[0]
+        self.tree.focus(target)
+        self.tree.selection_set(target)
+        return "break"
+
+    def on_resize(self, event):
+        """Pencere boyutu değişince görünür satır sayısını yeniden hesapla"""
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else None
+        if bbox:
+            header, row_height = bbox[1], bbox[3]
+        else:
+            # Satırlar henüz çizilmemiş; temadaki satır yüksekliğini kullan
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+            header = row_height + 4
+        page_size = max(1, (event.height - header) // row_height)
+        if page_size != self.page_size:
+            self.page_size = page_size
+            self.render()
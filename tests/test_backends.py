@@ -0,0 +1,143 @@
+import json
+import multiprocessing
+
+import pytest
+
+from storage import migrate, open_storage
+from task import Task, parse_time
+
+BACKENDS = ["tasks.json", "tasks.tdb", "tasks.db"]
+
+
+def make_task(task_id, title, **fields):
+    return Task(task_id, title, "", "orta", "bekliyor", 1700000000, **fields)
+
+
+def reopen(path):
+    storage = open_storage(path)
+    storage.load()
+    return storage
+
+
+def rows(storage):
+    return sorted(task.to_row() for task in storage.iter_tasks())
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("compact", [False, True])
+def test_round_trip(tmp_path, name, compact):
+    path = str(tmp_path / name)
+    storage = reopen(path)
+    for title in ("Rapor yaz", "Süt al", "Kira öde", "Çöpü çıkar"):
+        storage.add(make_task(storage.allocate_id(), title, tags=("ev",)))
+    storage.update(2, status="tamamlandı", completed_at=1700003600)
+    storage.update(3, title="Kirayı öde", priority="yüksek", due_at=1700086400,
+                   recurrence="aylık", tags=("ev", "finans"))
+    storage.delete(4)
+    if compact:
+        storage.compact()
+    expected = rows(storage)
+    storage.close()
+
+    storage = reopen(path)
+    try:
+        assert rows(storage) == expected
+        assert [task.title for task in storage.iter_tasks()] == ["Rapor yaz", "Süt al", "Kirayı öde"]
+        assert storage.get(3).due_at == 1700086400 and storage.get(3).recurrence == "aylık"
+        assert storage.get(4) is None
+        assert (storage.stats.total, storage.stats.pending) == (3, 2)
+        # Silinen görevin ID'si yeniden verilmez
+        assert storage.allocate_id() == 5
+    finally:
+        storage.close()
+
+
+LEGACY_TASKS = [
+    {"id": 1, "title": "Python çalış", "description": "", "priority": "yüksek",
+     "status": "bekliyor", "created_at": "2024-08-01 09:30:00", "completed_at": None},
+    {"id": 2, "title": "Süt al", "description": "market", "priority": "düşük",
+     "status": "tamamlandı", "created_at": "2024-08-02 10:00:00",
+     "completed_at": "2024-08-03 18:15:00"},
+    # Eski sürümler aynı ID'yi iki kez verebiliyordu
+    {"id": 2, "title": "Rapor yaz", "description": "", "priority": "orta",
+     "status": "bekliyor", "created_at": "2024-08-04 12:00:00", "completed_at": None},
+]
+
+
+@pytest.mark.parametrize("target", [None, "tasks.tdb", "tasks.db"])
+def test_legacy_task_list_is_migrated(tmp_path, target):
+    path = str(tmp_path / "tasks.json")
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(LEGACY_TASKS, file, ensure_ascii=False)
+    if target is not None:
+        assert migrate(path, str(tmp_path / target)) == 3
+        path = str(tmp_path / target)
+    else:
+        storage = reopen(path)
+        # Güncel biçime ilk sıkıştırmada geçilir
+        storage.compact()
+        storage.close()
+        with open(path, encoding='utf-8') as file:
+            assert isinstance(json.load(file), dict)
+
+    storage = reopen(path)
+    try:
+        tasks = sorted(storage.iter_tasks(), key=lambda task: task.id)
+        assert [(task.id, task.title) for task in tasks] == [
+            (1, "Python çalış"), (2, "Süt al"), (3, "Rapor yaz")]
+        assert tasks[0].created_at == parse_time("2024-08-01 09:30:00")
+        assert tasks[1].completed_at == parse_time("2024-08-03 18:15:00")
+        assert tasks[1].description == "market"
+        assert tasks[2].due_at is None and tasks[2].recurrence is None and tasks[2].tags == ()
+        assert (storage.stats.total, storage.stats.pending) == (3, 2)
+        assert storage.allocate_id() == 4
+    finally:
+        storage.close()
+
+
+WRITES_PER_PROCESS = 40
+
+
+def write_tasks(path, name, ready):
+    storage = open_storage(path)
+    storage.load()
+    ready.wait()
+    try:
+        for i in range(WRITES_PER_PROCESS):
+            task = storage.add(make_task(storage.allocate_id(), f"{name} {i}"))
+            if i % 4 == 0:
+                storage.update(task.id, status="tamamlandı", completed_at=1700003600)
+    finally:
+        storage.close()
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_two_processes_write_one_store(tmp_path, name):
+    path = str(tmp_path / name)
+    storage = reopen(path)
+    storage.close()
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    workers = [context.Process(target=write_tasks, args=(path, writer, ready))
+               for writer in ("a", "b")]
+    for worker in workers:
+        worker.start()
+    ready.set()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    storage = reopen(path)
+    try:
+        tasks = list(storage.iter_tasks())
+        assert sorted(task.title for task in tasks) == sorted(
+            f"{writer} {i}" for writer in ("a", "b") for i in range(WRITES_PER_PROCESS))
+        # İki süreç aynı ID'yi vermez ve hiçbir güncelleme kaybolmaz
+        assert len({task.id for task in tasks}) == 2 * WRITES_PER_PROCESS
+        completed = sorted(task.title for task in tasks if task.status == "tamamlandı")
+        assert completed == sorted(f"{writer} {i}" for writer in ("a", "b")
+                                   for i in range(0, WRITES_PER_PROCESS, 4))
+        assert storage.stats.total == 2 * WRITES_PER_PROCESS
+        assert storage.stats.pending == 2 * WRITES_PER_PROCESS - len(completed)
+    finally:
+        storage.close()
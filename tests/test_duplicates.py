@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from duplicates import DuplicateIndex
+from todo_app import TodoApp, build_parser, read_rows, run_command
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = TodoApp(str(tmp_path / "tasks.json"))
+    yield app
+    app.storage.close()
+
+
+def run(app, *argv):
+    return run_command(app, build_parser().parse_args(list(argv)))
+
+
+def titles(app):
+    return sorted(task.title for task in app.storage.iter_tasks())
+
+
+def test_add_warns_about_similar_pending_task(app, capsys):
+    app.add_task("Haftalık raporu hazırla")
+    capsys.readouterr()
+    app.add_task("Haftalık raporu hazırla (acil)")
+    output = capsys.readouterr().out
+    assert "Uyari: benzer bekleyen gorev(ler) var:" in output
+    assert "1. Haftalık raporu hazırla (%81 benzer)" in output
+    assert len(titles(app)) == 2
+
+
+def test_add_ignores_completed_tasks(app, capsys):
+    app.add_task("Kira öde")
+    app.complete_tasks([1])
+    capsys.readouterr()
+    app.add_task("Kira öde")
+    assert "Uyari" not in capsys.readouterr().out
+
+
+def test_one_shot_add_checks_only_when_asked(app, capsys):
+    run(app, "add", "Python çalış")
+    run(app, "add", "python calis!")
+    assert "Uyari" not in capsys.readouterr().out
+    # Denetim istenmedikçe benzerlik indeksi kurulmaz
+    assert DuplicateIndex not in app.storage.indexes
+    run(app, "add", "Python çalış", "--check-duplicates")
+    output = capsys.readouterr().out
+    assert "1. Python çalış (%100 benzer)" in output
+    assert "2. python calis! (%100 benzer)" in output
+
+
+def bulk_rows(text):
+    return read_rows(io.StringIO(text), "csv")
+
+
+def test_bulk_add_skips_and_reports_duplicates(app, capsys):
+    app.add_task("Haftalık raporu hazırla")
+    capsys.readouterr()
+    rows = bulk_rows("title\nHaftalık raporu hazırla (acil)\nSüt al\nsüt al!\nEkmek al\n")
+    assert app.import_tasks(rows) == 2
+    output = capsys.readouterr().out
+    assert "2 satir atlandi (ayni ya da benzer gorev var):" in output
+    assert "   'Haftalık raporu hazırla (acil)' -> 1. Haftalık raporu hazırla (%81 benzer)" in output
+    assert "   'süt al!' -> 2. Süt al (%100 benzer)" in output
+    assert titles(app) == ["Ekmek al", "Haftalık raporu hazırla", "Süt al"]
+
+
+def test_bulk_add_keep_duplicates_adds_every_row(app, capsys):
+    app.add_task("Süt al")
+    rows = bulk_rows("title\nSüt al\nsüt al!\n")
+    assert app.import_tasks(rows, keep_duplicates=True) == 2
+    assert "atlandi" not in capsys.readouterr().out
+    assert titles(app) == ["Süt al", "Süt al", "süt al!"]
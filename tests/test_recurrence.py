@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+
+from recurrence import complete_and_repeat, next_due
+from storage import open_storage
+from task import Task
+from todo_app import TodoApp
+
+
+def timestamp(text):
+    return int(datetime.fromisoformat(text).timestamp())
+
+
+def test_next_due_steps_in_local_time():
+    due = timestamp("2024-01-31 09:00")
+    assert next_due(due, "aylık", due) == timestamp("2024-02-29 09:00")
+    assert next_due(due, "haftalık", due) == timestamp("2024-02-07 09:00")
+    # Uzun süre gecikmiş görevde tamamlanma anından sonraki ilk gün seçilir
+    assert next_due(due, "günlük", timestamp("2024-03-10 12:00")) == timestamp("2024-03-11 09:00")
+    assert next_due(None, "yıllık", due) == timestamp("2025-01-31 09:00")
+
+
+@pytest.mark.parametrize("name", ["tasks.json", "tasks.tdb", "tasks.db"])
+def test_completing_recurring_task_spawns_next(tmp_path, name):
+    path = str(tmp_path / name)
+    storage = open_storage(path)
+    storage.load()
+    task = storage.add(Task(storage.allocate_id(), "Kira öde", "ev sahibine", "yüksek", "bekliyor",
+                            timestamp("2024-01-01 08:00"), due_at=timestamp("2024-01-05 23:59"),
+                            recurrence="aylık", tags=("ev", "finans")))
+    now = timestamp("2024-01-04 10:00")
+    completed, spawned = complete_and_repeat(storage, task, now)
+    storage.close()
+
+    assert completed.status == "tamamlandı" and completed.completed_at == now
+    storage = open_storage(path)
+    storage.load()
+    try:
+        spawned = storage.get(spawned.id)
+        assert spawned.id == 2
+        assert (spawned.title, spawned.description, spawned.priority, spawned.status) == (
+            "Kira öde", "ev sahibine", "yüksek", "bekliyor")
+        assert spawned.due_at == timestamp("2024-02-05 23:59")
+        assert spawned.recurrence == "aylık" and spawned.tags == ("ev", "finans")
+        assert spawned.created_at == now
+        assert storage.get(1).status == "tamamlandı"
+    finally:
+        storage.close()
+
+
+def test_complete_command_repeats_only_recurring_tasks(tmp_path, capsys):
+    app = TodoApp(str(tmp_path / "tasks.json"))
+    try:
+        app.add_task("Çiçekleri sula", recurrence="haftalık")
+        app.add_task("Süt al")
+        capsys.readouterr()
+        assert app.complete_tasks([1, 2, 9]) == 1
+        output = capsys.readouterr().out
+        assert "2 gorev tamamlandi" in output
+        assert "1 tekrarlanan gorevin sonraki ornegi eklendi" in output
+        pending = [task.title for task in app.storage.iter_tasks(status="bekliyor")]
+        assert pending == ["Çiçekleri sula"]
+        # Tamamlanmış görevi yeniden tamamlamak yeni örnek eklemez
+        app.complete_tasks([1])
+        assert len(app.storage) == 3
+    finally:
+        app.storage.close()
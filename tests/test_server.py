@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+
+from server import TaskServer
+from storage import open_storage
+from todo_app import TodoApp
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+
+async def start(path):
+    server = TaskServer(TodoApp(path))
+    listener = await server.start("127.0.0.1", 0)
+    return server, listener
+
+
+async def shutdown(server, listener):
+    listener.close()
+    await listener.wait_closed()
+    await server.stop()
+    server.storage.close()
+
+
+def post(server, title):
+    return server.dispatch("POST", "/tasks", {}, json.dumps({"title": title}).encode())
+
+
+def test_etag_changes_across_restarts(tmp_path):
+    path = str(tmp_path / "tasks.json")
+
+    async def first_run():
+        server, listener = await start(path)
+        status, body, headers = await server.dispatch("GET", "/tasks", {}, b"")
+        await shutdown(server, listener)
+        return body, headers["ETag"]
+
+    body, etag = run(first_run())
+    assert body["total"] == 0
+
+    # Sunucu kapalıyken komut satırından görev eklenir
+    app = TodoApp(path)
+    app.add_task("Faturayı öde")
+    app.add_task("Raporu gönder")
+    app.storage.close()
+
+    async def second_run():
+        server, listener = await start(path)
+        result = await server.dispatch("GET", "/tasks", {"if-none-match": etag}, b"")
+        await shutdown(server, listener)
+        return result
+
+    status, body, headers = run(second_run())
+    assert status == 200
+    assert headers["ETag"] != etag
+    assert body["total"] == 2
+
+
+def test_etag_not_modified_until_change(tmp_path):
+    async def scenario():
+        server, listener = await start(str(tmp_path / "tasks.json"))
+        _, _, headers = await server.dispatch("GET", "/tasks", {}, b"")
+        etag = headers["ETag"]
+        cached = await server.dispatch("GET", "/tasks", {"if-none-match": etag}, b"")
+        await post(server, "Yeni görev")
+        changed = await server.dispatch("GET", "/tasks", {"if-none-match": etag}, b"")
+        await shutdown(server, listener)
+        return cached, changed
+
+    cached, changed = run(scenario())
+    assert cached[0] == 304
+    assert changed[0] == 200 and changed[1]["total"] == 1
+
+
+def test_stop_waits_for_the_batch_being_flushed(tmp_path):
+    path = str(tmp_path / "tasks.json")
+
+    async def scenario():
+        server, listener = await start(path)
+        flush = server.storage.flush
+
+        def slow_flush():
+            time.sleep(0.2)
+            flush()
+
+        server.storage.flush = slow_flush
+        requests = [asyncio.ensure_future(post(server, f"Görev {i}")) for i in range(20)]
+        # Kuyruk boşalır; yazıcı bu sırada yavaş yazımı bekler
+        await asyncio.sleep(0.05)
+        assert server.mutations.empty()
+        await shutdown(server, listener)
+        return await asyncio.gather(*requests)
+
+    results = run(scenario())
+    assert [status for status, _, _ in results] == [201] * 20
+
+    storage = open_storage(path)
+    storage.load()
+    assert len(storage) == 20
+    storage.close()
+
+
+def test_concurrent_writes_share_one_flush(tmp_path):
+    path = str(tmp_path / "tasks.json")
+
+    async def scenario():
+        server, listener = await start(path)
+        flush = server.storage.flush
+        flushes = []
+
+        def slow_flush():
+            # Yanıt, görev diske yazılmadan gönderilmemeli
+            flushes.append(len(server.storage.pending))
+            time.sleep(0.1)
+            flush()
+
+        server.storage.flush = slow_flush
+        first = await post(server, "Görev 0")
+        requests = [asyncio.ensure_future(post(server, f"Görev {i}")) for i in range(1, 30)]
+        results = [first] + await asyncio.gather(*requests)
+        flushed = list(flushes)
+        await shutdown(server, listener)
+        return results, flushed
+
+    results, flushes = run(scenario())
+    assert [status for status, _, _ in results] == [201] * 30
+    assert len({body["id"] for _, body, _ in results}) == 30
+    # İlk istek tek başına yazılır; ardından gelen 29 istek en çok iki yazıma
+    # sığar (biri yazılırken gelenler sonrakinde toplanır)
+    assert flushes[0] == 1
+    assert len(flushes) in (2, 3)
+    assert sum(flushes) == 30
+
+    storage = open_storage(path)
+    storage.load()
+    assert sorted(task.title for task in storage.iter_tasks()) == sorted(
+        f"Görev {i}" for i in range(30))
+    storage.close()
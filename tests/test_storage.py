@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from storage import open_storage
+from task import Task
+
+
+def make_task(task_id, title, status="bekliyor"):
+    return Task(task_id, title, "", "orta", status, 1700000000)
+
+
+def titles_on_disk(path):
+    storage = open_storage(path)
+    try:
+        storage.load()
+        return sorted(task.title for task in storage.iter_tasks())
+    finally:
+        storage.close()
+
+
+@pytest.mark.parametrize("name", ["tasks.json", "tasks.tdb"])
+def test_reload_keeps_commits_made_during_load(tmp_path, name):
+    # Başka bir süreç sıkıştırma yapınca bu depo yeniden yüklenir. Yükleme
+    # sürerken başka bir iş parçacığının eklediği görev kaybolmamalı.
+    path = str(tmp_path / name)
+    storage = open_storage(path)
+    storage.load()
+    storage.on_dirty = lambda: None
+    storage.add(make_task(storage.allocate_id(), "pending-before"))
+
+    other = open_storage(path)
+    other.load()
+    other.add(make_task(other.allocate_id(), "from-b"))
+    other.compact()
+    other.close()
+
+    load = storage.load
+    adder = threading.Thread(target=lambda: storage.add(make_task(1000, "from-thread")))
+
+    def patched_load():
+        load()
+        adder.start()
+        # Düzeltmeden önce ekleme burada, yeniden uygulamadan önce biterdi
+        adder.join(0.3)
+
+    storage.load = patched_load
+    storage.flush()
+    adder.join()
+    storage.load = load
+    storage.flush()
+
+    assert sorted(task.title for task in storage.iter_tasks()) == [
+        "from-b", "from-thread", "pending-before"]
+    storage.close()
+    assert titles_on_disk(path) == ["from-b", "from-thread", "pending-before"]
+
+
+def test_reload_rebuilds_indexes(tmp_path):
+    from search import SearchIndex
+
+    path = str(tmp_path / "tasks.json")
+    storage = open_storage(path)
+    storage.load()
+    storage.add(make_task(storage.allocate_id(), "kira ode"))
+    assert storage.index(SearchIndex).search("kira") == [1]
+
+    other = open_storage(path)
+    other.load()
+    other.add(make_task(other.allocate_id(), "kira sozlesmesi"))
+    other.compact()
+    other.close()
+
+    assert storage.refresh()
+    assert storage.index(SearchIndex).search("kira") == [1, 2]
+    storage.close()
@@ -0,0 +1,46 @@
+import csv
+import io
+
+import pytest
+
+from filters import parse_tags
+from storage import open_storage
+from task import Task
+from todo_app import TodoApp
+
+
+def test_parse_tags_splits_list_items():
+    assert parse_tags(["Rapor, iş", " #acil  ev", "", "#"]) == ("acil", "ev", "iş", "rapor")
+    assert parse_tags("is,rapor #acil") == ("acil", "is", "rapor")
+    assert parse_tags(None) == ()
+
+
+@pytest.mark.parametrize("name", ["tasks.json", "tasks.tdb", "tasks.db"])
+def test_tags_round_trip_in_every_backend(tmp_path, name):
+    path = str(tmp_path / name)
+    tags = parse_tags(["iş,rapor", "acil ev"])
+    storage = open_storage(path)
+    storage.load()
+    storage.add(Task(storage.allocate_id(), "Rapor yaz", "", "orta", "bekliyor", 1700000000,
+                     tags=tags))
+    storage.compact()
+    storage.close()
+
+    storage = open_storage(path)
+    storage.load()
+    try:
+        assert storage.get(1).tags == ("acil", "ev", "iş", "rapor")
+    finally:
+        storage.close()
+
+
+def test_tags_round_trip_through_csv_export(tmp_path):
+    app = TodoApp(str(tmp_path / "tasks.json"))
+    try:
+        app.add_task("Rapor yaz", tags=parse_tags(["iş,rapor", "acil ev"]))
+        out = io.StringIO()
+        app.export_tasks(out, "csv")
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert parse_tags(rows[0]["tags"]) == app.storage.get(1).tags
+    finally:
+        app.storage.close()
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from storage import JsonStorage, open_storage
+from task import Task
+from workspace import DEFAULT_LIST, Workspace, _list_search, _list_stats
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_task(task_id, title, status="bekliyor"):
+    return Task(task_id, title, "", "orta", status, 1700000000)
+
+
+def file_states(path):
+    states = {}
+    for data_file in open_storage(path).data_files():
+        # Boş -wal dosyasını SQLite okuyucu bağlantısı da oluşturur
+        try:
+            with open(data_file, 'rb') as file:
+                states[data_file] = file.read() or None
+        except FileNotFoundError:
+            states[data_file] = None
+    return states
+
+
+def todo(*argv):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "todo_app.py"), *argv],
+                          capture_output=True, text=True, encoding="utf-8", timeout=60)
+
+
+@pytest.mark.parametrize("name", ["tasks.json", "tasks.tdb", "tasks.db"])
+def test_list_workers_do_not_write(tmp_path, monkeypatch, name):
+    path = str(tmp_path / name)
+    storage = open_storage(path)
+    storage.load()
+    for title in ("Rapor yaz", "Süt al", "Rapor oku"):
+        storage.add(make_task(storage.allocate_id(), title))
+    storage.close()
+    # Günlük, bir yazan sürecin kapanışta sıkıştıracağı kadar büyük sayılır
+    monkeypatch.setattr(JsonStorage, "COMPACT_MIN_RECORDS", 1)
+    before = file_states(path)
+
+    assert _list_stats(path)["total"] == 3
+    assert [task.title for task in _list_search(path, "rapor", None)] == ["Rapor yaz", "Rapor oku"]
+    assert file_states(path) == before
+
+
+def test_read_only_load_keeps_torn_journal_record(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = open_storage(path)
+    storage.load()
+    storage.add(make_task(storage.allocate_id(), "Rapor yaz"))
+    storage.close()
+    with open(path + ".journal", 'ab') as file:
+        file.write(b'{"op": "add"')
+    size = os.path.getsize(path + ".journal")
+
+    assert _list_stats(path)["total"] == 1
+    assert os.path.getsize(path + ".journal") == size
+
+
+def test_default_list_is_created_only_for_writes(tmp_path):
+    root = str(tmp_path / "ekip")
+    workspace = Workspace(root)
+    assert workspace.default_list() == DEFAULT_LIST
+    assert not os.path.exists(root)
+    with pytest.raises(KeyError):
+        workspace.path(DEFAULT_LIST)
+
+    result = todo("-w", root, "list")
+    assert result.returncode == 0
+    assert "Calisma alaninda liste yok." in result.stdout
+    assert not os.path.exists(root)
+
+    result = todo("-w", root, "add", "Rapor yaz")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert workspace.names() == [DEFAULT_LIST]
+    assert "Rapor yaz" in todo("-w", root, "list").stdout
@@ -1,151 +1,612 @@
+import argparse
+import atexit
+import cProfile
+import csv
 import json
 import os
-from datetime import datetime
 import sys
 import codecs
+from datetime import date
+from itertools import islice
+from archive import TaskArchive, archive_completed
+from duplicates import DuplicateIndex, find_duplicates
+from filters import FilterIndex, TaskFilter, bitmap_ids, parse_day, parse_period, parse_tags
+from instrumentation import metrics, timed
+from ordering import SORT_ORDERS, DueOrder, PriorityOrder
+from recurrence import RECURRENCES, complete_and_repeat, parse_due
+from reports import DEFAULT_REPORT_DAYS, DEFAULT_REPORT_WEEKS, ProductivityIndex, format_duration
+from search import SearchIndex
+from stats import TaskStats
+from storage import CorruptDataError, migrate, open_storage
+from task import TASK_FIELDS, Task, current_time, format_time, parse_time
+from workspace import Workspace
+
+PRIORITIES = ["düşük", "orta", "yüksek"]
+STATUSES = ["bekliyor", "tamamlandı"]
+
+# Arşivleme için varsayılan yaş (gün)
+DEFAULT_ARCHIVE_DAYS = 30
+
+# "due" raporunda varsayılan olarak gösterilen gün sayısı
+DEFAULT_DUE_DAYS = 7
+
+# Düzenlemede bitiş zamanını ya da tekrarı kaldırmak için yazılan değer
+CLEAR = "yok"
+
+PRIORITY_ICONS = {"düşük": "[DUSUK]", "orta": "[ORTA]", "yüksek": "[YUKSEK]"}
+
+# json.dumps her çağrıda yeni bir kodlayıcı oluşturur; satır satır yazımda
+# tek kodlayıcı paylaşılır
+encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+# Görevleri değiştirmeyen komutlar; boş çalışma alanında varsayılan listeyi
+# oluşturmazlar
+READ_COMMANDS = {"list", "next", "tags", "due", "report", "stats", "search", "export"}
+
+# Liste çıktısı yaklaşık bu kadar karakterlik parçalar halinde yazılır
+OUTPUT_CHUNK = 16 * 1024
+
+# Türkçe karakter olmadan yazılan değerler de kabul edilir
+ALIASES = {"dusuk": "düşük", "yuksek": "yüksek", "tamamlandi": "tamamlandı",
+           "gunluk": "günlük", "haftalik": "haftalık", "aylik": "aylık", "yillik": "yıllık"}
+
+def normalize_choice(value):
+    """Öncelik/durum değerini küçük harfe çevir ve ASCII yazımları düzelt"""
+    value = value.strip().lower()
+    return ALIASES.get(value, value)
+
+def due_argument(value):
+    """Komut satırındaki bitiş zamanını çöz ("yok" olduğu gibi kalır)"""
+    if value.strip().lower() == CLEAR:
+        return CLEAR
+    try:
+        return parse_due(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"gecersiz tarih: {value} (YYYY-MM-DD, 'YYYY-MM-DD HH:MM', bugun, yarin)") from None
+
+def day_argument(value, end=False):
+    """Komut satırındaki tarih sınırını çöz"""
+    try:
+        return parse_day(value, end)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"gecersiz tarih: {value} (YYYY-MM-DD)") from None
+
+def period_argument(value):
+    """Komut satırındaki dönemi (başlangıç, bitiş) çiftine çevir"""
+    try:
+        return parse_period(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"gecersiz donem: {value} (bugun, dun, bu-hafta, gecen-hafta, bu-ay, gecen-ay, "
+            f"bu-yil, YYYY, YYYY-MM, YYYY-MM-DD ya da A..B)") from None
+
+def read_rows(stream, fmt=None):
+    """CSV (başlık satırlı) veya JSON-lines akışındaki satırları sözlük olarak üret"""
+    if fmt is None:
+        first = stream.readline()
+        fmt = "jsonl" if first.lstrip().startswith("{") else "csv"
+        lines = _chain_line(first, stream)
+    else:
+        lines = stream
+    
+    if fmt == "csv":
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+def export_record(task):
+    """Dışa aktarılacak kayıt: zamanlar okunur metin olarak"""
+    record = task.to_dict()
+    record["created_at"] = format_time(task.created_at)
+    record["completed_at"] = format_time(task.completed_at)
+    record["due_at"] = format_time(task.due_at)
+    record["tags"] = list(task.tags)
+    return record
+
+def task_summary(task):
+    """Görevin tek satırlık özeti (satır sonu olmadan)"""
+    status_icon = "[TAMAMLANDI]" if task.status == "tamamlandı" else "[BEKLIYOR]"
+    priority_icon = PRIORITY_ICONS.get(task.priority, "[ORTA]")
+    return f"{status_icon} {priority_icon} {task.id}. {task.title}"
+
+def format_task(task):
+    """Görevin ayrıntılı, çok satırlı gösterimi"""
+    lines = [task_summary(task)]
+    if task.description:
+        lines.append(f"   Aciklama: {task.description}")
+    lines.append(f"   Olusturulma: {format_time(task.created_at)}")
+    if task.completed_at:
+        lines.append(f"   Tamamlanma: {format_time(task.completed_at)}")
+    if task.due_at is not None:
+        late = task.status == "bekliyor" and task.due_at < current_time()
+        lines.append(f"   Bitis: {format_time(task.due_at)}{' (gecikti)' if late else ''}")
+    if task.recurrence:
+        lines.append(f"   Tekrar: {task.recurrence}")
+    if task.tags:
+        lines.append("   Etiketler: " + " ".join("#" + tag for tag in task.tags))
+    return "\n".join(lines) + "\n\n"
+
+# Liste çıktı biçimleri: görev -> satır(lar)
+LIST_FORMATS = {
+    "text": format_task,
+    "compact": lambda task: task_summary(task) + "\n",
+    "jsonl": lambda task: encode_json(export_record(task)) + "\n",
+}
+
+def print_statistics(stats, title="Istatistikler"):
+    """İstatistik özetini ve öncelik dağılımını yazdır"""
+    print(f"\n{title}:")
+    print("-" * 30)
+    print(f"Toplam gorev: {stats.total}")
+    print(f"Tamamlanan: {stats.completed}")
+    print(f"Bekleyen: {stats.pending}")
+    
+    if stats.completion_rate is not None:
+        print(f"Tamamlanma orani: %{stats.completion_rate:.1f}")
+    
+    # Öncelik dağılımı
+    priorities = stats.priorities()
+    if priorities:
+        print("\nOncelik dagilimi:")
+        for priority, count in priorities.items():
+            print(f"   {priority}: {count} gorev")
+
+def _chain_line(first, stream):
+    yield first
+    yield from stream
 
 class TodoApp:
-    def __init__(self):
-        self.tasks_file = "tasks.json"
-        self.tasks = self.load_tasks()
+    def __init__(self, tasks_file="tasks.json"):
+        self.tasks_file = tasks_file
+        self.storage = open_storage(self.tasks_file, on_error=self.report_save_error)
+        self.archive = TaskArchive(self.tasks_file)
+        self.load_tasks()
+        self.auto_archive()
         
     def load_tasks(self):
-        """JSON dosyasından görevleri yükle"""
-        if os.path.exists(self.tasks_file):
-            try:
-                with open(self.tasks_file, 'r', encoding='utf-8') as file:
-                    return json.load(file)
-            except json.JSONDecodeError:
-                print("❌ Görev dosyası bozuk. Yeni dosya oluşturuluyor...")
-                return []
-        return []
+        """Görev deposunu aç (JSON dosyası + günlük ya da SQLite veritabanı)"""
+        try:
+            self.storage.load()
+        except CorruptDataError:
+            print("❌ Görev dosyası bozuk. Yeni dosya oluşturuluyor...")
+            self.storage.reset()
+    
+    def auto_archive(self):
+        """Otomatik arşivleme açıksa ve zamanı geldiyse eski görevleri arşivle"""
+        if not self.archive.due():
+            return
+        count = archive_completed(self.storage, self.archive, self.archive.after_days)
+        if count:
+            # Standart çıktı komut çıktısına (ör. export) karışmasın
+            print(f"{count} eski gorev arsivlendi.", file=sys.stderr)
+    
+    def archive_tasks(self, days):
+        """`days` günden önce tamamlanan görevleri arşive taşı"""
+        count = archive_completed(self.storage, self.archive, days)
+        print(f"{count} gorev arsivlendi ({days} gunden eski).")
+    
+    def list_archived(self, limit=None):
+        """Arşivdeki görevleri en son tamamlanandan başlayarak listele"""
+        tasks = list(self.archive.iter_tasks(limit))
+        if not tasks:
+            print("Arsivde gorev yok.")
+            return
+        
+        print(f"\nArsivlenen gorevler ({len(tasks)} adet):")
+        print("-" * 80)
+        
+        for task in tasks:
+            self.print_task(task)
     
     def save_tasks(self):
-        """Görevleri JSON dosyasına kaydet"""
-        try:
-            with open(self.tasks_file, 'w', encoding='utf-8') as file:
-                json.dump(self.tasks, file, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"❌ Görevler kaydedilemedi: {e}")
-    
-    def add_task(self, title, description="", priority="orta"):
-        """Yeni görev ekle"""
-        task = {
-            "id": len(self.tasks) + 1,
-            "title": title,
-            "description": description,
-            "priority": priority,
-            "status": "bekliyor",
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "completed_at": None
-        }
-        self.tasks.append(task)
-        self.save_tasks()
+        """Görevleri tek bir anlık görüntü olarak kaydet (günlüğü sıkıştırır)"""
+        self.storage.compact()
+    
+    def report_save_error(self, error):
+        """Kayıt hatasını kullanıcıya bildir"""
+        print(f"❌ Görevler kaydedilemedi: {error}")
+    
+    def create_task(self, title, description="", priority="orta", due_at=None, recurrence=None,
+                    tags=()):
+        """Yeni ID ile bekleyen bir görev oluştur"""
+        return Task(self.storage.allocate_id(), title, description, priority,
+                    "bekliyor", created_at=current_time(), due_at=due_at,
+                    recurrence=recurrence, tags=tags)
+    
+    def add_task(self, title, description="", priority="orta", due_at=None, recurrence=None,
+                 tags=(), check_duplicates=True):
+        """Yeni görev ekle.
+
+        check_duplicates verilirse benzer bekleyen görevler için uyarılır. Bu
+        denetim deponun benzerlik indeksini kurar (tüm başlıklar bir kez
+        imzalanır); indeksin sonraki eklemelerde yeniden kullanılmadığı tek
+        seferlik komut satırı eklemesinde varsayılan olarak kapalıdır.
+        """
+        duplicates = find_duplicates(self.storage, title, "bekliyor") if check_duplicates else []
+        task = self.create_task(title, description, priority, due_at, recurrence, tags)
+        self.storage.add(task)
         print(f"Gorev eklendi: {title}")
+        if duplicates:
+            print("Uyari: benzer bekleyen gorev(ler) var:")
+            for score, duplicate in duplicates:
+                print(f"   {duplicate.id}. {duplicate.title} (%{score * 100:.0f} benzer)")
+    
+    def import_tasks(self, rows, keep_duplicates=False):
+        """Satırlardaki görevleri toplu ekle; tümü tek seferde kaydedilir.
+
+        Başlığı mevcut bir görevle (ya da girdide daha önce gelen bir satırla)
+        aynı veya çok benzer olan satırlar, keep_duplicates verilmedikçe atlanır
+        ve eşleştikleri görevle birlikte listelenir. Satırlar tek bir bellek içi
+        indeksle denetlenir; eklenen her satır indekse hemen girer.
+        """
+        added = 0
+        skipped = 0
+        duplicates = []
+        index = None if keep_duplicates else self.storage.index(DuplicateIndex)
+        with self.storage.batch():
+            for row in rows:
+                title = (row.get("title") or "").strip()
+                if not title:
+                    skipped += 1
+                    continue
+                if index is not None:
+                    found = index.find(title)
+                    if found:
+                        score, task_id = found[0]
+                        duplicates.append((title, score, self.storage.get(task_id)))
+                        continue
+                priority = normalize_choice(row.get("priority") or "orta")
+                if priority not in PRIORITIES:
+                    priority = "orta"
+                task = self.create_task(title, (row.get("description") or "").strip(), priority,
+                                        tags=parse_tags(row.get("tags")))
+                try:
+                    if row.get("created_at"):
+                        task.created_at = parse_time(row["created_at"])
+                    completed_at = parse_time(row.get("completed_at") or None)
+                except (TypeError, ValueError):
+                    # Okunamayan tarih: şimdiki zamanla devam et
+                    completed_at = None
+                try:
+                    task.due_at = parse_time(row.get("due_at") or None)
+                except (TypeError, ValueError):
+                    task.due_at = None
+                recurrence = normalize_choice(row.get("recurrence") or "")
+                if recurrence in RECURRENCES:
+                    task.recurrence = recurrence
+                if normalize_choice(row.get("status") or "") == "tamamlandı":
+                    task.status = "tamamlandı"
+                    task.completed_at = completed_at or task.created_at
+                self.storage.add(task)
+                added += 1
+        
+        print(f"{added} gorev eklendi")
+        if skipped:
+            print(f"{skipped} satir atlandi (baslik bos)")
+        if duplicates:
+            print(f"{len(duplicates)} satir atlandi (ayni ya da benzer gorev var):")
+            for title, score, task in duplicates:
+                print(f"   '{title}' -> {task.id}. {task.title} (%{score * 100:.0f} benzer)")
+        return added
+    
+    def complete_tasks(self, task_ids):
+        """Birden çok görevi tek seferde tamamla; bulunamayan sayısını döndür"""
+        completed = 0
+        repeated = 0
+        missing = 0
+        now = current_time()
+        with self.storage.batch():
+            for task_id in task_ids:
+                task = self.storage.get(task_id)
+                if task is None:
+                    missing += 1
+                elif task.status != "tamamlandı":
+                    spawned = complete_and_repeat(self.storage, task, now)[1]
+                    completed += 1
+                    if spawned is not None:
+                        repeated += 1
+        
+        print(f"{completed} gorev tamamlandi")
+        if repeated:
+            print(f"{repeated} tekrarlanan gorevin sonraki ornegi eklendi")
+        if missing:
+            print(f"{missing} gorev bulunamadi")
+        return missing
     
-    def list_tasks(self, status_filter=None):
-        """Görevleri listele"""
-        if not self.tasks:
+    def delete_tasks(self, task_ids):
+        """Birden çok görevi tek seferde sil; bulunamayan sayısını döndür"""
+        deleted = 0
+        missing = 0
+        with self.storage.batch():
+            for task_id in task_ids:
+                if self.storage.delete(task_id):
+                    deleted += 1
+                else:
+                    missing += 1
+        
+        print(f"{deleted} gorev silindi")
+        if missing:
+            print(f"{missing} gorev bulunamadi")
+        return missing
+    
+    @timed("export")
+    def export_tasks(self, out, fmt="jsonl"):
+        """Görevleri akış halinde JSON-lines ya da CSV olarak yaz"""
+        tasks = (export_record(task) for task in self.storage.iter_tasks())
+        if fmt == "csv":
+            # CSV hücresinde etiketler virgülle ayrılır
+            tasks = ({**record, "tags": ",".join(record["tags"])} for record in tasks)
+            writer = csv.DictWriter(out, fieldnames=TASK_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(tasks)
+        else:
+            out.writelines(encode_json(task) + "\n" for task in tasks)
+    
+    @timed("list")
+    def list_tasks(self, status_filter=None, sort=None, limit=None, offset=0, after=None,
+                   fmt="text", task_filter=None):
+        """Görevleri listele (sort verilirse SORT_ORDERS'daki sıraya göre).
+
+        Görevler liste kurulmadan akış halinde üretilir ve çıktıya büyük
+        parçalar halinde yazılır; ilk satırın gelme süresi ve bellek kullanımı
+        liste boyutundan bağımsızdır. after, önceki sayfanın son görevinin
+        ID'sidir; liste o görevden sonra devam eder. fmt: "text" (ayrıntılı),
+        "compact" (görev başına bir satır) ya da "jsonl". task_filter
+        (TaskFilter) verilirse durum dışındaki ölçütler bit eşlem
+        indeksinden süzülür.
+        Listelenen görev sayısını döndürür (cursor bulunamazsa None).
+        """
+        if task_filter is None:
+            task_filter = TaskFilter(status_filter or None)
+        status_filter = task_filter.status
+        if fmt == "text" and not len(self.storage):
             print("Henuz gorev bulunmuyor.")
+            return 0
+        
+        bits = task_filter.select(self.storage) if task_filter.needs_index() else None
+        try:
+            tasks = self.iter_listing(status_filter, sort, after, bits)
+        except KeyError:
+            print(f"Gorev bulunamadi: ID {after}")
+            return None
+        tasks = islice(tasks, offset, None if limit is None else offset + limit + 1)
+        
+        if fmt == "text":
+            if after is None:
+                # Başlıktaki sayı artımlı istatistiklerden ya da eşlemin bit
+                # sayısından alınır
+                if bits is not None:
+                    total = bits.bit_count()
+                    if not total:
+                        print("Suzgece uyan gorev bulunamadi.")
+                        return 0
+                else:
+                    stats = self.storage.stats
+                    total = stats.total if status_filter is None else stats.by_status.get(status_filter, 0)
+                    if not total:
+                        print(f"{status_filter} durumunda gorev bulunamadi.")
+                        return 0
+                shown = max(0, total - offset)
+                if limit is not None:
+                    shown = min(limit, shown)
+                print(f"\nGorevler ({shown} adet):")
+            else:
+                print("\nGorevler:")
+            print("-" * 80)
+        
+        format_line = LIST_FORMATS[fmt]
+        out = sys.stdout
+        chunk = []
+        size = 0
+        count = 0
+        last = None
+        more = False
+        for task in tasks:
+            if limit is not None and count == limit:
+                # Bir görev fazla okundu: devamı var
+                more = True
+                break
+            line = format_line(task)
+            chunk.append(line)
+            size += len(line)
+            count += 1
+            last = task
+            if size >= OUTPUT_CHUNK:
+                out.write("".join(chunk))
+                chunk = []
+                size = 0
+        out.write("".join(chunk))
+        if more and last is not None:
+            out.flush()
+            print(f"Devam etmek icin: --after {last.id}", file=sys.stderr)
+        return count
+    
+    def iter_listing(self, status_filter=None, sort=None, after=None, bits=None):
+        """Listelenecek görevleri sırayla ve tembel olarak üret.
+
+        bits verilirse yalnızca bu eşlemdeki görevler üretilir. after ID'li
+        görev sıralı görünümde bulunamazsa KeyError yükseltir.
+        """
+        storage = self.storage
+        if not sort:
+            if bits is not None:
+                # Eşlemin bitleri zaten ID sırasındadır
+                return (storage.get(task_id) for task_id in bitmap_ids(bits, after))
+            return storage.iter_tasks(status_filter, after=after)
+        index = storage.index(SORT_ORDERS[sort])
+        start = None
+        if after is not None:
+            task = storage.get(after)
+            if task is None:
+                raise KeyError(after)
+            start = index.key(task)
+        keys = index.keys(status_filter, start)
+        if bits is not None:
+            wanted = set(bitmap_ids(bits))
+            keys = (key for key in keys if key[-1] in wanted)
+        return (storage.get(key[-1]) for key in keys)
+    
+    @timed("search")
+    def search_tasks(self, query, limit=None):
+        """Başlık ve açıklamada ara (Türkçe harf duyarsız, önek eşleşmeli)"""
+        task_ids = self.storage.index(SearchIndex).search(query, limit)
+        if not task_ids:
+            print(f"'{query}' icin gorev bulunamadi.")
             return
         
-        filtered_tasks = self.tasks
-        if status_filter:
-            filtered_tasks = [task for task in self.tasks if task["status"] == status_filter]
+        print(f"\nArama sonuclari ({len(task_ids)} adet):")
+        print("-" * 80)
         
-        if not filtered_tasks:
-            print(f"{status_filter} durumunda gorev bulunamadi.")
+        for task_id in task_ids:
+            self.print_task(self.storage.get(task_id))
+    
+    @timed("next")
+    def next_tasks(self, count=5):
+        """Sıradaki bekleyen görevler: önce yüksek öncelik, sonra en eski"""
+        task_ids = self.storage.index(PriorityOrder).first("bekliyor", count)
+        if not task_ids:
+            print("Bekleyen gorev yok.")
             return
         
-        print(f"\nGorevler ({len(filtered_tasks)} adet):")
+        print(f"\nSiradaki gorevler ({len(task_ids)} adet):")
         print("-" * 80)
         
-        for task in filtered_tasks:
-            status_icon = "[TAMAMLANDI]" if task["status"] == "tamamlandı" else "[BEKLIYOR]"
-            priority_icon = {
-                "düşük": "[DUSUK]",
-                "orta": "[ORTA]", 
-                "yüksek": "[YUKSEK]"
-            }.get(task["priority"], "[ORTA]")
-            
-            print(f"{status_icon} {priority_icon} {task['id']}. {task['title']}")
-            if task['description']:
-                print(f"   Aciklama: {task['description']}")
-            print(f"   Olusturulma: {task['created_at']}")
-            if task['completed_at']:
-                print(f"   Tamamlanma: {task['completed_at']}")
-            print()
+        for task_id in task_ids:
+            self.print_task(self.storage.get(task_id))
+    
+    @timed("due")
+    def due_tasks(self, days=DEFAULT_DUE_DAYS, overdue_only=False):
+        """Süresi geçmiş ve `days` gün içinde bitecek bekleyen görevler.
+
+        Görevler bitiş zamanı indeksinden sırayla okunur; ufkun ötesine
+        geçilince durulur.
+        """
+        now = current_time()
+        horizon = now - 1 if overdue_only else now + days * 24 * 60 * 60
+        overdue = []
+        upcoming = []
+        for _, due_at, task_id in self.storage.index(DueOrder).range_keys(end=horizon,
+                                                                           status="bekliyor"):
+            (overdue if due_at < now else upcoming).append(task_id)
+        
+        if not overdue and not upcoming:
+            print("Gecikmis gorev yok." if overdue_only else "Gecikmis ya da yaklasan gorev yok.")
+            return
+        
+        for title, task_ids in ((f"Gecikmis gorevler ({len(overdue)} adet):", overdue),
+                                (f"Yaklasan gorevler ({days} gun, {len(upcoming)} adet):",
+                                 upcoming)):
+            if not task_ids:
+                continue
+            print(f"\n{title}")
+            print("-" * 80)
+            for task_id in task_ids:
+                self.print_task(self.storage.get(task_id))
+    
+    @timed("report")
+    def productivity_report(self, days=DEFAULT_REPORT_DAYS, weeks=DEFAULT_REPORT_WEEKS):
+        """Günlük ve haftalık tamamlanan görevler, açık iş eğilimi ve ortanca süre.
+
+        Sayaçlar artımlı güncellenen verimlilik indeksinden okunur.
+        """
+        report = self.storage.index(ProductivityIndex).report(days, weeks)
+        print("\nVerimlilik raporu:")
+        print("-" * 50)
+        print(f"Tamamlanan gorev: {report['completed']}")
+        print(f"Ortanca tamamlanma suresi: {format_duration(report['median_duration'])}")
+        print(f"Acik is: {report['backlog']}")
+        
+        if report["daily"]:
+            print(f"\nSon {days} gun (eklenen / tamamlanan):")
+            for day, created, completed in report["daily"]:
+                print(f"   {date.fromordinal(day).isoformat()}  {created:>4} / {completed:<4} "
+                      f"{'#' * min(completed, 40)}")
+        
+        if report["weekly"]:
+            print(f"\nSon {weeks} hafta (eklenen / tamamlanan / hafta sonunda acik):")
+            for start, created, completed, backlog in report["weekly"]:
+                print(f"   {date.fromordinal(start).isoformat()} haftasi  "
+                      f"{created:>5} / {completed:>5} / {backlog:>6}")
+    
+    def list_tags(self):
+        """Kullanılan etiketleri görev sayılarıyla listele"""
+        tags = self.storage.index(FilterIndex).tags()
+        if not tags:
+            print("Etiketli gorev yok.")
+            return
+        
+        print("\nEtiketler:")
+        print("-" * 30)
+        for tag, count in sorted(tags.items(), key=lambda item: (-item[1], item[0])):
+            print(f"   #{tag}: {count} gorev")
+    
+    def print_task(self, task):
+        """Tek bir görevi ayrıntılarıyla yazdır"""
+        sys.stdout.write(format_task(task))
     
     def complete_task(self, task_id):
         """Görevi tamamla"""
-        for task in self.tasks:
-            if task["id"] == task_id:
-                if task["status"] == "tamamlandı":
-                    print(f"Gorev zaten tamamlanmis: {task['title']}")
-                    return
-                
-                task["status"] = "tamamlandı"
-                task["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self.save_tasks()
-                print(f"Gorev tamamlandi: {task['title']}")
+        task = self.storage.get(task_id)
+        if task:
+            if task.status == "tamamlandı":
+                print(f"Gorev zaten tamamlanmis: {task.title}")
                 return
+            
+            spawned = complete_and_repeat(self.storage, task)[1]
+            print(f"Gorev tamamlandi: {task.title}")
+            if spawned is not None:
+                print(f"Sonraki tekrar eklendi: ID {spawned.id}, "
+                      f"bitis {format_time(spawned.due_at)}")
+            return
         
         print(f"Gorev bulunamadi: ID {task_id}")
     
     def delete_task(self, task_id):
         """Görevi sil"""
-        for i, task in enumerate(self.tasks):
-            if task["id"] == task_id:
-                deleted_task = self.tasks.pop(i)
-                self.save_tasks()
-                print(f"Gorev silindi: {deleted_task['title']}")
-                return
+        deleted_task = self.storage.delete(task_id)
+        if deleted_task:
+            print(f"Gorev silindi: {deleted_task.title}")
+            return
         
         print(f"Gorev bulunamadi: ID {task_id}")
     
-    def edit_task(self, task_id, new_title=None, new_description=None, new_priority=None):
-        """Görevi düzenle"""
-        for task in self.tasks:
-            if task["id"] == task_id:
-                if new_title:
-                    task["title"] = new_title
-                if new_description:
-                    task["description"] = new_description
-                if new_priority:
-                    task["priority"] = new_priority
-                
-                self.save_tasks()
-                print(f"Gorev guncellendi: {task['title']}")
-                return
+    def edit_task(self, task_id, new_title=None, new_description=None, new_priority=None,
+                  new_due=None, new_recurrence=None, new_tags=None):
+        """Görevi düzenle; bitiş zamanı, tekrar ya da etiketler "yok" verilirse kaldırılır"""
+        fields = {}
+        if new_title:
+            fields["title"] = new_title
+        if new_description:
+            fields["description"] = new_description
+        if new_priority:
+            fields["priority"] = new_priority
+        if new_due:
+            fields["due_at"] = None if new_due == CLEAR else new_due
+        if new_recurrence:
+            fields["recurrence"] = None if new_recurrence == CLEAR else new_recurrence
+        if new_tags:
+            fields["tags"] = () if new_tags == CLEAR else parse_tags(new_tags)
+        
+        task = self.storage.update(task_id, **fields)
+        if task:
+            print(f"Gorev guncellendi: {task.title}")
+            return
         
         print(f"Gorev bulunamadi: ID {task_id}")
     
-    def get_statistics(self):
-        """İstatistikleri göster"""
-        total = len(self.tasks)
-        completed = len([task for task in self.tasks if task["status"] == "tamamlandı"])
-        pending = total - completed
-        
-        print("\nIstatistikler:")
-        print("-" * 30)
-        print(f"Toplam gorev: {total}")
-        print(f"Tamamlanan: {completed}")
-        print(f"Bekleyen: {pending}")
-        
-        if total > 0:
-            completion_rate = (completed / total) * 100
-            print(f"Tamamlanma orani: %{completion_rate:.1f}")
-        
-        # Öncelik dağılımı
-        priorities = {}
-        for task in self.tasks:
-            priority = task["priority"]
-            priorities[priority] = priorities.get(priority, 0) + 1
-        
-        if priorities:
-            print("\nOncelik dagilimi:")
-            for priority, count in priorities.items():
-                print(f"   {priority}: {count} gorev")
+    @timed("stats")
+    def get_statistics(self, all_time=False):
+        """İstatistikleri göster (all_time ile arşivdeki görevler de sayılır)"""
+        stats = self.storage.stats
+        if all_time:
+            combined = TaskStats()
+            combined.merge(stats)
+            combined.merge(self.archive.stats())
+            stats = combined
+        print_statistics(stats, "Istatistikler (tum zamanlar)" if all_time else "Istatistikler")
     
     def show_menu(self):
         """Ana menüyü göster"""
@@ -178,8 +639,8 @@ class TodoApp:
                     continue
                 
                 description = input("Aciklama (opsiyonel): ").strip()
-                priority = input("Oncelik (dusuk/orta/yuksek) [orta]: ").strip().lower()
-                if priority not in ["düşük", "orta", "yüksek"]:
+                priority = normalize_choice(input("Oncelik (dusuk/orta/yuksek) [orta]: "))
+                if priority not in PRIORITIES:
                     priority = "orta"
                 
                 self.add_task(title, description, priority)
@@ -214,9 +675,9 @@ class TodoApp:
                     task_id = int(input("Duzenlenecek gorevin ID'si: "))
                     new_title = input("Yeni baslik (degistirmek istemiyorsaniz bos birakin): ").strip()
                     new_description = input("Yeni aciklama (degistirmek istemiyorsaniz bos birakin): ").strip()
-                    new_priority = input("Yeni oncelik (dusuk/orta/yuksek) (degistirmek istemiyorsaniz bos birakin): ").strip().lower()
+                    new_priority = normalize_choice(input("Yeni oncelik (dusuk/orta/yuksek) (degistirmek istemiyorsaniz bos birakin): "))
                     
-                    if new_priority and new_priority not in ["düşük", "orta", "yüksek"]:
+                    if new_priority and new_priority not in PRIORITIES:
                         print("Gecersiz oncelik!")
                         continue
                     
@@ -236,10 +697,386 @@ class TodoApp:
             
             input("\nDevam etmek için Enter'a basın...")
 
-if __name__ == "__main__":
-    app = TodoApp()
+def build_parser():
+    """Komut satırı argümanlarını tanımla"""
+    parser = argparse.ArgumentParser(
+        description="To Do List uygulamasi. Komut verilmezse etkilesimli menu acilir.")
+    parser.add_argument("-f", "--file", default="tasks.json",
+                        help="Gorev dosyasi; .db/.sqlite uzantisi SQLite kullanir (varsayilan: tasks.json)")
+    parser.add_argument("-w", "--workspace", metavar="KLASOR",
+                        help="Calisma alani: KLASOR'deki adlandirilmis listeler (--file yerine)")
+    parser.add_argument("-l", "--list", metavar="AD",
+                        help="Calisma alanindaki liste (varsayilan: calisma alaninin varsayilan listesi)")
+    parser.add_argument("--migrate-from", metavar="KAYNAK",
+                        help="KAYNAK dosyadaki gorevleri --file ile verilen bos depoya tasi ve cik")
+    parser.add_argument("--profile", action="store_true",
+                        help="Cikista islem surelerinin ve sayaclarin ozetini standart hataya yaz")
+    parser.add_argument("--profile-output", metavar="DOSYA",
+                        help="Olcumleri DOSYA'ya da kaydet: .json uzantisi Chrome trace, "
+                             "digerleri cProfile (pstats) ciktisi")
+    commands = parser.add_subparsers(dest="command", metavar="KOMUT")
+    
+    add = commands.add_parser("add", help="Gorev ekle")
+    add.add_argument("title")
+    add.add_argument("-d", "--description", default="")
+    add.add_argument("-p", "--priority", default="orta", type=normalize_choice, choices=PRIORITIES)
+    add.add_argument("--due", type=due_argument, metavar="TARIH",
+                     help="Bitis zamani: YYYY-MM-DD (gun sonu), 'YYYY-MM-DD HH:MM', bugun, yarin")
+    add.add_argument("--repeat", type=normalize_choice, choices=list(RECURRENCES),
+                     help="Tamamlaninca sonraki ornegi ekle")
+    add.add_argument("--tags", default="", help="Virgulle ayrilmis etiketler (ornek: is,rapor)")
+    add.add_argument("--check-duplicates", action="store_true",
+                     help="Ayni ya da benzer baslikli bekleyen gorev varsa uyar")
+    
+    complete = commands.add_parser("complete", help="Gorev(ler)i tamamla")
+    complete.add_argument("ids", type=int, nargs="+", metavar="ID")
+    
+    delete = commands.add_parser("delete", help="Gorev(ler)i sil (onay sorulmaz)")
+    delete.add_argument("ids", type=int, nargs="+", metavar="ID")
+    
+    edit = commands.add_parser("edit", help="Gorevi duzenle")
+    edit.add_argument("id", type=int)
+    edit.add_argument("--title")
+    edit.add_argument("--description")
+    edit.add_argument("--priority", type=normalize_choice, choices=PRIORITIES)
+    edit.add_argument("--due", type=due_argument, metavar="TARIH",
+                      help="Yeni bitis zamani ('yok' kaldirir)")
+    edit.add_argument("--repeat", type=normalize_choice, choices=[*RECURRENCES, CLEAR],
+                      help="Yeni tekrar kurali ('yok' kaldirir)")
+    edit.add_argument("--tags", help="Yeni etiketler, virgulle ayrilmis ('yok' kaldirir)")
+    
+    list_parser = commands.add_parser("list", help="Gorevleri listele")
+    list_parser.add_argument("--status", type=normalize_choice, choices=STATUSES)
+    list_parser.add_argument("--priority", type=normalize_choice, choices=PRIORITIES)
+    list_parser.add_argument("--tag", action="append", default=[], metavar="ETIKET",
+                             help="Etiketli gorevler; birden cok verilirse hepsini tasiyanlar")
+    list_parser.add_argument("--any-tag", action="store_true",
+                             help="--tag etiketlerinden herhangi birini tasiyanlar")
+    list_parser.add_argument("--since", type=day_argument, metavar="TARIH",
+                             help="Bu tarihte ya da sonra olusturulanlar (YYYY-MM-DD)")
+    list_parser.add_argument("--until", type=lambda value: day_argument(value, end=True),
+                             metavar="TARIH", help="Bu tarihte ya da once olusturulanlar")
+    list_parser.add_argument("--created", type=period_argument, metavar="DONEM",
+                             help="Bu donemde olusturulanlar (ornek: bu-hafta, 2024-08, "
+                                  "2024-08-01..2024-08-15)")
+    list_parser.add_argument("--completed", type=period_argument, metavar="DONEM",
+                             help="Bu donemde tamamlananlar (ornek: bu-hafta, gecen-ay)")
+    list_parser.add_argument("--sort", choices=list(SORT_ORDERS),
+                             help="Siralama (varsayilan: ekleme sirasi)")
+    list_parser.add_argument("--limit", type=int, help="En fazla bu kadar gorev listele")
+    list_parser.add_argument("--offset", type=int, default=0, help="Bastan bu kadar gorevi atla")
+    list_parser.add_argument("--after", type=int, metavar="ID",
+                             help="Onceki sayfanin son gorevinden sonra devam et")
+    list_parser.add_argument("--format", choices=list(LIST_FORMATS), default="text",
+                             help="text: ayrintili, compact: gorev basina bir satir, "
+                                  "jsonl: JSON-lines")
+
+    next_parser = commands.add_parser("next", help="Siradaki bekleyen gorevleri goster")
+    next_parser.add_argument("-n", "--count", type=int, default=5,
+                             help="Gosterilecek gorev sayisi (varsayilan: 5)")
+    
+    commands.add_parser("tags", help="Kullanilan etiketleri listele")
+    
+    due = commands.add_parser("due", help="Gecikmis ve yaklasan bekleyen gorevleri goster")
+    due.add_argument("--days", type=int, default=DEFAULT_DUE_DAYS,
+                     help=f"Bu kadar gun icinde bitecekler de gosterilir "
+                          f"(varsayilan: {DEFAULT_DUE_DAYS})")
+    due.add_argument("--overdue", action="store_true", help="Yalnizca gecikmis gorevler")
+    
+    report = commands.add_parser("report", help="Verimlilik raporu: gunluk/haftalik tamamlanan, "
+                                                "acik is egilimi, ortanca sure")
+    report.add_argument("--days", type=int, default=DEFAULT_REPORT_DAYS,
+                        help=f"Gunluk dokumdeki gun sayisi (varsayilan: {DEFAULT_REPORT_DAYS})")
+    report.add_argument("--weeks", type=int, default=DEFAULT_REPORT_WEEKS,
+                        help=f"Haftalik egilimdeki hafta sayisi (varsayilan: {DEFAULT_REPORT_WEEKS})")
+    
+    stats = commands.add_parser("stats", help="Istatistikleri goster")
+    stats.add_argument("--all", action="store_true", dest="all_time",
+                       help="Arsivdeki gorevleri de say")
+    stats.add_argument("--all-lists", action="store_true",
+                       help="Calisma alanindaki tum listelerin istatistikleri")
+    
+    search = commands.add_parser("search", help="Baslik ve aciklamada ara")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int)
+    search.add_argument("--all-lists", action="store_true",
+                        help="Calisma alanindaki tum listelerde ara")
+    
+    lists = commands.add_parser("lists", help="Calisma alanindaki listeleri goster")
+    lists.add_argument("--add", metavar="AD", help="Yeni liste olustur")
+    lists.add_argument("--storage", choices=[".json", ".tdb", ".db"], default=".json",
+                       help="Yeni listenin depo bicimi (dosya uzantisi; varsayilan: .json)")
+    lists.add_argument("--default", metavar="AD", help="Varsayilan listeyi degistir")
+    
+    bulk = commands.add_parser(
+        "bulk", help="Standart girdiden (CSV veya JSON-lines) toplu ekle/tamamla/sil")
+    bulk.add_argument("action", choices=["add", "complete", "delete"])
+    bulk.add_argument("--format", choices=["csv", "jsonl"],
+                      help="Girdi bicimi (varsayilan: ilk satira bakarak belirlenir)")
+    bulk.add_argument("--keep-duplicates", action="store_true",
+                      help="add icin: ayni ya da benzer basliktaki gorevleri de ekle")
+    
+    archive = commands.add_parser(
+        "archive", help="Eski tamamlanmis gorevleri arsivle, arsivi listele ya da "
+                        "otomatik arsivlemeyi ayarla")
+    archive.add_argument("action", choices=["run", "list", "auto", "off"],
+                         help="run: simdi arsivle, list: arsivi listele, "
+                              "auto: otomatik arsivlemeyi ac, off: kapat")
+    archive.add_argument("--days", type=int,
+                         help=f"Bu kadar gunden once tamamlananlar arsivlenir "
+                              f"(varsayilan: ayarli deger ya da {DEFAULT_ARCHIVE_DAYS})")
+    archive.add_argument("--limit", type=int, help="list icin en fazla gorev sayisi")
+
+    export = commands.add_parser("export", help="Gorevleri standart ciktiya akis halinde yaz")
+    export.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    return parser
+
+def list_workspace(workspace):
+    """Çalışma alanındaki listeleri görev sayılarıyla göster"""
+    names = workspace.names()
+    if not names:
+        print("Calisma alaninda liste yok.")
+        return
+    default = workspace.default_list()
+    stats = workspace.stats()
+    print(f"\nListeler ({len(names)} adet):")
+    print("-" * 50)
+    for name in names:
+        list_stats = stats.get(name)
+        counts = (f"{list_stats.total} gorev, {list_stats.pending} bekleyen"
+                  if list_stats is not None else "bos")
+        print(f"{'*' if name == default else ' '} {name} ({counts})")
+
+def workspace_statistics(workspace, all_time=False):
+    """Tüm listelerin istatistikleri: liste başına toplamlar ve birleşik özet"""
+    stats = workspace.stats()
+    if all_time:
+        for name in stats:
+            archive = TaskArchive(workspace.path(name))
+            stats[name].merge(archive.stats())
+    total = TaskStats()
+    print("\nListeler:")
+    print("-" * 30)
+    for name in sorted(stats):
+        total.merge(stats[name])
+        print(f"{name}: {stats[name].total} gorev, {stats[name].pending} bekleyen")
+    print_statistics(total, "Tum listeler (tum zamanlar)" if all_time else "Tum listeler")
+
+def search_workspace(workspace, query, limit=None):
+    """Tüm listelerde ara; sonuçlar liste adıyla gruplanır"""
+    matches = workspace.search(query, limit)
+    if not matches:
+        print(f"'{query}' icin hicbir listede gorev bulunamadi.")
+        return
+    
+    print(f"\nArama sonuclari ({len(matches)} adet):")
+    current = None
+    for name, task in matches:
+        if name != current:
+            current = name
+            print(f"\n[{name}]")
+            print("-" * 80)
+        sys.stdout.write(format_task(task))
+
+def run_workspace_command(workspace, args):
+    """Tek bir listeyi açmayan çalışma alanı komutları; başka komutsa None"""
+    if args.command == "lists":
+        try:
+            if args.add:
+                workspace.create(args.add, args.storage)
+                print(f"Liste olusturuldu: {args.add}")
+            if args.default:
+                workspace.set_default(args.default)
+        except ValueError as e:
+            print(e)
+            return 1
+        except KeyError:
+            print(f"Liste bulunamadi: {args.default}")
+            return 1
+        list_workspace(workspace)
+    elif args.command == "stats" and args.all_lists:
+        workspace_statistics(workspace, args.all_time)
+    elif args.command == "search" and args.all_lists:
+        search_workspace(workspace, args.query, args.limit)
+    else:
+        return None
+    return 0
+
+def run_command(app, args):
+    """Etkileşimsiz komutu çalıştır; çıkış kodunu döndür"""
+    if args.command == "add":
+        if args.due == CLEAR:
+            print("Gecersiz --due")
+            return 1
+        app.add_task(args.title.strip(), args.description.strip(), args.priority,
+                     args.due, args.repeat, parse_tags(args.tags), args.check_duplicates)
+    elif args.command == "complete":
+        return 1 if app.complete_tasks(args.ids) else 0
+    elif args.command == "delete":
+        return 1 if app.delete_tasks(args.ids) else 0
+    elif args.command == "edit":
+        if app.storage.get(args.id) is None:
+            print(f"Gorev bulunamadi: ID {args.id}")
+            return 1
+        app.edit_task(args.id, args.title, args.description, args.priority,
+                      args.due, args.repeat, args.tags)
+    elif args.command == "list":
+        if (args.limit is not None and args.limit < 0) or args.offset < 0:
+            print("Gecersiz --limit/--offset")
+            return 1
+        since, until = args.since, args.until
+        if args.created:
+            if since is not None or until is not None:
+                print("--created, --since/--until ile birlikte kullanilamaz")
+                return 1
+            since, until = args.created
+        completed_since, completed_until = args.completed or (None, None)
+        task_filter = TaskFilter(args.status, args.priority, parse_tags(args.tag), args.any_tag,
+                                 since, until, completed_since, completed_until)
+        count = app.list_tasks(args.status, args.sort, args.limit, args.offset, args.after,
+                               args.format, task_filter)
+        return 1 if count is None else 0
+    elif args.command == "next":
+        app.next_tasks(args.count)
+    elif args.command == "tags":
+        app.list_tags()
+    elif args.command == "due":
+        if args.days < 0:
+            print("Gecersiz gun sayisi")
+            return 1
+        app.due_tasks(args.days, args.overdue)
+    elif args.command == "report":
+        if args.days < 0 or args.weeks < 0:
+            print("Gecersiz gun/hafta sayisi")
+            return 1
+        app.productivity_report(args.days, args.weeks)
+    elif args.command == "stats":
+        app.get_statistics(args.all_time)
+    elif args.command == "search":
+        app.search_tasks(args.query, args.limit)
+    elif args.command == "bulk":
+        rows = read_rows(sys.stdin, args.format)
+        if args.action == "add":
+            app.import_tasks(rows, args.keep_duplicates)
+            return 0
+        try:
+            ids = [int(row["id"]) for row in rows]
+        except (KeyError, TypeError, ValueError):
+            print("Gecersiz girdi: her satirda sayisal bir 'id' alani olmali")
+            return 1
+        if args.action == "complete":
+            return 1 if app.complete_tasks(ids) else 0
+        return 1 if app.delete_tasks(ids) else 0
+    elif args.command == "archive":
+        days = args.days if args.days is not None else (app.archive.after_days
+                                                        or DEFAULT_ARCHIVE_DAYS)
+        if days < 0:
+            print("Gecersiz gun sayisi")
+            return 1
+        if args.action == "run":
+            app.archive_tasks(days)
+        elif args.action == "list":
+            app.list_archived(args.limit)
+        elif args.action == "auto":
+            app.archive.configure(days)
+            print(f"Otomatik arsivleme acik: {days} gunden once tamamlananlar gunde bir kez arsivlenir.")
+        else:
+            app.archive.configure(None)
+            print("Otomatik arsivleme kapatildi.")
+    elif args.command == "export":
+        app.export_tasks(sys.stdout, args.format)
+    return 0
+
+def start_profile(args):
+    """--profile/--profile-output verildiyse ölçümü başlat; sonuç çıkışta yazılır"""
+    if not (args.profile or args.profile_output):
+        return
+    output = args.profile_output
+    profiler = None
+    if output and not output.lower().endswith(".json"):
+        profiler = cProfile.Profile()
+    metrics.enable(trace=bool(output) and profiler is None)
+    atexit.register(report_profile, profiler, output)
+    if profiler is not None:
+        profiler.enable()
+
+def report_profile(profiler, output):
+    """Ölçüm özetini standart hataya yaz, istenen profil dosyasını kaydet"""
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(output)
+    elif output:
+        metrics.write_trace(output)
+    print(metrics.summary(), file=sys.stderr)
+    if output:
+        print(f"Profil kaydedildi: {output}", file=sys.stderr)
+
+def run_output(command, *args):
+    """Çıktı üreten komutu çalıştır ve çıkış kodunu döndür.
+
+    Çıktıyı okuyan süreç erken kapanırsa (ör. `| head`) sessizce 0 döner.
+    """
+    try:
+        status = command(*args)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        status = 0
+    return status
+
+def main():
+    args = build_parser().parse_args()
+    start_profile(args)
+    
+    if args.workspace:
+        workspace = Workspace(args.workspace)
+        try:
+            status = run_output(run_workspace_command, workspace, args)
+            if status is not None:
+                sys.exit(status)
+            if args.list is None and args.command in READ_COMMANDS and not workspace.names():
+                print("Calisma alaninda liste yok.")
+                sys.exit(0)
+            # Yalnızca kullanılan liste açılır; boş çalışma alanının varsayılan
+            # listesi ilk yazan komutta (ya da menü açılırken) oluşturulur
+            args.file = workspace.path(args.list or workspace.default_list(),
+                                       create=args.list is None)
+        except KeyError:
+            print(f"Liste bulunamadi: {args.list} (olusturmak icin: lists --add {args.list})")
+            sys.exit(1)
+        except (ValueError, OSError) as e:
+            print(f"❌ Calisma alani okunamadi: {e}")
+            sys.exit(1)
+        finally:
+            workspace.close()
+    elif args.list or args.command == "lists" or getattr(args, "all_lists", False):
+        print("--list, --all-lists ve lists komutu --workspace ile kullanilir")
+        sys.exit(1)
+    
+    if args.migrate_from:
+        try:
+            count = migrate(args.migrate_from, args.file)
+        except (ValueError, OSError) as e:
+            print(f"❌ Tasima basarisiz: {e}")
+            sys.exit(1)
+        print(f"{count} gorev tasindi: {args.migrate_from} -> {args.file}")
+        return
+    
+    app = TodoApp(args.file)
+    if args.command:
+        try:
+            status = run_output(run_command, app, args)
+        finally:
+            app.storage.close()
+        sys.exit(status)
+    
     try:
         app.run()
     except KeyboardInterrupt:
         print("\nUygulama kapatiliyor...")
-        sys.exit(0) 
\ No newline at end of file
+        sys.exit(0)
+    finally:
+        app.storage.close()
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
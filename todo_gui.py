@@ -1,20 +1,60 @@
+import argparse
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
 import os
-from datetime import datetime
-from tkinter import scrolledtext
+from datetime import date
+from tkinter import scrolledtext, simpledialog
+from archive import TaskArchive, archive_completed
+from duplicates import find_duplicates
+from filters import TaskFilter, bitmap_ids, parse_day, parse_tags
+from instrumentation import metrics, timed
+from ordering import SORT_ORDERS, PriorityOrder
+from recurrence import RECURRENCES, complete_and_repeat, parse_due
+from reports import ProductivityIndex, format_duration
+from reminders import ReminderScheduler
+from storage import BackgroundWriter, CorruptDataError, open_storage
+from task import Task, current_time, format_time
+from task_view import VirtualTaskList
+from search import SearchIndex, matches
+from stats import TaskStats
+from watcher import FileWatcher
+from workspace import Workspace
+
+# Sıralama kutusundaki seçenekler ve karşılık gelen sıralama adları
+SORT_CHOICES = {"id": None, "öncelik": "oncelik", "tamamlanma": "tamamlanma", "bitiş": "bitis",
+                "başlık": "baslik"}
+
+# Tekrar kutusundaki seçenekler; "yok" tekrarsız görev
+RECURRENCE_CHOICES = ["yok", *RECURRENCES]
+
+# Öncelik süzgecindeki seçenekler
+PRIORITY_FILTER_CHOICES = ["tümü", "düşük", "orta", "yüksek"]
+
+# Liste değiştirilirken bellekte bırakılan, listeye özgü durum
+LIST_STATE = ("tasks_file", "storage", "archive", "changed_ids", "reloads", "reminders")
 
 class TodoGUI:
-    def __init__(self, root):
+    # Arşiv penceresinde gösterilen en fazla görev sayısı
+    ARCHIVE_LIMIT = 1000
+    
+    def __init__(self, root, tasks_file="tasks.json", workspace=None, list_name=None):
         self.root = root
-        self.root.title("To Do List Uygulamasi")
         self.root.geometry("800x600")
         self.root.configure(bg='#f0f0f0')
         
-        # Veri dosyası
-        self.tasks_file = "tasks.json"
-        self.tasks = self.load_tasks()
+        # Çalışma alanı verilirse tasks_file seçili listenin dosyasıdır; diğer
+        # listeler yalnızca seçildiklerinde açılır
+        self.workspace = workspace
+        self.list_name = list_name
+        # Daha önce açılıp bırakılan listeler: ad -> LIST_STATE değerleri
+        self.sessions = {}
+        # Kayıt hataları arka plan yazıcısından gelebilir; kuyrukla arayüz
+        # iş parçacığına aktarılır
+        self.save_errors = queue.Queue()
+        self.open_list(tasks_file)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.diagnostics_window = None
         
         # Ana stil
         style = ttk.Style()
@@ -22,25 +62,177 @@ class TodoGUI:
         
         self.create_widgets()
         self.refresh_task_list()
+        self.update_title()
+        self.poll_save_errors()
+        self.watcher = FileWatcher(self.root, self.storage.data_files(), self.on_file_change)
     
-    def load_tasks(self):
-        """JSON dosyasından görevleri yükle"""
-        if os.path.exists(self.tasks_file):
+    def open_list(self, tasks_file):
+        """Görev listesini aç: depo, arşiv, arka plan yazıcısı ve hatırlatmalar"""
+        # Veri dosyası
+        self.tasks_file = tasks_file
+        self.storage = open_storage(self.tasks_file, on_error=self.save_errors.put)
+        self.load_tasks()
+        # Otomatik arşivleme açıksa eski tamamlanmış görevler açılışta taşınır
+        self.archive = TaskArchive(self.tasks_file)
+        if self.archive.due():
+            archive_completed(self.storage, self.archive, self.archive.after_days)
+        self.writer = BackgroundWriter(self.storage)
+        # Diğer süreçlerden gelen değişiklikler yazıcı iş parçacığında da
+        # uygulanabilir; değişen ID'ler kuyrukla arayüze aktarılır
+        self.changed_ids = queue.Queue()
+        self.reloads = self.storage.reloads
+        self.storage.subscribe(self.on_task_change)
+        # Hatırlatmalar bitiş zamanı en yakın göreve kurulu tek zamanlayıcıyla
+        self.reminders = ReminderScheduler(self.root, self.storage.get, self.show_reminders)
+        self.build_reminders()
+    
+    @timed("switch_list")
+    def switch_list(self, name):
+        """Çalışma alanında başka bir listeye geç.
+
+        Bırakılan liste bekleyen yazımları diske aktarılıp indeksleriyle
+        birlikte bellekte tutulur; tekrar seçildiğinde yeniden yüklenmez,
+        yalnızca aradaki dış değişiklikler artımlı uygulanır.
+        """
+        if name == self.list_name:
+            return
+        self.watcher.close()
+        self.writer.close()
+        self.reminders.cancel()
+        self.sessions[self.list_name] = {attr: getattr(self, attr) for attr in LIST_STATE}
+        
+        self.list_name = name
+        session = self.sessions.pop(name, None)
+        if session is None:
+            self.open_list(self.workspace.path(name))
+        else:
+            for attr, value in session.items():
+                setattr(self, attr, value)
+            self.writer = BackgroundWriter(self.storage)
             try:
-                with open(self.tasks_file, 'r', encoding='utf-8') as file:
-                    return json.load(file)
-            except json.JSONDecodeError:
-                messagebox.showerror("Hata", "Görev dosyası bozuk. Yeni dosya oluşturuluyor.")
-                return []
-        return []
+                self.storage.refresh()
+            except (OSError, CorruptDataError) as e:
+                messagebox.showerror("Hata", f"Görevler yeniden okunamadı: {e}")
+            if self.storage.reloads != self.reloads:
+                self.reloads = self.storage.reloads
+                self.take_changed_ids()
+                self.build_reminders()
+            else:
+                # Boş güncelleme de durdurulan zamanlayıcıyı yeniden kurar
+                self.reminders.update(self.take_changed_ids())
+        
+        self.task_view.get_task = self.storage.get
+        self.refresh_task_list()
+        self.update_title()
+        self.watcher = FileWatcher(self.root, self.storage.data_files(), self.on_file_change)
+    
+    def create_list(self):
+        """Çalışma alanına yeni liste ekle ve ona geç"""
+        name = simpledialog.askstring("Yeni Liste", "Liste adı:", parent=self.root)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        try:
+            self.workspace.create(name)
+        except ValueError as e:
+            messagebox.showerror("Hata", f"Liste oluşturulamadı: {e}")
+            return
+        self.list_combo.configure(values=self.workspace.names())
+        self.list_var.set(name)
+        self.switch_list(name)
+    
+    def update_title(self):
+        """Pencere başlığında çalışma alanındaki liste adını göster"""
+        title = "To Do List Uygulamasi"
+        if self.list_name is not None:
+            title += f" - {self.list_name}"
+        self.root.title(title)
+    
+    def load_tasks(self):
+        """Görev deposunu aç (JSON dosyası + günlük ya da SQLite veritabanı)"""
+        try:
+            self.storage.load()
+        except CorruptDataError:
+            messagebox.showerror("Hata", "Görev dosyası bozuk. Yeni dosya oluşturuluyor.")
+            self.storage.reset()
     
     def save_tasks(self):
-        """Görevleri JSON dosyasına kaydet"""
+        """Görevleri tek bir anlık görüntü olarak kaydet (günlüğü sıkıştırır)"""
+        self.storage.compact()
+    
+    def report_save_error(self, error):
+        """Kayıt hatasını kullanıcıya bildir"""
+        messagebox.showerror("Hata", f"Görevler kaydedilemedi: {error}")
+    
+    def poll_save_errors(self):
+        """Arka plan yazıcısının bildirdiği hataları arayüzde göster"""
+        while True:
+            try:
+                error = self.save_errors.get_nowait()
+            except queue.Empty:
+                break
+            self.report_save_error(error)
+        self.root.after(250, self.poll_save_errors)
+    
+    def on_task_change(self, old, new):
+        """Depo dinleyicisi; herhangi bir iş parçacığından çağrılabilir"""
+        self.changed_ids.put((new or old).id)
+    
+    @timed("file_change")
+    def on_file_change(self):
+        """Görev dosyası değişti: diğer süreçlerin değişikliklerini uygula"""
         try:
-            with open(self.tasks_file, 'w', encoding='utf-8') as file:
-                json.dump(self.tasks, file, ensure_ascii=False, indent=2)
-        except Exception as e:
-            messagebox.showerror("Hata", f"Görevler kaydedilemedi: {e}")
+            self.storage.refresh()
+        except (OSError, CorruptDataError) as e:
+            messagebox.showerror("Hata", f"Görevler yeniden okunamadı: {e}")
+            return
+        
+        task_ids = self.take_changed_ids()
+        if self.storage.reloads != self.reloads:
+            # Veri baştan yüklendi; değişen görevler tek tek bilinmiyor
+            self.reloads = self.storage.reloads
+            self.refresh_task_list()
+            self.build_reminders()
+        elif task_ids:
+            # Yalnızca değişen görevlerin satırları güncellenir
+            self.task_view.patch(task_ids)
+            self.reminders.update(task_ids)
+            self.update_stats_bar()
+    
+    def take_changed_ids(self):
+        """Değişiklik kuyruğundaki görev ID'lerini boşalt"""
+        task_ids = set()
+        while True:
+            try:
+                task_ids.add(self.changed_ids.get_nowait())
+            except queue.Empty:
+                return task_ids
+    
+    def build_reminders(self):
+        """Hatırlatmaları bekleyen görevlerden baştan kur"""
+        with self.storage.lock:
+            self.reminders.build(self.storage.iter_tasks("bekliyor"))
+    
+    def show_reminders(self, tasks):
+        """Bitiş zamanı gelen görevleri bildir"""
+        lines = [f"{task.id}. {task.title} (bitiş: {format_time(task.due_at)})" for task in tasks]
+        self.root.bell()
+        messagebox.showwarning("Hatırlatma", "Bitiş zamanı gelen görevler:\n\n" + "\n".join(lines))
+    
+    def on_close(self):
+        """Bekleyen değişiklikleri yazıp pencereyi kapat"""
+        self.reminders.cancel()
+        self.watcher.close()
+        self.writer.close()
+        self.storage.close()
+        # Bırakılan listelerin yazıcıları geçişte kapatıldı; yalnızca depolar kalır
+        for session in self.sessions.values():
+            session["storage"].close()
+        if self.workspace is not None:
+            self.workspace.close()
+        while not self.save_errors.empty():
+            self.report_save_error(self.save_errors.get_nowait())
+        self.root.destroy()
     
     def create_widgets(self):
         """Widget'ları oluştur"""
@@ -74,9 +266,25 @@ class TodoGUI:
                                      values=["düşük", "orta", "yüksek"], state="readonly")
         priority_combo.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
         
+        # Bitiş zamanı ve tekrar
+        ttk.Label(left_frame, text="Bitiş (YYYY-AA-GG [SS:DD]):").grid(row=6, column=0, sticky=tk.W, pady=5)
+        self.due_entry = ttk.Entry(left_frame, width=30)
+        self.due_entry.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        
+        ttk.Label(left_frame, text="Tekrar:").grid(row=8, column=0, sticky=tk.W, pady=5)
+        self.recurrence_var = tk.StringVar(value="yok")
+        recurrence_combo = ttk.Combobox(left_frame, textvariable=self.recurrence_var,
+                                        values=RECURRENCE_CHOICES, state="readonly")
+        recurrence_combo.grid(row=9, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        
+        # Etiketler
+        ttk.Label(left_frame, text="Etiketler (virgülle):").grid(row=10, column=0, sticky=tk.W, pady=5)
+        self.tags_entry = ttk.Entry(left_frame, width=30)
+        self.tags_entry.grid(row=11, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        
         # Ekle butonu
         add_button = ttk.Button(left_frame, text="Görev Ekle", command=self.add_task)
-        add_button.grid(row=6, column=0, columnspan=2, pady=10)
+        add_button.grid(row=12, column=0, columnspan=2, pady=10)
         
         # Sağ panel - Görev listesi
         right_frame = ttk.LabelFrame(main_frame, text="Görevler", padding="10")
@@ -86,6 +294,18 @@ class TodoGUI:
         filter_frame = ttk.Frame(right_frame)
         filter_frame.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
         
+        # Liste seçici - çalışma alanı açıldıysa
+        if self.workspace is not None:
+            ttk.Label(filter_frame, text="Liste:").pack(side=tk.LEFT)
+            self.list_var = tk.StringVar(value=self.list_name)
+            self.list_combo = ttk.Combobox(filter_frame, textvariable=self.list_var,
+                                           values=self.workspace.names(), state="readonly", width=12)
+            self.list_combo.pack(side=tk.LEFT, padx=(5, 0))
+            self.list_combo.bind('<<ComboboxSelected>>',
+                                 lambda e: self.switch_list(self.list_var.get()))
+            ttk.Button(filter_frame, text="+", width=2,
+                       command=self.create_list).pack(side=tk.LEFT, padx=(2, 15))
+        
         ttk.Label(filter_frame, text="Filtre:").pack(side=tk.LEFT)
         self.filter_var = tk.StringVar(value="tümü")
         filter_combo = ttk.Combobox(filter_frame, textvariable=self.filter_var, 
@@ -94,36 +314,98 @@ class TodoGUI:
         filter_combo.pack(side=tk.LEFT, padx=(5, 0))
         filter_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_task_list())
         
+        # Arama - yazarken her tuşta değil, kısa bir duraksamadan sonra süzülür
+        ttk.Label(filter_frame, text="Ara:").pack(side=tk.LEFT, padx=(15, 0))
+        self.search_var = tk.StringVar()
+        self.search_job = None
+        search_entry = ttk.Entry(filter_frame, textvariable=self.search_var, width=25)
+        search_entry.pack(side=tk.LEFT, padx=(5, 0))
+        search_entry.bind('<KeyRelease>', self.schedule_search)
+        
+        # Sıralama - sıralı görünümler depodaki sıralı indekslerden okunur
+        ttk.Label(filter_frame, text="Sırala:").pack(side=tk.LEFT, padx=(15, 0))
+        self.sort_var = tk.StringVar(value="id")
+        sort_combo = ttk.Combobox(filter_frame, textvariable=self.sort_var,
+                                  values=list(SORT_CHOICES), state="readonly", width=12)
+        sort_combo.pack(side=tk.LEFT, padx=(5, 0))
+        sort_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_task_list())
+        
+        # Birleşik süzgeç - öncelik, etiketler ve oluşturulma tarihi aralığı
+        # bit eşlem indeksinden süzülür
+        filter_frame2 = ttk.Frame(right_frame)
+        filter_frame2.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(filter_frame2, text="Öncelik:").pack(side=tk.LEFT)
+        self.priority_filter_var = tk.StringVar(value="tümü")
+        priority_filter_combo = ttk.Combobox(filter_frame2, textvariable=self.priority_filter_var,
+                                             values=PRIORITY_FILTER_CHOICES, state="readonly", width=8)
+        priority_filter_combo.pack(side=tk.LEFT, padx=(5, 0))
+        priority_filter_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_task_list())
+        
+        ttk.Label(filter_frame2, text="Etiket:").pack(side=tk.LEFT, padx=(15, 0))
+        self.tag_filter_var = tk.StringVar()
+        tag_entry = ttk.Entry(filter_frame2, textvariable=self.tag_filter_var, width=15)
+        tag_entry.pack(side=tk.LEFT, padx=(5, 0))
+        tag_entry.bind('<KeyRelease>', self.schedule_search)
+        self.any_tag_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame2, text="Herhangi biri", variable=self.any_tag_var,
+                        command=self.refresh_task_list).pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Okunamayan tarih yok sayılır; yazım sürerken liste boşalmaz
+        ttk.Label(filter_frame2, text="Tarih:").pack(side=tk.LEFT, padx=(15, 0))
+        self.since_var = tk.StringVar()
+        self.until_var = tk.StringVar()
+        since_entry = ttk.Entry(filter_frame2, textvariable=self.since_var, width=11)
+        since_entry.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(filter_frame2, text="–").pack(side=tk.LEFT, padx=2)
+        until_entry = ttk.Entry(filter_frame2, textvariable=self.until_var, width=11)
+        until_entry.pack(side=tk.LEFT)
+        since_entry.bind('<KeyRelease>', self.schedule_search)
+        until_entry.bind('<KeyRelease>', self.schedule_search)
+        self.task_filter = TaskFilter()
+        
         # Görev listesi
-        self.task_tree = ttk.Treeview(right_frame, columns=("id", "title", "priority", "status"), 
+        self.task_tree = ttk.Treeview(right_frame,
+                                     columns=("id", "title", "priority", "status", "due", "tags"),
                                      show="headings", height=15)
-        self.task_tree.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.task_tree.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(right_frame, orient=tk.VERTICAL, command=self.task_tree.yview)
-        scrollbar.grid(row=1, column=3, sticky=(tk.N, tk.S))
-        self.task_tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar - yalnızca görünür satırlar oluşturulur, kaydırma sanal listeye bağlı
+        scrollbar = ttk.Scrollbar(right_frame, orient=tk.VERTICAL)
+        scrollbar.grid(row=2, column=3, sticky=(tk.N, tk.S))
+        self.task_view = VirtualTaskList(self.task_tree, scrollbar,
+                                         get_task=self.storage.get,
+                                         row_values=self.task_row_values,
+                                         matches=self.task_matches_filter)
         
         # Sütun başlıkları
         self.task_tree.heading("id", text="ID")
         self.task_tree.heading("title", text="Başlık")
         self.task_tree.heading("priority", text="Öncelik")
         self.task_tree.heading("status", text="Durum")
+        self.task_tree.heading("due", text="Bitiş")
+        self.task_tree.heading("tags", text="Etiketler")
         
         # Sütun genişlikleri
         self.task_tree.column("id", width=50)
         self.task_tree.column("title", width=200)
         self.task_tree.column("priority", width=80)
         self.task_tree.column("status", width=100)
+        self.task_tree.column("due", width=130)
+        self.task_tree.column("tags", width=120)
         
         # Butonlar
         button_frame = ttk.Frame(right_frame)
-        button_frame.grid(row=2, column=0, columnspan=3, pady=10)
+        button_frame.grid(row=3, column=0, columnspan=3, pady=10)
         
         ttk.Button(button_frame, text="Tamamla", command=self.complete_task).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Düzenle", command=self.edit_task).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Sil", command=self.delete_task).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Sıradaki", command=self.show_next_tasks).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="İstatistikler", command=self.show_statistics).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Rapor", command=self.show_report).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Arşiv", command=self.show_archive).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Tanılama", command=self.show_diagnostics).pack(side=tk.LEFT, padx=5)
         
         # Grid ağırlıkları
         self.root.columnconfigure(0, weight=1)
@@ -131,7 +413,12 @@ class TodoGUI:
         main_frame.columnconfigure(1, weight=1)
         main_frame.rowconfigure(1, weight=1)
         right_frame.columnconfigure(0, weight=1)
-        right_frame.rowconfigure(1, weight=1)
+        right_frame.rowconfigure(2, weight=1)
+        
+        # Durum çubuğu - istatistik özeti
+        self.stats_var = tk.StringVar()
+        stats_label = ttk.Label(main_frame, textvariable=self.stats_var, anchor=tk.W)
+        stats_label.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
     
     def add_task(self):
         """Yeni görev ekle"""
@@ -142,48 +429,142 @@ class TodoGUI:
         
         description = self.description_text.get("1.0", tk.END).strip()
         priority = self.priority_var.get()
+        try:
+            due_at = self.read_due(self.due_entry.get())
+        except ValueError:
+            messagebox.showerror("Hata", "Bitiş zamanı okunamadı! (YYYY-AA-GG, YYYY-AA-GG SS:DD, bugün, yarın)")
+            return
+        recurrence = self.recurrence_var.get()
+        
+        # Aynı ya da benzer başlıklı bekleyen görev varsa kullanıcıya sor
+        with self.storage.lock:
+            duplicates = find_duplicates(self.storage, title, "bekliyor")
+        if duplicates:
+            lines = [f"{duplicate.id}. {duplicate.title} (%{score * 100:.0f} benzer)"
+                     for score, duplicate in duplicates]
+            if not messagebox.askyesno("Benzer Görev", "Benzer bekleyen görevler var:\n\n"
+                                       + "\n".join(lines) + "\n\nYine de eklensin mi?"):
+                return
         
-        task = {
-            "id": len(self.tasks) + 1,
-            "title": title,
-            "description": description,
-            "priority": priority,
-            "status": "bekliyor",
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "completed_at": None
-        }
-        
-        self.tasks.append(task)
-        self.save_tasks()
-        self.refresh_task_list()
+        task = Task(self.storage.allocate_id(), title, description, priority,
+                    "bekliyor", created_at=current_time(), due_at=due_at,
+                    recurrence=None if recurrence == "yok" else recurrence,
+                    tags=parse_tags(self.tags_entry.get()))
+        
+        self.storage.add(task)
+        self.task_view.upsert(task)
+        self.reminders.update([task.id])
+        self.update_stats_bar()
         
         # Formu temizle
         self.title_entry.delete(0, tk.END)
         self.description_text.delete("1.0", tk.END)
         self.priority_var.set("orta")
+        self.due_entry.delete(0, tk.END)
+        self.recurrence_var.set("yok")
+        self.tags_entry.delete(0, tk.END)
         
         messagebox.showinfo("Başarılı", f"Görev eklendi: {title}")
     
+    def read_due(self, text):
+        """Bitiş kutusundaki metni zamana çevir (boşsa None)"""
+        text = text.strip()
+        return parse_due(text) if text else None
+    
+    @timed("refresh_list")
     def refresh_task_list(self):
-        """Görev listesini yenile"""
-        # Mevcut öğeleri temizle
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-        
-        # Filtre uygula
+        """Görev listesini filtreye göre baştan kur"""
+        task_filter = self.task_filter = self.current_filter()
+        status = task_filter.status
+        query = self.search_var.get()
+        order = SORT_CHOICES.get(self.sort_var.get())
+        # Diğer süreçlerden gelen değişiklikler indeksleri yazıcı iş
+        # parçacığında güncelleyebilir
+        with self.storage.lock:
+            bits = task_filter.select(self.storage) if task_filter.needs_index() else None
+        wanted = None if bits is None else set(bitmap_ids(bits))
+        if order is not None:
+            # Sıralı indeks değişikliklerle güncel tutulur; burada yalnızca
+            # sırası hazır ID'ler okunur, yeniden sıralama yapılmaz
+            with self.storage.lock:
+                index = self.storage.index(SORT_ORDERS[order])
+                ids = index.ids(status)
+                if query.strip():
+                    found = set(self.storage.index(SearchIndex).search(query))
+                    ids = [task_id for task_id in ids if task_id in found]
+            if wanted is not None:
+                ids = [task_id for task_id in ids if task_id in wanted]
+            self.task_view.set_ids(ids, sort_key=index.key)
+        elif query.strip():
+            with self.storage.lock:
+                ids = self.storage.index(SearchIndex).search(query)
+            if wanted is not None:
+                ids = [task_id for task_id in ids if task_id in wanted]
+            elif status is not None:
+                ids = [task_id for task_id in ids
+                       if self.storage.get(task_id).status == status]
+            self.task_view.set_ids(ids)
+        elif bits is not None:
+            # Eşlemin bitleri zaten ID sırasındadır
+            self.task_view.set_ids(bitmap_ids(bits))
+        else:
+            self.task_view.set_ids(self.storage.task_ids(status))
+        self.update_stats_bar()
+    
+    def schedule_search(self, event=None):
+        """Arama kutusundaki değişikliği kısa bir gecikmeyle uygula"""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(150, self.run_search)
+    
+    def run_search(self):
+        self.search_job = None
+        self.refresh_task_list()
+    
+    def selected_status(self):
+        """Filtrede seçili durum (tümü için None)"""
         filter_value = self.filter_var.get()
-        filtered_tasks = self.tasks
-        if filter_value != "tümü":
-            filtered_tasks = [task for task in self.tasks if task["status"] == filter_value]
-        
-        # Görevleri listele
-        for task in filtered_tasks:
-            self.task_tree.insert("", "end", values=(
-                task["id"],
-                task["title"],
-                task["priority"],
-                task["status"]
-            ))
+        return None if filter_value == "tümü" else filter_value
+    
+    def current_filter(self):
+        """Süzgeç kutularından birleşik süzgeci oluştur"""
+        priority = self.priority_filter_var.get()
+        return TaskFilter(self.selected_status(),
+                          None if priority == "tümü" else priority,
+                          parse_tags(self.tag_filter_var.get()),
+                          self.any_tag_var.get(),
+                          self.read_day(self.since_var.get()),
+                          self.read_day(self.until_var.get(), end=True))
+    
+    def read_day(self, text, end=False):
+        """Tarih kutusundaki metni zamana çevir (boş ya da okunamıyorsa None)"""
+        text = text.strip()
+        if not text:
+            return None
+        try:
+            return parse_day(text, end)
+        except ValueError:
+            return None
+    
+    def task_matches_filter(self, task):
+        """Görev mevcut filtreye uyuyor mu"""
+        if not self.task_filter.matches(task):
+            return False
+        query = self.search_var.get()
+        return not query.strip() or matches(task, query)
+    
+    def task_row_values(self, task):
+        """Görevin Treeview satırındaki değerleri"""
+        return (task.id, task.title, task.priority, task.status, format_time(task.due_at) or "",
+                " ".join("#" + tag for tag in task.tags))
+    
+    def update_stats_bar(self):
+        """Durum çubuğundaki istatistik özetini güncelle"""
+        stats = self.storage.stats
+        text = f"Toplam: {stats.total}   Tamamlanan: {stats.completed}   Bekleyen: {stats.pending}"
+        if stats.completion_rate is not None:
+            text += f"   Tamamlanma: %{stats.completion_rate:.1f}"
+        self.stats_var.set(text)
     
     def complete_task(self):
         """Görevi tamamla"""
@@ -195,18 +576,24 @@ class TodoGUI:
         item = self.task_tree.item(selected[0])
         task_id = item['values'][0]
         
-        for task in self.tasks:
-            if task["id"] == task_id:
-                if task["status"] == "tamamlandı":
-                    messagebox.showinfo("Bilgi", f"Görev zaten tamamlanmış: {task['title']}")
-                    return
-                
-                task["status"] = "tamamlandı"
-                task["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self.save_tasks()
-                self.refresh_task_list()
-                messagebox.showinfo("Başarılı", f"Görev tamamlandı: {task['title']}")
+        task = self.storage.get(task_id)
+        if task:
+            if task.status == "tamamlandı":
+                messagebox.showinfo("Bilgi", f"Görev zaten tamamlanmış: {task.title}")
                 return
+            
+            updated, spawned = complete_and_repeat(self.storage, task)
+            if updated:
+                self.task_view.upsert(updated)
+            message = f"Görev tamamlandı: {task.title}"
+            if spawned is not None:
+                # Tekrarlanan görevin sonraki örneği
+                self.task_view.upsert(spawned)
+                message += f"\n\nSonraki tekrar: {format_time(spawned.due_at)}"
+            self.reminders.update([task_id] + ([spawned.id] if spawned else []))
+            self.update_stats_bar()
+            messagebox.showinfo("Başarılı", message)
+            return
         
         messagebox.showerror("Hata", f"Görev bulunamadı: ID {task_id}")
     
@@ -222,13 +609,13 @@ class TodoGUI:
         task_title = item['values'][1]
         
         if messagebox.askyesno("Onay", f"Bu görevi silmek istediğinizden emin misiniz?\n\n{task_title}"):
-            for i, task in enumerate(self.tasks):
-                if task["id"] == task_id:
-                    deleted_task = self.tasks.pop(i)
-                    self.save_tasks()
-                    self.refresh_task_list()
-                    messagebox.showinfo("Başarılı", f"Görev silindi: {deleted_task['title']}")
-                    return
+            deleted_task = self.storage.delete(task_id)
+            if deleted_task:
+                self.task_view.remove(task_id)
+                self.reminders.update([task_id])
+                self.update_stats_bar()
+                messagebox.showinfo("Başarılı", f"Görev silindi: {deleted_task.title}")
+                return
             
             messagebox.showerror("Hata", f"Görev bulunamadı: ID {task_id}")
     
@@ -242,13 +629,7 @@ class TodoGUI:
         item = self.task_tree.item(selected[0])
         task_id = item['values'][0]
         
-        # Görevi bul
-        task = None
-        for t in self.tasks:
-            if t["id"] == task_id:
-                task = t
-                break
-        
+        task = self.storage.get(task_id)
         if not task:
             messagebox.showerror("Hata", f"Görev bulunamadı: ID {task_id}")
             return
@@ -260,38 +641,65 @@ class TodoGUI:
         """Düzenleme penceresi oluştur"""
         edit_window = tk.Toplevel(self.root)
         edit_window.title("Görev Düzenle")
-        edit_window.geometry("400x300")
+        edit_window.geometry("400x480")
         edit_window.transient(self.root)
         edit_window.grab_set()
         
         # Widget'lar
         ttk.Label(edit_window, text="Başlık:").grid(row=0, column=0, sticky=tk.W, padx=10, pady=5)
         title_entry = ttk.Entry(edit_window, width=40)
-        title_entry.insert(0, task["title"])
+        title_entry.insert(0, task.title)
         title_entry.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=10, pady=5)
         
         ttk.Label(edit_window, text="Açıklama:").grid(row=2, column=0, sticky=tk.W, padx=10, pady=5)
         desc_text = scrolledtext.ScrolledText(edit_window, width=40, height=6)
-        desc_text.insert("1.0", task["description"])
+        desc_text.insert("1.0", task.description)
         desc_text.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=10, pady=5)
         
         ttk.Label(edit_window, text="Öncelik:").grid(row=4, column=0, sticky=tk.W, padx=10, pady=5)
-        priority_var = tk.StringVar(value=task["priority"])
+        priority_var = tk.StringVar(value=task.priority)
         priority_combo = ttk.Combobox(edit_window, textvariable=priority_var, 
                                      values=["düşük", "orta", "yüksek"], state="readonly")
         priority_combo.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=10, pady=5)
         
+        ttk.Label(edit_window, text="Bitiş (YYYY-AA-GG [SS:DD]):").grid(row=6, column=0, sticky=tk.W, padx=10, pady=5)
+        due_entry = ttk.Entry(edit_window, width=40)
+        due_entry.insert(0, format_time(task.due_at) or "")
+        due_entry.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=10, pady=5)
+        
+        ttk.Label(edit_window, text="Tekrar:").grid(row=8, column=0, sticky=tk.W, padx=10, pady=5)
+        recurrence_var = tk.StringVar(value=task.recurrence or "yok")
+        recurrence_combo = ttk.Combobox(edit_window, textvariable=recurrence_var,
+                                        values=RECURRENCE_CHOICES, state="readonly")
+        recurrence_combo.grid(row=9, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=10, pady=5)
+        
+        ttk.Label(edit_window, text="Etiketler (virgülle):").grid(row=10, column=0, sticky=tk.W, padx=10, pady=5)
+        tags_entry = ttk.Entry(edit_window, width=40)
+        tags_entry.insert(0, ", ".join(task.tags))
+        tags_entry.grid(row=11, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=10, pady=5)
+        
         # Butonlar
         button_frame = ttk.Frame(edit_window)
-        button_frame.grid(row=6, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=12, column=0, columnspan=2, pady=20)
         
         def save_changes():
-            task["title"] = title_entry.get().strip()
-            task["description"] = desc_text.get("1.0", tk.END).strip()
-            task["priority"] = priority_var.get()
-            
-            self.save_tasks()
-            self.refresh_task_list()
+            try:
+                due_at = self.read_due(due_entry.get())
+            except ValueError:
+                messagebox.showerror("Hata", "Bitiş zamanı okunamadı!", parent=edit_window)
+                return
+            recurrence = recurrence_var.get()
+            updated = self.storage.update(task.id,
+                                          title=title_entry.get().strip(),
+                                          description=desc_text.get("1.0", tk.END).strip(),
+                                          priority=priority_var.get(),
+                                          due_at=due_at,
+                                          recurrence=None if recurrence == "yok" else recurrence,
+                                          tags=parse_tags(tags_entry.get()))
+            if updated:
+                self.task_view.upsert(updated)
+            self.reminders.update([task.id])
+            self.update_stats_bar()
             edit_window.destroy()
             messagebox.showinfo("Başarılı", "Görev güncellendi!")
         
@@ -300,42 +708,210 @@ class TodoGUI:
         
         edit_window.columnconfigure(0, weight=1)
     
+    def show_next_tasks(self):
+        """Sıradaki bekleyen görevleri göster"""
+        with self.storage.lock:
+            task_ids = self.storage.index(PriorityOrder).first("bekliyor", 5)
+        if not task_ids:
+            messagebox.showinfo("Sıradaki Görevler", "Bekleyen görev yok.")
+            return
+        
+        lines = []
+        for task_id in task_ids:
+            task = self.storage.get(task_id)
+            lines.append(f"{task.id}. {task.title} ({task.priority})")
+        messagebox.showinfo("Sıradaki Görevler", "\n".join(lines))
+    
     def show_statistics(self):
         """İstatistikleri göster"""
-        total = len(self.tasks)
-        completed = len([task for task in self.tasks if task["status"] == "tamamlandı"])
-        pending = total - completed
+        stats = self.storage.stats
         
         # Öncelik dağılımı
-        priorities = {}
-        for task in self.tasks:
-            priority = task["priority"]
-            priorities[priority] = priorities.get(priority, 0) + 1
+        priorities = stats.priorities()
         
         stats_text = f"""
 İSTATİSTİKLER
 {'='*30}
 
-Toplam Görev: {total}
-Tamamlanan: {completed}
-Bekleyen: {pending}
+Toplam Görev: {stats.total}
+Tamamlanan: {stats.completed}
+Bekleyen: {stats.pending}
 
 """
         
-        if total > 0:
-            completion_rate = (completed / total) * 100
-            stats_text += f"Tamamlanma Oranı: %{completion_rate:.1f}\n\n"
+        if stats.completion_rate is not None:
+            stats_text += f"Tamamlanma Oranı: %{stats.completion_rate:.1f}\n\n"
         
         if priorities:
             stats_text += "Öncelik Dağılımı:\n"
             for priority, count in priorities.items():
                 stats_text += f"  {priority}: {count} görev\n"
         
+        # Arşiv istatistikleri manifestten okunur; dilimler yüklenmez
+        archived = self.archive.stats()
+        if archived.total:
+            stats_text += f"\nArşivlenen: {archived.total} görev\n"
+            stats_text += f"Tüm zamanlar: {stats.total + archived.total} görev, "
+            stats_text += f"{stats.completed + archived.completed} tamamlanan\n"
+        
+        if self.workspace is not None:
+            # Diğer listeler süreç havuzunda okunur; açık listeler bellekten
+            loaded = {name: session["storage"] for name, session in self.sessions.items()}
+            loaded[self.list_name] = self.storage
+            lists = self.workspace.stats(loaded)
+            total = TaskStats()
+            stats_text += "\nTüm Listeler:\n"
+            for name in sorted(lists):
+                total.merge(lists[name])
+                stats_text += f"  {name}: {lists[name].total} görev, {lists[name].pending} bekleyen\n"
+            stats_text += f"  Toplam: {total.total} görev, {total.completed} tamamlanan\n"
+        
         messagebox.showinfo("İstatistikler", stats_text)
+    
+    @timed("report")
+    def show_report(self):
+        """Verimlilik raporu: günlük/haftalık tamamlanan, açık iş eğilimi, ortanca süre"""
+        # Sayaçlar ilk açılışta bir kez kurulur, sonra değişikliklerle güncellenir
+        with self.storage.lock:
+            report = self.storage.index(ProductivityIndex).report()
+        
+        window = tk.Toplevel(self.root)
+        window.title("Verimlilik Raporu")
+        window.geometry("560x460")
+        
+        text = scrolledtext.ScrolledText(window, width=70, height=24)
+        text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=10, pady=10)
+        duration = format_duration(report["median_duration"], ("gün", "saat", "dakika"))
+        text.insert(tk.END, f"Tamamlanan görev: {report['completed']}\n"
+                            f"Ortanca tamamlanma süresi: {duration}\n"
+                            f"Açık iş: {report['backlog']}\n\n")
+        text.insert(tk.END, "Günlük (eklenen / tamamlanan):\n")
+        for day, created, completed in report["daily"]:
+            text.insert(tk.END, f"  {date.fromordinal(day).strftime('%d.%m.%Y')}  "
+                                f"{created:>4} / {completed:<4} {'▇' * min(completed, 30)}\n")
+        text.insert(tk.END, "\nHaftalık (eklenen / tamamlanan / hafta sonunda açık):\n")
+        for start, created, completed, backlog in report["weekly"]:
+            text.insert(tk.END, f"  {date.fromordinal(start).strftime('%d.%m.%Y')} haftası  "
+                                f"{created:>5} / {completed:>5} / {backlog:>6}\n")
+        text.configure(state=tk.DISABLED)
+        
+        ttk.Button(window, text="Kapat", command=window.destroy).grid(row=1, column=0, pady=(0, 10))
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+    
+    def show_archive(self):
+        """Arşivlenen görevleri en son tamamlanandan başlayarak göster"""
+        tasks = list(self.archive.iter_tasks(self.ARCHIVE_LIMIT))
+        if not tasks:
+            messagebox.showinfo("Arşiv", "Arşivde görev yok.")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Arşiv")
+        window.geometry("640x400")
+        
+        text = scrolledtext.ScrolledText(window, width=80, height=20)
+        text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=10, pady=10)
+        for task in tasks:
+            text.insert(tk.END, f"{task.id}. {task.title} ({task.priority}) - "
+                                f"{format_time(task.completed_at)}\n")
+        if len(tasks) == self.ARCHIVE_LIMIT:
+            text.insert(tk.END, f"\n(Yalnızca son {self.ARCHIVE_LIMIT} görev gösteriliyor)\n")
+        text.configure(state=tk.DISABLED)
+        
+        ttk.Button(window, text="Kapat", command=window.destroy).grid(row=1, column=0, pady=(0, 10))
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+    
+    def show_diagnostics(self):
+        """İşlem sürelerini, sayaçları ve depo bilgilerini gösteren pencere"""
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.lift()
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Tanılama")
+        window.geometry("760x420")
+        self.diagnostics_window = window
+        
+        text = scrolledtext.ScrolledText(window, width=96, height=20, font=('Courier', 9))
+        text.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), padx=10, pady=10)
+        
+        def show():
+            text.configure(state=tk.NORMAL)
+            text.delete("1.0", tk.END)
+            text.insert("1.0", self.diagnostics_text())
+            text.configure(state=tk.DISABLED)
+        
+        def tick():
+            # Pencere açık kaldıkça saniyede bir güncellenir
+            if window.winfo_exists():
+                show()
+                window.after(1000, tick)
+        
+        def toggle():
+            if enabled_var.get():
+                metrics.enable()
+            else:
+                metrics.disable()
+            show()
+        
+        def reset():
+            metrics.reset()
+            show()
+        
+        enabled_var = tk.BooleanVar(value=metrics.enabled)
+        ttk.Checkbutton(window, text="Ölçüm açık", variable=enabled_var,
+                        command=toggle).grid(row=1, column=0, sticky=tk.W, padx=10, pady=(0, 10))
+        ttk.Button(window, text="Sıfırla", command=reset).grid(row=1, column=1, pady=(0, 10))
+        ttk.Button(window, text="Kapat", command=window.destroy).grid(row=1, column=2, pady=(0, 10))
+        
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+        tick()
+    
+    def diagnostics_text(self):
+        """Tanılama penceresinin içeriği"""
+        lines = [f"Depo: {type(self.storage).__name__} ({self.tasks_file})",
+                 f"Görev sayısı: {len(self.storage)}"]
+        if self.workspace is not None:
+            lines.append(f"Liste: {self.list_name} (bellekte {len(self.sessions)} liste daha)")
+        for path in self.storage.data_files():
+            if os.path.exists(path):
+                lines.append(f"  {os.path.basename(path)}: {os.path.getsize(path) / 1024:.1f} KB")
+        lines.append(f"Ölçüm: {'açık' if metrics.enabled else 'kapalı'}")
+        lines.append("")
+        lines.append(metrics.summary())
+        return "\n".join(lines)
 
 def main():
+    parser = argparse.ArgumentParser(description="To Do List uygulamasi (arayuz)")
+    parser.add_argument("-f", "--file", default="tasks.json",
+                        help="Gorev dosyasi; .db/.sqlite uzantisi SQLite kullanir (varsayilan: tasks.json)")
+    parser.add_argument("-w", "--workspace", metavar="KLASOR",
+                        help="Calisma alani: KLASOR'deki listeler arasinda gecis yapilabilir")
+    parser.add_argument("-l", "--list", metavar="AD", help="Acilista secilecek liste")
+    parser.add_argument("--profile", action="store_true",
+                        help="Islem surelerini acilistan itibaren olc (Tanilama penceresinde gorunur)")
+    args = parser.parse_args()
+    if args.profile:
+        metrics.enable()
+    
+    workspace = None
+    tasks_file = args.file
+    list_name = None
+    if args.workspace:
+        workspace = Workspace(args.workspace)
+        list_name = args.list or workspace.default_list()
+        try:
+            tasks_file = workspace.path(list_name, create=args.list is None)
+        except KeyError:
+            parser.error(f"Liste bulunamadi: {list_name}")
+    elif args.list:
+        parser.error("--list yalnizca --workspace ile kullanilir")
+    
     root = tk.Tk()
-    app = TodoGUI(root)
+    app = TodoGUI(root, tasks_file, workspace, list_name)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import tkinter
+
+# inotify olay maskeleri (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event: wd, mask, cookie, len; ardından len baytlık ad
+EVENT = struct.Struct("iIII")
+
+
+class FileWatcher:
+    """Verilen dosyalar değiştiğinde Tk olay döngüsünde callback'i çağır.
+
+    Linux'ta dosyaların bulunduğu dizin inotify ile izlenir ve tanımlayıcı
+    Tk olay döngüsüne eklenir; pencere boşta beklerken hiçbir iş yapılmaz.
+    Dosyalar yerine dizin izlendiği için atomik yeniden adlandırma ve
+    silinip yeniden oluşturulan günlük de görülür. inotify kullanılamıyorsa
+    dosyaların değiştirilme zamanı, boyutu ve i-düğümü `poll_interval`
+    milisaniyede bir karşılaştırılır. Art arda gelen olaylar `delay`
+    milisaniye içinde tek çağrıda birleştirilir.
+    """
+
+    def __init__(self, root, paths, callback, poll_interval=1000, delay=100):
+        self.root = root
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.names = {os.fsencode(os.path.basename(path)) for path in self.paths}
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.delay = delay
+        self.fd = None
+        self.poll_job = None
+        self.fire_job = None
+        self.signature = self._signature()
+        if not self._start_inotify():
+            self.poll_job = root.after(poll_interval, self._poll)
+
+    def close(self):
+        """İzlemeyi durdur"""
+        for job in (self.poll_job, self.fire_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self.poll_job = self.fire_job = None
+        if self.fd is not None:
+            self.root.tk.deletefilehandler(self.fd)
+            os.close(self.fd)
+            self.fd = None
+
+    def _start_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return False
+        if fd < 0:
+            return False
+        try:
+            for directory in {os.path.dirname(path) for path in self.paths}:
+                if libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK) < 0:
+                    raise OSError(ctypes.get_errno(), "inotify_add_watch")
+            # Tanımlayıcı okunabilir olduğunda Tk olay döngüsü çağırır
+            # (Windows'ta createfilehandler yoktur)
+            self.root.tk.createfilehandler(fd, tkinter.READABLE, self._on_readable)
+        except (OSError, AttributeError, tkinter.TclError):
+            os.close(fd)
+            return False
+        self.fd = fd
+        return True
+
+    def _on_readable(self, fd, mask):
+        relevant = False
+        while True:
+            try:
+                data = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, event_mask, cookie, length = EVENT.unpack_from(data, offset)
+                offset += EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if event_mask & IN_Q_OVERFLOW or name in self.names:
+                    relevant = True
+        if relevant and self.fire_job is None:
+            self.fire_job = self.root.after(self.delay, self._fire)
+
+    def _fire(self):
+        self.fire_job = None
+        self.callback()
+
+    def _poll(self):
+        signature = self._signature()
+        if signature != self.signature:
+            self.signature = signature
+            self.callback()
+        self.poll_job = self.root.after(self.poll_interval, self._poll)
+
+    def _signature(self):
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return signature
@@ -0,0 +1,214 @@
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from locking import FileLock
+from search import SearchIndex, matches, tokenize
+from stats import TaskStats
+from storage import open_storage
+
+MANIFEST_NAME = "workspace.json"
+
+# Çalışma alanı ilk kez kullanıldığında oluşturulan liste
+DEFAULT_LIST = "genel"
+
+# Liste adları dosya adı olarak da kullanılır: harf, rakam, '-' ve '_'
+LIST_NAME = re.compile(r"^\w[\w-]{0,63}$")
+
+# Açılmamış listelerin toplam boyutu bundan küçükse sorgu süreç havuzu
+# kurulmadan sırayla yanıtlanır; süreç başlatmak küçük listelerde daha pahalıdır
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+def _list_stats(path):
+    """Süreç havuzu işçisi: listenin istatistikleri.
+
+    Depo salt okunur açılır; kapatılırken günlük sıkıştırılmaz.
+    """
+    storage = open_storage(path, read_only=True)
+    try:
+        storage.load()
+        return storage.stats.to_dict()
+    finally:
+        storage.close()
+
+
+def _list_search(path, query, limit):
+    """Süreç havuzu işçisi: listede arama, eşleşen görevler ID sırasıyla.
+
+    Tek sorgu için tam indeks kurmak taramadan pahalıdır; görevler bir kez
+    doğrusal olarak taranır.
+    """
+    if not tokenize(query):
+        return []
+    storage = open_storage(path, read_only=True)
+    try:
+        storage.load()
+        found = sorted((task for task in storage.iter_tasks() if matches(task, query)),
+                       key=lambda task: task.id)
+        return found if limit is None else found[:limit]
+    finally:
+        storage.close()
+
+
+class Workspace:
+    """Adlandırılmış görev listelerinden oluşan çalışma alanı.
+
+    Her liste klasördeki ayrı bir depo dosyasıdır (uzantısına göre JSON,
+    .tdb ya da SQLite); ad -> dosya eşlemesi ve varsayılan liste
+    `workspace.json`'da tutulur. Çalışma alanı listeleri kendisi açmaz:
+    yalnızca kullanılan liste açılır, diğerleri diske dokunulmadan kalır.
+
+    Tüm listeler üzerindeki arama ve istatistikler listeler arasında bir
+    süreç havuzuna dağıtılır ve sonuçlar birleştirilir; çağıranın zaten
+    yüklediği listeler (`loaded`) süreç içinde yanıtlanır.
+    """
+
+    def __init__(self, root, extension=".json"):
+        self.root = root
+        self.extension = extension
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.file_lock = None
+
+    def close(self):
+        if self.file_lock is not None:
+            self.file_lock.close()
+
+    # --- Listeler ---
+
+    def names(self):
+        """Liste adları, alfabetik sırayla"""
+        return sorted(self._read_manifest().get("lists", {}))
+
+    def default_list(self):
+        """Varsayılan listenin adı; çalışma alanı boşsa DEFAULT_LIST.
+
+        Liste burada oluşturulmaz; bkz. path(create=True).
+        """
+        manifest = self._read_manifest()
+        name = manifest.get("default")
+        if name in manifest.get("lists", {}):
+            return name
+        names = sorted(manifest.get("lists", {}))
+        if names:
+            return names[0]
+        return DEFAULT_LIST
+
+    def path(self, name, create=False):
+        """Listenin depo dosyası; liste yoksa KeyError.
+
+        create verilirse boş çalışma alanının varsayılan listesi (yazacak
+        komutlar için) oluşturulur.
+        """
+        lists = self._read_manifest().get("lists", {})
+        if create and name == DEFAULT_LIST and not lists:
+            try:
+                return self.create(name)
+            except ValueError:
+                # Başka bir süreç aynı anda oluşturdu
+                lists = self._read_manifest().get("lists", {})
+        return os.path.join(self.root, lists[name])
+
+    def create(self, name, extension=None):
+        """Yeni liste ekle ve depo dosyasının yolunu döndür"""
+        if not LIST_NAME.match(name):
+            raise ValueError(f"Gecersiz liste adi: {name}")
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock():
+            manifest = self._read_manifest()
+            lists = manifest.setdefault("lists", {})
+            if name in lists:
+                raise ValueError(f"Liste zaten var: {name}")
+            lists[name] = name + (extension or self.extension)
+            manifest.setdefault("default", name)
+            self._write_manifest(manifest)
+        return os.path.join(self.root, lists[name])
+
+    def set_default(self, name):
+        """Komut satırında --list verilmediğinde açılacak liste"""
+        with self._lock():
+            manifest = self._read_manifest()
+            if name not in manifest.get("lists", {}):
+                raise KeyError(name)
+            manifest["default"] = name
+            self._write_manifest(manifest)
+
+    # --- Listeler arası sorgular ---
+
+    def stats(self, loaded=None):
+        """Liste adı -> TaskStats; `loaded` ad -> açık depo eşlemesidir"""
+        loaded = loaded or {}
+        results = {name: storage.stats for name, storage in loaded.items()}
+        for name, data in self._fan_out(_list_stats, self._paths(loaded)).items():
+            results[name] = TaskStats.from_dict(data)
+        return results
+
+    def total_stats(self, loaded=None):
+        """Tüm listelerin birleştirilmiş istatistikleri"""
+        total = TaskStats()
+        for stats in self.stats(loaded).values():
+            total.merge(stats)
+        return total
+
+    def search(self, query, limit=None, loaded=None):
+        """Tüm listelerde ara; (liste adı, görev) çiftleri, liste ve ID sırasıyla"""
+        loaded = loaded or {}
+        results = {}
+        for name, storage in loaded.items():
+            results[name] = [storage.get(task_id)
+                             for task_id in storage.index(SearchIndex).search(query, limit)]
+        results.update(self._fan_out(_list_search, self._paths(loaded), query, limit))
+        matches = [(name, task) for name in sorted(results) for task in results[name]]
+        return matches if limit is None else matches[:limit]
+
+    def _paths(self, loaded):
+        """Açık olmayan listelerin ad -> (yol, veri boyutu) eşlemesi.
+
+        Henüz hiç yazılmamış (veri dosyası olmayan) listeler atlanır.
+        """
+        lists = self._read_manifest().get("lists", {})
+        paths = {}
+        for name, file_name in lists.items():
+            if name in loaded:
+                continue
+            path = os.path.join(self.root, file_name)
+            sizes = [os.path.getsize(data_file) for data_file in open_storage(path).data_files()
+                     if os.path.exists(data_file)]
+            if sizes:
+                paths[name] = (path, sum(sizes))
+        return paths
+
+    def _fan_out(self, function, paths, *args):
+        """`function(yol, *args)`'ı her liste için çalıştır; ad -> sonuç"""
+        size = sum(size for _, size in paths.values())
+        paths = {name: path for name, (path, _) in paths.items()}
+        workers = min(len(paths), os.cpu_count() or 1)
+        if workers < 2 or size < PARALLEL_MIN_BYTES:
+            return {name: function(path, *args) for name, path in paths.items()}
+        # "spawn": GUI'nin arka plan iş parçacıklarıyla fork güvenli değildir
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {name: pool.submit(function, path, *args) for name, path in paths.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _lock(self):
+        if self.file_lock is None:
+            self.file_lock = FileLock(os.path.join(self.root, "workspace.lock"))
+        return self.file_lock
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.manifest_path)